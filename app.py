@@ -5,12 +5,15 @@ from flask_cors import CORS
 import sys
 import os
 import logging
+from logging.handlers import QueueHandler
 from datetime import timedelta
 import threading
 import subprocess
 # Replace the relative path with absolute path to project root
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from config.settings import Config
+from utils.log_pipeline import queued_file_handler, handler_options, attach_sampled_loggers
+from utils.json_provider import JSONProvider
 
 # Uzantıları başlat
 jwt = JWTManager()
@@ -29,17 +32,23 @@ def configure_logging(app):
     # Uygulama logları için
     app_log_file = os.path.join(log_dir, 'app.log')
     
-    # Handler'ları yapılandır
-    file_handler = logging.FileHandler(app_log_file)
-    file_handler.setLevel(logging.INFO)
-    
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    
-    # Flask logger'ını yapılandır
-    app.logger.addHandler(file_handler)
+    # Handler'ları yapılandır: kayıtlar kuyruğa yazılır, dosyaya arka planda dönen işleyici yazar.
+    # Aynı logger'a her create_app çağrısında yeni işleyici eklenmesin.
+    if not any(isinstance(h, QueueHandler) for h in app.logger.handlers):
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        options = handler_options(app.config)
+        file_handler = queued_file_handler(app_log_file, formatter, logging.INFO, **options)
+        
+        # Flask logger'ını yapılandır
+        app.logger.addHandler(file_handler)
+        # LOG_DEBUG_SAMPLE_RATES'teki logger'ların örneklenmiş DEBUG kayıtları da app.log'a yazılır
+        attach_sampled_loggers(file_handler, options['sample_rates'])
     app.logger.setLevel(logging.INFO)
     
+    # E-posta ve SMTP logları (işleyiciler ve dinleyiciler burada, içe aktarmada değil, başlatılır)
+    from utils.helpers import configure_email_logging
+    configure_email_logging(app.config)
+    
     # E-posta ve diğer loglar için ana dizin
     email_dir = os.path.join(os.getcwd(), 'sent_emails', 'messages')
     if not os.path.exists(email_dir):
@@ -94,6 +103,9 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # ObjectId/datetime/Decimal türlerini doğrudan serileştiren JSON sağlayıcısı
+    app.json = JSONProvider(app)
+    
     # Test modunda SERVER_NAME'i ayarla
     if is_test_mode or 'FLASK_TEST_PORT' in os.environ:
         app.config['SERVER_NAME'] = f"localhost:{os.environ.get('FLASK_TEST_PORT', '5000')}"
@@ -133,6 +145,34 @@ def create_app(config_class=Config):
     from utils.db_init import init_tables
     init_tables()
     
+    # E-posta kuyruğu işçilerini başlat
+    from utils.email_outbox import init_email_outbox
+    init_email_outbox(app)
+    
+    # Ürün yanıt ve varlık önbelleklerini yapılandır
+    from utils.cache import init_caches
+    init_caches(app)
+    
+    # bcrypt işlemleri için sınırlı parola havuzunu başlat
+    from utils.password_hasher import init_password_hasher
+    init_password_hasher(app)
+    
+    # İstek gecikmesi ve veritabanı gidiş-dönüş metriklerini kaydet (/metrics)
+    from utils.metrics import init_metrics
+    init_metrics(app)
+    
+    # Aynı sorgu şeklini tekrar eden istekleri logla (N+1 dedektörü)
+    from utils.query_detector import init_query_detector
+    init_query_detector(app)
+    
+    # İsteğe bağlı istek profillemeyi kur (kapalıyken kanca eklenmez)
+    from utils.profiler import init_profiler
+    init_profiler(app)
+    
+    # last_login toplu yazım tamponunu başlat
+    from utils.last_login import init_last_login_buffer
+    init_last_login_buffer(app)
+    
     # API yönlendiricilerini içe aktar ve kaydet
     from routes.auth import auth_bp
     from routes.profile import profile_bp
@@ -0,0 +1,905 @@
+"""Testler ve yerel ölçümler için bellek içi MongoDB koleksiyon motoru
+
+MockCollection, pymongo Collection API'sinin uygulamada kullanılan alt kümesini
+gerçek sorgu semantiğiyle uygular:
+
+- Sorgu operatörleri: $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $regex/$options,
+  $exists, $not, $size, $and, $or, $nor ve $text (metin indeksindeki alanlarda, tam kelime)
+- Güncelleme operatörleri: $set, $unset, $inc, $setOnInsert, $push, $pull,
+  $addToSet, $min, $max, $currentDate; upsert
+- find(...).sort().skip().limit(), projeksiyon, find_one_and_update/delete,
+  bulk_write, basit aggregate ($match, $sort, $group, $skip, $limit, $project, $count)
+- create_index ile hash + sıralı ikincil indeksler ve unique/partial kısıtları
+
+Belgeler _id anahtarlı bir sözlükte tutulur, bu yüzden _id aramaları O(1)'dir.
+İkincil indeksler eşitlik/$in aramalarını O(1), aralık aramalarını O(log n)
+adayla sınırlar; adaylar her zaman tam filtreyle yeniden doğrulanır.
+"""
+import copy
+import functools
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+_MISSING = object()
+_RANGE_OPERATORS = ('$gt', '$gte', '$lt', '$lte')
+_WORD = re.compile(r'\w+')
+
+# MongoDB'nin BSON tür sıralamasına yakın tür sırası
+def _type_rank(value):
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, (list, tuple)):
+        return 5
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+def _sort_key(value):
+    """Farklı türleri güvenle karşılaştırılabilir kılan sıralama anahtarı"""
+    rank = _type_rank(value)
+    if rank == 1:
+        return (1, 0)
+    if rank == 4:
+        return (4, tuple((k, _sort_key(v)) for k, v in value.items()))
+    if rank == 5:
+        return (5, tuple(_sort_key(v) for v in value))
+    if rank == 10:
+        return (10, repr(value))
+    return (rank, value)
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return ('__dict__',) + tuple((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ('__list__',) + tuple(_hashable(v) for v in value)
+    if isinstance(value, bool):
+        # True ve 1 aynı indeks girdisine düşmesin
+        return ('__bool__', value)
+    return value
+
+
+def _resolve(value, parts):
+    """Noktalı alan yolundaki tüm değerleri döndür (dizilerin içine iner)"""
+    if not parts:
+        return [value]
+    if isinstance(value, dict):
+        if parts[0] in value:
+            return _resolve(value[parts[0]], parts[1:])
+        return []
+    if isinstance(value, list):
+        if parts[0].isdigit():
+            index = int(parts[0])
+            return _resolve(value[index], parts[1:]) if index < len(value) else []
+        found = []
+        for item in value:
+            if isinstance(item, dict):
+                found.extend(_resolve(item, parts))
+        return found
+    return []
+
+def _get_values(doc, path):
+    return _resolve(doc, path.split('.'))
+
+def _expand(values):
+    """Dizi değerleri hem bütün olarak hem eleman eleman eşleşebilir"""
+    for value in values:
+        yield value
+        if isinstance(value, list):
+            yield from value
+
+def _equal(value, operand):
+    if isinstance(operand, re.Pattern):
+        return isinstance(value, str) and operand.search(value) is not None
+    if _type_rank(value) != _type_rank(operand):
+        return False
+    return value == operand
+
+def _compare(value, operand, op):
+    if _type_rank(value) != _type_rank(operand) or value is None:
+        return False
+    left, right = _sort_key(value), _sort_key(operand)
+    if op == '$gt':
+        return left > right
+    if op == '$gte':
+        return left >= right
+    if op == '$lt':
+        return left < right
+    return left <= right
+
+def _is_operator_dict(value):
+    return isinstance(value, dict) and bool(value) and all(key.startswith('$') for key in value)
+
+def _match_condition(values, condition):
+    if not _is_operator_dict(condition):
+        if condition is None and not values:
+            return True
+        return any(_equal(value, condition) for value in _expand(values))
+
+    for op, operand in condition.items():
+        if op == '$eq':
+            matched = _match_condition(values, operand)
+        elif op == '$ne':
+            matched = not _match_condition(values, operand)
+        elif op == '$in':
+            matched = any(_match_condition(values, item) for item in operand)
+        elif op == '$nin':
+            matched = not any(_match_condition(values, item) for item in operand)
+        elif op in _RANGE_OPERATORS:
+            matched = any(_compare(value, operand, op) for value in _expand(values))
+        elif op == '$exists':
+            matched = bool(values) == bool(operand)
+        elif op == '$regex':
+            pattern = operand
+            if not isinstance(pattern, re.Pattern):
+                flags = 0
+                for option in condition.get('$options', ''):
+                    flags |= {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'x': re.VERBOSE}.get(option, 0)
+                pattern = re.compile(pattern, flags)
+            matched = any(_equal(value, pattern) for value in _expand(values))
+        elif op == '$options':
+            continue
+        elif op == '$not':
+            matched = not _match_condition(values, operand)
+        elif op == '$size':
+            matched = any(isinstance(value, list) and len(value) == operand for value in values)
+        else:
+            raise NotImplementedError(f"MockCollection desteklemiyor: {op}")
+        if not matched:
+            return False
+    return True
+
+
+def _set_path(doc, path, value):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+def _get_path(doc, path, default=_MISSING):
+    target = doc
+    for part in path.split('.'):
+        if not isinstance(target, dict) or part not in target:
+            return default
+        target = target[part]
+    return target
+
+def _delete_path(doc, path):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        target = target.get(part) if isinstance(target, dict) else None
+        if target is None:
+            return
+    if isinstance(target, dict):
+        target.pop(parts[-1], None)
+
+
+def _eval_expression(doc, expression):
+    """Aggregation ifadesi: '$alan' alan değeri, sözlükler alan alan değerlendirilir"""
+    if isinstance(expression, str) and expression.startswith('$'):
+        values = _get_values(doc, expression[1:])
+        return values[0] if values else None
+    if isinstance(expression, dict):
+        return {key: _eval_expression(doc, value) for key, value in expression.items()}
+    return expression
+
+
+def _synchronized(method):
+    """Oku-değiştir-yaz adımlarını koleksiyon kilidi altında çalıştır"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class _Index:
+    """Tek alanlı arama + çok alanlı unique kısıtı için ikincil indeks
+
+    Arama yalnızca ilk anahtar alanı üzerinden yapılır (MongoDB'deki indeks öneki gibi):
+    eşitlik/$in için hash tablosu, aralık sorguları için sıralı liste kullanılır.
+    """
+
+    def __init__(self, name, keys, unique=False, partial=None, sparse=False):
+        self.name = name
+        self.keys = keys
+        self.field = keys[0][0]
+        self.unique = unique
+        self.partial = partial
+        self.sparse = sparse
+        self.hashed = {}
+        self.ordered = []
+        self.unique_keys = {}
+
+    def applies_to(self, doc):
+        return self.partial is None or MockCollection._matches(doc, self.partial)
+
+    def _entries(self, doc):
+        values = list(_expand(_get_values(doc, self.field)))
+        if not values:
+            return [] if self.sparse else [None]
+        return values
+
+    def unique_key(self, doc):
+        key = []
+        for field, _ in self.keys:
+            values = _get_values(doc, field)
+            key.append(_hashable(values[0]) if values else None)
+        return tuple(key)
+
+    def check_unique(self, doc, doc_key):
+        if not self.unique or not self.applies_to(doc):
+            return
+        owner = self.unique_keys.get(self.unique_key(doc))
+        if owner is not None and owner != doc_key:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error index: {self.name} dup key: {self.unique_key(doc)}", 11000
+            )
+
+    def add(self, doc, doc_key, seq):
+        if not self.applies_to(doc):
+            return
+        if self.unique:
+            self.unique_keys[self.unique_key(doc)] = doc_key
+        for value in self._entries(doc):
+            self.hashed.setdefault(_hashable(value), set()).add(doc_key)
+            insort(self.ordered, (_sort_key(value), seq, doc_key))
+
+    def remove(self, doc, doc_key, seq):
+        if not self.applies_to(doc):
+            return
+        if self.unique and self.unique_keys.get(self.unique_key(doc)) == doc_key:
+            del self.unique_keys[self.unique_key(doc)]
+        for value in self._entries(doc):
+            keys = self.hashed.get(_hashable(value))
+            if keys is not None:
+                keys.discard(doc_key)
+                if not keys:
+                    del self.hashed[_hashable(value)]
+            entry = (_sort_key(value), seq, doc_key)
+            position = bisect_left(self.ordered, entry)
+            if position < len(self.ordered) and self.ordered[position] == entry:
+                del self.ordered[position]
+
+    def lookup(self, condition):
+        """Koşula uyabilecek belge anahtarlarını döndür; indeks kullanılamıyorsa None"""
+        if not _is_operator_dict(condition):
+            if isinstance(condition, (dict, list, re.Pattern)):
+                return None
+            return set(self.hashed.get(_hashable(condition), ()))
+
+        if '$eq' in condition:
+            return self.lookup(condition['$eq'])
+        if '$in' in condition:
+            found = set()
+            for item in condition['$in']:
+                keys = self.lookup(item)
+                if keys is None:
+                    return None
+                found |= keys
+            return found
+
+        bounds = {op: condition[op] for op in _RANGE_OPERATORS if op in condition}
+        if not bounds:
+            return None
+        lower = bounds.get('$gt', bounds.get('$gte', _MISSING))
+        upper = bounds.get('$lt', bounds.get('$lte', _MISSING))
+        rank = _type_rank(lower if lower is not _MISSING else upper)
+
+        start = bisect_left(self.ordered, (_sort_key(lower),) if lower is not _MISSING else ((rank,),))
+        end = bisect_right(self.ordered, (_sort_key(upper), float('inf'))) if upper is not _MISSING \
+            else bisect_left(self.ordered, ((rank + 1,),))
+        return {doc_key for _, _, doc_key in self.ordered[start:end]}
+
+
+class _Result:
+    """pymongo sonuç nesnelerinin kullanılan alanlarını taşıyan basit nesne"""
+
+    def __init__(self, **fields):
+        self.acknowledged = True
+        self.__dict__.update(fields)
+
+
+class MockCursor:
+    """find() sonucu; sort/skip/limit ilk yinelemede uygulanır"""
+
+    def __init__(self, collection, query, projection=None, sort=None, skip=0, limit=0):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = sort
+        self._skip = skip
+        self._limit = limit
+        self._results = None
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = MockCollection._normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, count):
+        self._skip = count
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def hint(self, index):
+        return self
+
+    def _evaluate(self):
+        if self._results is None:
+            self._results = iter(self._collection._run_query(
+                self._query, self._projection, self._sort, self._skip, self._limit
+            ))
+        return self._results
+
+    def __iter__(self):
+        return self._evaluate()
+
+    def __next__(self):
+        return next(self._evaluate())
+
+    def close(self):
+        self._results = iter(())
+
+
+class MockCollection:
+    """Bellek içi MongoDB koleksiyonu (bkz. modül açıklaması)"""
+
+    def __init__(self, name):
+        self.name = name
+        self._docs = {}
+        self._seq = {}
+        self._next_seq = 0
+        self._indexes = {}
+        self._text_fields = {}
+        # Çok iş parçacıklı sunucuda (ör. bellek içi benchmark) eşzamanlı yazmalar için
+        self._lock = threading.RLock()
+
+    @property
+    def docs(self):
+        """Koleksiyondaki belgeler (ekleme sırasıyla)"""
+        return list(self._docs.values())
+
+    def _record(self, command_name, command):
+        """Test modunda da sorgu bütçesi/N+1 dedektörü çalışsın diye komutu kaydet"""
+        from utils.query_detector import record_mongo_command
+        record_mongo_command(command_name, dict(command, **{command_name: self.name}))
+
+    # --- Sorgu değerlendirme
+
+    @staticmethod
+    def _matches(doc, query, text_score=None):
+        for key, condition in query.items():
+            if key == '$and':
+                if not all(MockCollection._matches(doc, sub) for sub in condition):
+                    return False
+            elif key == '$or':
+                if not any(MockCollection._matches(doc, sub) for sub in condition):
+                    return False
+            elif key == '$nor':
+                if any(MockCollection._matches(doc, sub) for sub in condition):
+                    return False
+            elif key == '$text':
+                if not text_score:
+                    return False
+            elif key.startswith('$'):
+                raise NotImplementedError(f"MockCollection desteklemiyor: {key}")
+            elif not _match_condition(_get_values(doc, key), condition):
+                return False
+        return True
+
+    def _text_score(self, doc, query):
+        """$text araması: metin indeksindeki alanlarda geçen terim sayısı × ağırlık
+
+        Sunucu gibi yalnızca tam kelimeler eşleşir ("tel", "telefon"u bulmaz);
+        terimler ve alanlar normalize_search_text ile normalize edilip kelimelere
+        bölünür. Kök bulma (stemming) uygulanmaz.
+        """
+        from utils.helpers import normalize_search_text
+        search = query.get('$text', {}).get('$search', '')
+        terms = _WORD.findall(normalize_search_text(search))
+        fields = self._text_fields or {key: 1 for key, value in doc.items() if isinstance(value, str)}
+        score = 0.0
+        for field, weight in fields.items():
+            value = _get_path(doc, field, '')
+            if isinstance(value, str):
+                words = set(_WORD.findall(normalize_search_text(value)))
+                score += weight * sum(1 for term in terms if term in words)
+        return score
+
+    def _candidate_keys(self, query):
+        """İndekslerle daraltılmış aday belge anahtarları; tam tarama gerekiyorsa None"""
+        if '_id' in query:
+            condition = query['_id']
+            if not _is_operator_dict(condition) and not isinstance(condition, (dict, list)):
+                return [_hashable(condition)]
+            if _is_operator_dict(condition) and set(condition) == {'$in'}:
+                return [_hashable(value) for value in condition['$in']]
+
+        for index in self._indexes.values():
+            if index.partial is not None or index.field not in query:
+                continue
+            keys = index.lookup(query[index.field])
+            if keys is not None:
+                return sorted(keys, key=lambda doc_key: self._seq.get(doc_key, 0))
+        return None
+
+    def _find_matching(self, query):
+        """(belge anahtarı, belge, metin skoru) üçlüleri; belgeler kopyalanmaz"""
+        query = query or {}
+        with self._lock:
+            keys = self._candidate_keys(query)
+            items = list(self._docs.items()) if keys is None else [
+                (key, self._docs[key]) for key in dict.fromkeys(keys) if key in self._docs
+            ]
+        for key, doc in items:
+            score = self._text_score(doc, query) if '$text' in query else None
+            if self._matches(doc, query, score):
+                yield key, doc, score
+
+    @staticmethod
+    def _normalize_sort(key_or_list, direction=None):
+        if key_or_list is None:
+            return None
+        if isinstance(key_or_list, str):
+            return [(key_or_list, direction or 1)]
+        if isinstance(key_or_list, dict):
+            return list(key_or_list.items())
+        return list(key_or_list)
+
+    @staticmethod
+    def _sort_matches(matches, sort):
+        for field, direction in reversed(sort or []):
+            if isinstance(direction, dict):
+                # {'$meta': 'textScore'}: en yüksek skor önce
+                matches.sort(key=lambda item: item[2] or 0, reverse=True)
+            else:
+                matches.sort(
+                    key=lambda item: _sort_key(_get_path(item[1], field, None)),
+                    reverse=direction < 0
+                )
+        return matches
+
+    @staticmethod
+    def _project(doc, projection, score=None):
+        if projection is None:
+            return copy.deepcopy(doc)
+        if isinstance(projection, (list, tuple)):
+            projection = {field: 1 for field in projection}
+
+        meta = {key for key, value in projection.items() if isinstance(value, dict) and '$meta' in value}
+        fields = {key: value for key, value in projection.items() if key not in meta and key != '_id'}
+        include_id = projection.get('_id', 1)
+
+        if any(fields.values()):
+            result = {}
+            if include_id and '_id' in doc:
+                result['_id'] = copy.deepcopy(doc['_id'])
+            for field, include in fields.items():
+                value = _get_path(doc, field)
+                if include and value is not _MISSING:
+                    _set_path(result, field, copy.deepcopy(value))
+        else:
+            result = copy.deepcopy(doc)
+            for field in fields:
+                _delete_path(result, field)
+            if not include_id:
+                result.pop('_id', None)
+
+        for field in meta:
+            result[field] = score or 0.0
+        return result
+
+    def _run_query(self, query, projection=None, sort=None, skip=0, limit=0):
+        matches = list(self._find_matching(query))
+        if sort:
+            self._sort_matches(matches, sort)
+        matches = matches[skip or 0:]
+        if limit:
+            matches = matches[:abs(limit)]
+        return [self._project(doc, projection, score) for _, doc, score in matches]
+
+    @staticmethod
+    def _as_query(query):
+        if query is None:
+            return {}
+        if not isinstance(query, dict):
+            return {'_id': query}
+        return query
+
+    # --- Yazma yardımcıları
+
+    @_synchronized
+    def _store(self, doc):
+        key = _hashable(doc['_id'])
+        if key in self._docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error index: _id_ dup key: {doc['_id']}", 11000)
+        for index in self._indexes.values():
+            index.check_unique(doc, key)
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._docs[key] = doc
+        self._seq[key] = seq
+        for index in self._indexes.values():
+            index.add(doc, key, seq)
+
+    @_synchronized
+    def _replace(self, key, old_doc, new_doc):
+        for index in self._indexes.values():
+            index.check_unique(new_doc, key)
+        seq = self._seq[key]
+        for index in self._indexes.values():
+            index.remove(old_doc, key, seq)
+            index.add(new_doc, key, seq)
+        self._docs[key] = new_doc
+
+    @_synchronized
+    def _remove(self, key):
+        doc = self._docs.pop(key)
+        seq = self._seq.pop(key)
+        for index in self._indexes.values():
+            index.remove(doc, key, seq)
+        return doc
+
+    @staticmethod
+    def _apply_update(doc, update, is_insert=False):
+        if not update or not all(op.startswith('$') for op in update):
+            raise ValueError("update only works with $ operators")
+
+        for op, fields in update.items():
+            for path, value in fields.items():
+                current = _get_path(doc, path)
+                if op == '$set':
+                    _set_path(doc, path, copy.deepcopy(value))
+                elif op == '$unset':
+                    _delete_path(doc, path)
+                elif op == '$inc':
+                    _set_path(doc, path, (0 if current is _MISSING else current) + value)
+                elif op == '$setOnInsert':
+                    if is_insert:
+                        _set_path(doc, path, copy.deepcopy(value))
+                elif op in ('$push', '$addToSet'):
+                    items = value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+                    target = [] if current is _MISSING else current
+                    for item in items:
+                        if op == '$push' or not any(_equal(existing, item) for existing in target):
+                            target.append(copy.deepcopy(item))
+                    _set_path(doc, path, target)
+                elif op == '$pull':
+                    if isinstance(current, list):
+                        _set_path(doc, path, [item for item in current if not _match_condition([item], value)])
+                elif op in ('$min', '$max'):
+                    if current is _MISSING or _compare(value, current, '$lt' if op == '$min' else '$gt'):
+                        _set_path(doc, path, copy.deepcopy(value))
+                elif op == '$currentDate':
+                    _set_path(doc, path, datetime.now())
+                else:
+                    raise NotImplementedError(f"MockCollection desteklemiyor: {op}")
+        return doc
+
+    @staticmethod
+    def _upsert_seed(query):
+        """Upsert'te yeni belgenin eşitlik koşullarından oluşan başlangıç hali"""
+        seed = {}
+        for key, condition in query.items():
+            if key == '$and':
+                for sub in condition:
+                    seed.update(MockCollection._upsert_seed(sub))
+            elif key.startswith('$'):
+                continue
+            elif _is_operator_dict(condition):
+                if '$eq' in condition:
+                    _set_path(seed, key, copy.deepcopy(condition['$eq']))
+            else:
+                _set_path(seed, key, copy.deepcopy(condition))
+        return seed
+
+    @_synchronized
+    def _update(self, query, update, upsert=False, multi=False, sort=None):
+        """(eşleşen, değişen, upsert _id, önceki belge, sonraki belge) döndür"""
+        matches = list(self._find_matching(self._as_query(query)))
+        if sort:
+            self._sort_matches(matches, self._normalize_sort(sort))
+        if not multi:
+            matches = matches[:1]
+
+        modified = 0
+        before = after = None
+        for key, doc, _ in matches:
+            new_doc = self._apply_update(copy.deepcopy(doc), update)
+            if new_doc.get('_id') != doc.get('_id'):
+                raise ValueError("Performing an update on the path '_id' would modify the immutable field '_id'")
+            if before is None:
+                before, after = doc, new_doc
+            if new_doc != doc:
+                self._replace(key, doc, new_doc)
+                modified += 1
+
+        if matches or not upsert:
+            return len(matches), modified, None, before, after
+
+        new_doc = self._apply_update(self._upsert_seed(self._as_query(query)), update, is_insert=True)
+        new_doc.setdefault('_id', ObjectId())
+        self._store(new_doc)
+        return 0, 0, new_doc['_id'], None, new_doc
+
+    # --- pymongo Collection API
+
+    def insert_one(self, doc):
+        self._record('insert', {})
+        if '_id' not in doc:
+            doc['_id'] = ObjectId()
+        self._store(copy.deepcopy(doc))
+        return _Result(inserted_id=doc['_id'])
+
+    @_synchronized
+    def insert_many(self, docs, ordered=True):
+        self._record('insert', {})
+        inserted_ids = []
+        for doc in docs:
+            if '_id' not in doc:
+                doc['_id'] = ObjectId()
+            self._store(copy.deepcopy(doc))
+            inserted_ids.append(doc['_id'])
+        return _Result(inserted_ids=inserted_ids)
+
+    def find(self, filter=None, projection=None, skip=0, limit=0, sort=None, **kwargs):
+        query = self._as_query(filter)
+        self._record('find', {'filter': query})
+        return MockCursor(self, query, projection, self._normalize_sort(sort), skip, limit)
+
+    def find_one(self, filter=None, projection=None, sort=None, **kwargs):
+        query = self._as_query(filter)
+        self._record('find', {'filter': query})
+        results = self._run_query(query, projection, self._normalize_sort(sort), limit=1)
+        return results[0] if results else None
+
+    def count_documents(self, filter=None, skip=0, limit=0, **kwargs):
+        self._record('count', {'query': filter or {}})
+        count = max(0, sum(1 for _ in self._find_matching(self._as_query(filter))) - skip)
+        return min(count, limit) if limit else count
+
+    def estimated_document_count(self, **kwargs):
+        return len(self._docs)
+
+    def distinct(self, key, filter=None, **kwargs):
+        self._record('distinct', {'query': filter or {}})
+        values = []
+        for _, doc, _ in self._find_matching(self._as_query(filter)):
+            for value in _expand(_get_values(doc, key)):
+                if not isinstance(value, list) and not any(_equal(value, seen) for seen in values):
+                    values.append(copy.deepcopy(value))
+        return values
+
+    def update_one(self, filter, update, upsert=False, **kwargs):
+        self._record('update', {'updates': [{'q': filter}]})
+        matched, modified, upserted_id, _, _ = self._update(filter, update, upsert=upsert)
+        return _Result(matched_count=matched, modified_count=modified, upserted_id=upserted_id)
+
+    def update_many(self, filter, update, upsert=False, **kwargs):
+        self._record('update', {'updates': [{'q': filter}]})
+        matched, modified, upserted_id, _, _ = self._update(filter, update, upsert=upsert, multi=True)
+        return _Result(matched_count=matched, modified_count=modified, upserted_id=upserted_id)
+
+    @_synchronized
+    def replace_one(self, filter, replacement, upsert=False, **kwargs):
+        self._record('update', {'updates': [{'q': filter}]})
+        matches = list(self._find_matching(self._as_query(filter)))[:1]
+        if matches:
+            key, doc, _ = matches[0]
+            new_doc = dict(copy.deepcopy(replacement), _id=doc['_id'])
+            self._replace(key, doc, new_doc)
+            return _Result(matched_count=1, modified_count=int(new_doc != doc), upserted_id=None)
+        if not upsert:
+            return _Result(matched_count=0, modified_count=0, upserted_id=None)
+        new_doc = copy.deepcopy(replacement)
+        new_doc.setdefault('_id', ObjectId())
+        self._store(new_doc)
+        return _Result(matched_count=0, modified_count=0, upserted_id=new_doc['_id'])
+
+    @_synchronized
+    def delete_one(self, filter, **kwargs):
+        self._record('delete', {'deletes': [{'q': filter}]})
+        for key, _, _ in self._find_matching(self._as_query(filter)):
+            self._remove(key)
+            return _Result(deleted_count=1)
+        return _Result(deleted_count=0)
+
+    @_synchronized
+    def delete_many(self, filter, **kwargs):
+        self._record('delete', {'deletes': [{'q': filter}]})
+        keys = [key for key, _, _ in self._find_matching(self._as_query(filter))]
+        for key in keys:
+            self._remove(key)
+        return _Result(deleted_count=len(keys))
+
+    def find_one_and_update(self, filter, update, projection=None, sort=None, upsert=False,
+                            return_document=False, **kwargs):
+        self._record('findAndModify', {'query': filter})
+        _, _, _, before, after = self._update(filter, update, upsert=upsert, sort=sort)
+        # ReturnDocument.AFTER == True, ReturnDocument.BEFORE == False
+        doc = after if return_document else before
+        return self._project(doc, projection) if doc is not None else None
+
+    @_synchronized
+    def find_one_and_delete(self, filter, projection=None, sort=None, **kwargs):
+        self._record('findAndModify', {'query': filter})
+        matches = list(self._find_matching(self._as_query(filter)))
+        if sort:
+            self._sort_matches(matches, self._normalize_sort(sort))
+        if not matches:
+            return None
+        key, doc, _ = matches[0]
+        self._remove(key)
+        return self._project(doc, projection)
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        counts = {'inserted_count': 0, 'matched_count': 0, 'modified_count': 0,
+                  'deleted_count': 0, 'upserted_count': 0}
+        for operation in requests:
+            if isinstance(operation, InsertOne):
+                self.insert_one(operation._doc)
+                counts['inserted_count'] += 1
+            elif isinstance(operation, (UpdateOne, UpdateMany)):
+                result = (self.update_many if isinstance(operation, UpdateMany) else self.update_one)(
+                    operation._filter, operation._doc, upsert=bool(operation._upsert)
+                )
+                counts['matched_count'] += result.matched_count
+                counts['modified_count'] += result.modified_count
+                counts['upserted_count'] += int(result.upserted_id is not None)
+            elif isinstance(operation, ReplaceOne):
+                result = self.replace_one(operation._filter, operation._doc, upsert=bool(operation._upsert))
+                counts['matched_count'] += result.matched_count
+                counts['modified_count'] += result.modified_count
+            elif isinstance(operation, (DeleteOne, DeleteMany)):
+                result = (self.delete_many if isinstance(operation, DeleteMany) else self.delete_one)(
+                    operation._filter
+                )
+                counts['deleted_count'] += result.deleted_count
+            else:
+                raise NotImplementedError(f"MockCollection desteklemiyor: {type(operation).__name__}")
+        return _Result(**counts)
+
+    def aggregate(self, pipeline, **kwargs):
+        self._record('aggregate', {'pipeline': pipeline})
+        docs = [copy.deepcopy(doc) for doc in self._docs.values()]
+
+        for stage in pipeline:
+            (name, spec), = stage.items()
+            if name == '$match':
+                docs = [doc for doc in docs if self._matches(doc, spec)]
+            elif name == '$sort':
+                matches = self._sort_matches([(None, doc, None) for doc in docs], self._normalize_sort(spec))
+                docs = [doc for _, doc, _ in matches]
+            elif name == '$skip':
+                docs = docs[spec:]
+            elif name == '$limit':
+                docs = docs[:spec]
+            elif name == '$project':
+                docs = [self._project(doc, spec) for doc in docs]
+            elif name == '$count':
+                docs = [{spec: len(docs)}]
+            elif name == '$group':
+                docs = self._group(docs, spec)
+            else:
+                raise NotImplementedError(f"MockCollection desteklemiyor: {name}")
+        return iter(docs)
+
+    @staticmethod
+    def _group(docs, spec):
+        groups = {}
+        for doc in docs:
+            group_id = _eval_expression(doc, spec['_id'])
+            group = groups.setdefault(_hashable(group_id), {'_id': group_id})
+            for field, accumulator in spec.items():
+                if field == '_id':
+                    continue
+                (op, expression), = accumulator.items()
+                value = _eval_expression(doc, expression)
+                if op == '$sum':
+                    group[field] = group.get(field, 0) + (value if isinstance(value, (int, float)) else 0)
+                elif op == '$push':
+                    group.setdefault(field, []).append(value)
+                elif op == '$first':
+                    group.setdefault(field, value)
+                elif op == '$last':
+                    group[field] = value
+                elif op in ('$min', '$max'):
+                    if field not in group or _compare(value, group[field], '$lt' if op == '$min' else '$gt'):
+                        group[field] = value
+                elif op == '$avg':
+                    total, count = group.get(f'__{field}', (0, 0))
+                    group[f'__{field}'] = (total + value, count + 1)
+                    group[field] = (total + value) / (count + 1)
+                else:
+                    raise NotImplementedError(f"MockCollection desteklemiyor: {op}")
+        return [{key: value for key, value in group.items() if not key.startswith('__')}
+                for group in groups.values()]
+
+    # --- İndeksler
+
+    @_synchronized
+    def create_index(self, keys, name=None, unique=False, partialFilterExpression=None,
+                     sparse=False, weights=None, **kwargs):
+        keys = self._normalize_sort(keys)
+        name = name or '_'.join(f"{field}_{direction}" for field, direction in keys)
+        if name in self._indexes:
+            return name
+
+        text_fields = [field for field, direction in keys if direction == 'text']
+        if text_fields:
+            weights = weights or {}
+            self._text_fields = {field: weights.get(field, 1) for field in text_fields}
+            return name
+
+        index = _Index(name, keys, unique=unique, partial=partialFilterExpression, sparse=sparse)
+        for key, doc in self._docs.items():
+            index.check_unique(doc, key)
+            index.add(doc, key, self._seq[key])
+        self._indexes[name] = index
+        return name
+
+    def drop_index(self, name):
+        self._indexes.pop(name, None)
+
+    def index_information(self):
+        info = {'_id_': {'key': [('_id', 1)]}}
+        for name, index in self._indexes.items():
+            info[name] = {'key': index.keys, 'unique': index.unique}
+            if index.partial is not None:
+                info[name]['partialFilterExpression'] = index.partial
+        if self._text_fields:
+            info['text'] = {'key': [(field, 'text') for field in self._text_fields]}
+        return info
+
+    def drop(self):
+        self.__init__(self.name)
+
+
+class MockDatabase:
+    """Bellek içi MongoDB veritabanı; koleksiyonlar ilk erişimde oluşturulur"""
+
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = MockCollection(name)
+        return self.collections[name]
+
+    def __getattr__(self, name):
+        # Modeller koleksiyonlara db.products biçiminde erişir; desteklenmeyen
+        # Database metotları (ör. list_collection_names) koleksiyon sanılmamalı
+        if name.startswith('_') or hasattr(Database, name):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name):
+        return self[name]
+
+    def drop_collection(self, name):
+        self.collections.pop(name, None)
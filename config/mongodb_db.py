@@ -3,6 +3,9 @@ import os
 from dotenv import load_dotenv
 import sys
 
+# Testlerde kullanılan bellek içi MongoDB (eski içe aktarma yolu korunur)
+from config.mock_mongo import MockCollection, MockDatabase
+
 # Ortam değişkenlerini yükle
 load_dotenv()
 
@@ -11,60 +14,6 @@ mongo_db = None
 # Flag to indicate if we're in test mode
 is_test_mode = 'pytest' in sys.modules
 
-class MockCollection:
-    """A mock MongoDB collection for testing"""
-    def __init__(self, name):
-        self.name = name
-        self.docs = []
-    
-    def insert_one(self, doc):
-        from bson import ObjectId
-        if '_id' not in doc:
-            doc['_id'] = ObjectId()
-        self.docs.append(doc)
-        return type('InsertOneResult', (), {'inserted_id': doc['_id']})
-    
-    def find(self, query=None, *args, **kwargs):
-        if query is None:
-            query = {}
-        # Simple implementation that returns all docs for testing
-        return type('Cursor', (), {
-            'sort': lambda *args, **kwargs: self,
-            'skip': lambda *args: self,
-            'limit': lambda *args: self,
-            '__iter__': lambda *args: iter(self.docs)
-        })
-    
-    def find_one(self, query=None):
-        if query is None:
-            query = {}
-        if len(self.docs) > 0:
-            return self.docs[0]
-        return None
-        
-    def count_documents(self, query=None):
-        if query is None:
-            query = {}
-        return len(self.docs)
-    
-    def update_one(self, query, update):
-        # Simple implementation for testing
-        return type('UpdateResult', (), {'modified_count': 1})
-    
-    def delete_one(self, query):
-        # Simple implementation for testing
-        return type('DeleteResult', (), {'deleted_count': 1})
-
-class MockDatabase:
-    """A mock MongoDB database for testing"""
-    def __init__(self):
-        self.collections = {}
-    
-    def __getitem__(self, name):
-        if name not in self.collections:
-            self.collections[name] = MockCollection(name)
-        return self.collections[name]
-
 def init_mongodb():
     """MongoDB bağlantısını başlat"""
     global mongo_client, mongo_db
@@ -75,6 +24,14 @@ def init_mongodb():
         mongo_db = MockDatabase()
         return True
     
+    # Benchmark'lar için bellek içi MongoDB; isteğe bağlı olarak sentetik ürünlerle doldurulur
+    if os.getenv('MONGO_IN_MEMORY', 'False').lower() == 'true':
+        print("Bellek içi MongoDB kullanılıyor")
+        from utils.seed_data import seed_in_memory
+        mongo_db = MockDatabase()
+        seed_in_memory(mongo_db)
+        return True
+    
     try:
         # Always use localhost for MongoDB in test mode, selenium tests, or if MONGO_URI is not set
         if is_test_mode or 'FLASK_TEST_PORT' in os.environ or 'MONGO_URI' not in os.environ:
@@ -90,7 +47,13 @@ def init_mongodb():
         
         print(f"MongoDB'ye bağlanılıyor: {mongo_uri}, Veritabanı: {db_name}")
         
-        mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)  # Reduced timeout for faster failure
+        # Komut dinleyicisi istek başına MongoDB gidiş-dönüşlerini sayar
+        from utils.metrics import MongoCommandMetrics
+        mongo_client = MongoClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=5000,  # Reduced timeout for faster failure
+            event_listeners=[MongoCommandMetrics()]
+        )
         mongo_db = mongo_client[db_name]
         
         # Bağlantıyı test et
@@ -1,6 +1,9 @@
 import mysql.connector
 import os
 import sys
+import threading
+import time
+import weakref
 from dotenv import load_dotenv
 
 # Ortam değişkenlerini yükle
@@ -9,26 +12,326 @@ load_dotenv()
 # Flag to indicate if we're in test mode
 is_test_mode = 'pytest' in sys.modules
 
+
+class PoolTimeoutError(Exception):
+    """Havuzdan belirtilen süre içinde bağlantı alınamadığında fırlatılır"""
+    pass
+
+
+class PooledConnection:
+    """Havuza ait bir MySQL bağlantısını saran vekil nesne
+
+    Çağıranlar bağlantıyı normal bir mysql.connector bağlantısı gibi kullanır.
+    close() çağrıldığında bağlantı kapatılmaz, havuza geri verilir. Kullanımdayken
+    close() çağrılmadan çöpe giden bağlantının gerçek bağlantısı kapatılır ve
+    havuzdaki yeri boşaltılır; böylece unutulan bir close() havuzu kalıcı olarak küçültmez.
+    """
+
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._raw = raw_connection
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        # Finalizer vekil nesneye referans tutamaz; kullanım durumu ayrı bir sözlükte tutulur
+        self._lease = {'checked_out': False}
+        weakref.finalize(self, pool._reclaim, raw_connection, self._lease)
+
+    @property
+    def _checked_out(self):
+        return self._lease['checked_out']
+
+    @_checked_out.setter
+    def _checked_out(self, value):
+        self._lease['checked_out'] = value
+
+    def __getattr__(self, name):
+        # Bilinmeyen tüm öznitelikleri gerçek bağlantıya yönlendir
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        """Gidiş-dönüş sayısı ve süresi ölçülen bir cursor döndür"""
+        from utils.metrics import record_db_call
+        from utils.query_detector import record_sql
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs), record_db_call, record_sql)
+
+    def close(self):
+        """Bağlantıyı havuza geri ver"""
+        if not self._checked_out:
+            return
+        self._checked_out = False
+        self._pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+
+class InstrumentedCursor:
+    """execute/executemany çağrılarını metriklere yazan cursor vekili"""
+
+    def __init__(self, raw_cursor, record, record_statement=None):
+        self._raw = raw_cursor
+        self._record = record
+        self._record_statement = record_statement
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._raw.close()
+        return False
+
+    def _timed(self, method, *args, **kwargs):
+        if self._record_statement is not None and args:
+            self._record_statement(args[0])
+        started_at = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._record('mysql', time.perf_counter() - started_at)
+
+    def execute(self, *args, **kwargs):
+        return self._timed(self._raw.execute, *args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self._timed(self._raw.executemany, *args, **kwargs)
+
+
+class MySQLConnectionPool:
+    """Boyutu, taşma limiti ve bekleme süresi ayarlanabilen MySQL bağlantı havuzu
+
+    - pool_size: Havuzda boşta tutulabilecek kalıcı bağlantı sayısı
+    - max_overflow: pool_size üzerine geçici olarak açılabilecek ek bağlantı sayısı
+    - timeout: Tüm bağlantılar kullanımdayken bir bağlantı için beklenecek süre (sn)
+    - recycle: Bu süreden (sn) eski bağlantılar yeniden oluşturulur
+    - pre_ping_interval: Bu süreden (sn) uzun boşta kalan bağlantılar kullanılmadan önce doğrulanır
+    """
+
+    def __init__(self, connect_kwargs, pool_size=5, max_overflow=10, timeout=10,
+                 recycle=3600, pre_ping_interval=30):
+        self.connect_kwargs = connect_kwargs
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping_interval = pre_ping_interval
+
+        self._idle = []
+        self._lock = threading.Condition()
+        self._open_count = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._recycled = 0
+        self._timeouts = 0
+        self._leaked = 0
+
+    @property
+    def max_connections(self):
+        return self.pool_size + self.max_overflow
+
+    def _create_connection(self):
+        raw = mysql.connector.connect(**self.connect_kwargs)
+        with self._lock:
+            self._created += 1
+        return PooledConnection(self, raw)
+
+    def _discard(self, conn):
+        """Bağlantıyı kapat ve havuzdaki yerini boşalt"""
+        self._discard_raw(conn._raw)
+
+    def _discard_raw(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._open_count -= 1
+            self._lock.notify()
+
+    def _reclaim(self, raw, lease):
+        """close() çağrılmadan çöpe giden kullanımdaki bağlantının yerini geri al"""
+        if not lease['checked_out']:
+            return
+        lease['checked_out'] = False
+        with self._lock:
+            self._in_use -= 1
+            self._leaked += 1
+        # Yarım kalmış işlem durumu bilinmediğinden bağlantı yeniden kullanılmaz
+        self._discard_raw(raw)
+
+    def _is_usable(self, conn):
+        """Eski veya kopmuş bağlantıları tespit et"""
+        now = time.monotonic()
+        if self.recycle and now - conn.created_at > self.recycle:
+            return False
+        if self.pre_ping_interval is not None and now - conn.last_used_at > self.pre_ping_interval:
+            try:
+                conn._raw.ping(reconnect=False)
+            except Exception:
+                return False
+        return True
+
+    def get_connection(self):
+        """Havuzdan bir bağlantı al; gerekirse yeni bağlantı oluştur veya bekle"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = None
+            create_new = False
+            with self._lock:
+                while not self._idle and self._open_count >= self.max_connections:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"MySQL havuzundan {self.timeout} saniye içinde bağlantı alınamadı"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._lock.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    # Yer ayır, bağlantıyı kilit dışında oluştur
+                    self._open_count += 1
+                    create_new = True
+
+            if create_new:
+                try:
+                    conn = self._create_connection()
+                except Exception:
+                    with self._lock:
+                        self._open_count -= 1
+                        self._lock.notify()
+                    raise
+            elif not self._is_usable(conn):
+                with self._lock:
+                    self._recycled += 1
+                self._discard(conn)
+                continue
+
+            with self._lock:
+                self._in_use += 1
+            conn._checked_out = True
+            return conn
+
+    def release(self, conn):
+        """Bağlantıyı havuza geri koy; açık işlemleri geri al"""
+        with self._lock:
+            self._in_use -= 1
+
+        try:
+            # Yarım kalmış işlemler bir sonraki kullanıcıya sızmasın
+            conn._raw.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+
+        conn.last_used_at = time.monotonic()
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                self._lock.notify()
+                return
+
+        # Taşma bağlantısı: havuzda yer yok, kapat
+        self._discard(conn)
+
+    def stats(self):
+        """Havuz metriklerini döndür"""
+        with self._lock:
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'open': self._open_count,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'waiting': self._waiting,
+                'created': self._created,
+                'recycled': self._recycled,
+                'timeouts': self._timeouts,
+                'leaked': self._leaked
+            }
+
+    def dispose(self):
+        """Boştaki tüm bağlantıları kapat"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_connect_kwargs():
+    # Always use localhost for MySQL in test mode or selenium tests
+    if is_test_mode or 'FLASK_TEST_PORT' in os.environ:
+        host = 'localhost'
+        database = os.getenv('MYSQL_DATABASE', 'ecommerce_test')
+    else:
+        host = os.getenv('MYSQL_HOST', 'localhost')
+        database = os.getenv('MYSQL_DATABASE', 'ecommerce')
+
+    return {
+        'host': host,
+        'user': os.getenv('MYSQL_USER', 'root'),
+        'password': os.getenv('MYSQL_PASSWORD', ''),
+        'database': database,
+        'port': int(os.getenv('MYSQL_PORT', 3306)),
+        'connection_timeout': 5  # Reduced timeout for faster failure
+    }
+
+
+def get_pool():
+    """Uygulama genelinde paylaşılan MySQL bağlantı havuzunu al"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = MySQLConnectionPool(
+                    _get_connect_kwargs(),
+                    pool_size=int(os.getenv('MYSQL_POOL_SIZE', 5)),
+                    max_overflow=int(os.getenv('MYSQL_POOL_MAX_OVERFLOW', 10)),
+                    timeout=float(os.getenv('MYSQL_POOL_TIMEOUT', 10)),
+                    recycle=float(os.getenv('MYSQL_POOL_RECYCLE', 3600)),
+                    pre_ping_interval=float(os.getenv('MYSQL_POOL_PRE_PING', 30))
+                )
+    return _pool
+
+
+def get_pool_stats():
+    """Havuz metriklerini döndür (havuz henüz oluşturulmadıysa boş sözlük)"""
+    if _pool is None:
+        return {}
+    return _pool.stats()
+
+
 def get_mysql_connection():
-    """MySQL veritabanına bağlantı al"""
+    """MySQL veritabanına bağlantı al
+
+    Bağlantı havuzdan alınır; conn.close() bağlantıyı kapatmak yerine havuza geri verir.
+
+    Raises:
+        PoolTimeoutError: Havuz dolu ve bekleme süresi aşıldıysa (uygulama 503 döndürür)
+    """
     try:
-        # Always use localhost for MySQL in test mode or selenium tests
-        if is_test_mode or 'FLASK_TEST_PORT' in os.environ:
-            host = 'localhost'
-            database = os.getenv('MYSQL_DATABASE', 'ecommerce_test')
-        else:
-            host = os.getenv('MYSQL_HOST', 'localhost')
-            database = os.getenv('MYSQL_DATABASE', 'ecommerce')
-            
-        connection = mysql.connector.connect(
-            host=host,
-            user=os.getenv('MYSQL_USER', 'root'),
-            password=os.getenv('MYSQL_PASSWORD', ''),
-            database=database,
-            port=int(os.getenv('MYSQL_PORT', 3306)),
-            connection_timeout=5  # Reduced timeout for faster failure
-        )
-        return connection
+        return get_pool().get_connection()
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         print(f"MySQL bağlantı hatası: {str(e)}")
         # If we're in test mode, we can continue without MySQL
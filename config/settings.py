@@ -34,6 +34,58 @@ class Config:
     MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE', 'ecommerce')
     MYSQL_PORT = int(os.environ.get('MYSQL_PORT', 3306))
     
+    # E-posta kuyruğu (outbox) Konfigürasyonu
+    EMAIL_OUTBOX_ENABLED = os.environ.get('EMAIL_OUTBOX_ENABLED', 'True').lower() == 'true'
+    EMAIL_OUTBOX_WORKERS = int(os.environ.get('EMAIL_OUTBOX_WORKERS', 2))
+    EMAIL_OUTBOX_POLL_INTERVAL = float(os.environ.get('EMAIL_OUTBOX_POLL_INTERVAL', 5))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+    EMAIL_OUTBOX_BACKOFF_BASE = float(os.environ.get('EMAIL_OUTBOX_BACKOFF_BASE', 30))
+    EMAIL_OUTBOX_BACKOFF_MAX = float(os.environ.get('EMAIL_OUTBOX_BACKOFF_MAX', 3600))
+    
+    # Ürün listeleme yanıt önbelleği Konfigürasyonu
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+    RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 256))
+    
+    # Ürün varlık önbelleği (Product.get_by_id / get_many) Konfigürasyonu
+    PRODUCT_CACHE_TTL = float(os.environ.get('PRODUCT_CACHE_TTL', 60))
+    PRODUCT_CACHE_MAX_ENTRIES = int(os.environ.get('PRODUCT_CACHE_MAX_ENTRIES', 2048))
+    
+    # bcrypt maliyeti; BCRYPT_TARGET_MS verilirse açılışta bu bütçeye göre ölçülür
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    BCRYPT_TARGET_MS = float(os.environ.get('BCRYPT_TARGET_MS', 0))
+    
+    # bcrypt parola havuzu Konfigürasyonu
+    PASSWORD_POOL_WORKERS = int(os.environ.get('PASSWORD_POOL_WORKERS', os.cpu_count() or 2))
+    PASSWORD_POOL_MAX_QUEUE = int(os.environ.get('PASSWORD_POOL_MAX_QUEUE', 16))
+    PASSWORD_POOL_TIMEOUT = float(os.environ.get('PASSWORD_POOL_TIMEOUT', 10))
+    
+    # last_login toplu yazım (write-behind) Konfigürasyonu
+    LAST_LOGIN_WRITE_BEHIND = os.environ.get('LAST_LOGIN_WRITE_BEHIND', 'True').lower() == 'true'
+    LAST_LOGIN_FLUSH_INTERVAL = float(os.environ.get('LAST_LOGIN_FLUSH_INTERVAL', 5))
+    LAST_LOGIN_MAX_PENDING = int(os.environ.get('LAST_LOGIN_MAX_PENDING', 1000))
+    
+    # Log dosyası döndürme ve örnekleme Konfigürasyonu
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+    LOG_ROTATE_INTERVAL = int(os.environ.get('LOG_ROTATE_INTERVAL', 86400))
+    LOG_COMPRESS = os.environ.get('LOG_COMPRESS', 'True').lower() == 'true'
+    LOG_DEBUG_SAMPLE_RATES = os.environ.get('LOG_DEBUG_SAMPLE_RATES', '')
+    
+    # İstek metrikleri (/metrics) Konfigürasyonu
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    
+    # N+1 sorgu dedektörü (staging için önerilir)
+    QUERY_DETECTOR_ENABLED = os.environ.get('QUERY_DETECTOR_ENABLED', 'False').lower() == 'true'
+    QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', 5))
+    
+    # İstek profilleme Konfigürasyonu (X-Profile başlığı veya örnekleme ile)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN')
+    PROFILING_DIR = os.environ.get('PROFILING_DIR', os.path.join(os.getcwd(), 'profiles'))
+    PROFILING_MAX_PROFILES = int(os.environ.get('PROFILING_MAX_PROFILES', 50))
+    
     # Yükleme klasörü
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
     
@@ -53,6 +105,16 @@ class TestConfig(Config):
     # Test için gerçek e-posta gönderme
     MAIL_SUPPRESS_SEND = True
     
+    # Test için e-posta kuyruğu işçilerini başlatma
+    EMAIL_OUTBOX_ENABLED = False
+    
+    # Testler her istekte mock koleksiyonlarını değiştirdiği için önbellekleri kapat
+    RESPONSE_CACHE_ENABLED = False
+    PRODUCT_CACHE_MAX_ENTRIES = 0
+    BCRYPT_ROUNDS = 4
+    LAST_LOGIN_WRITE_BEHIND = False
+    BCRYPT_TARGET_MS = 0
+    
     # Test için MongoDB kullanma - localhost'u kullan
     MONGO_URI = 'mongodb://localhost:27017/'
     MONGO_DB_NAME = 'ecommerce_test'
@@ -2,6 +2,17 @@ from config.mongodb_db import get_db
 from config.mysql_db import get_mysql_connection
 from bson import ObjectId
 from datetime import datetime, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# Sepet API'sinin döndürebileceği alanlar; product_available ürün durumundan hesaplanır
+CART_ITEM_FIELDS = [
+    '_id', 'product_id', 'product_name', 'quantity', 'price', 'image_url',
+    'created_at', 'updated_at', 'product_available'
+]
+
+# Sepet görünümü için varsayılan alanlar
+CART_VIEW_FIELDS = ['_id', 'product_id', 'product_name', 'quantity', 'price', 'image_url', 'product_available']
 
 class Cart:
     @staticmethod
@@ -10,39 +21,39 @@ class Cart:
         db = get_db()
         carts_collection = db.carts
         
-        # Ürün sepette zaten var mı kontrol et
-        existing_item = carts_collection.find_one({
+        # Ürün sepette varsa miktarı artır, yoksa yeni satır oluştur (tek atomik işlem)
+        cart_filter = {
             'user_id': user_id,
             'product_id': product_id,
             'is_checked_out': False
-        })
-        
-        if existing_item:
-            # Ürün zaten varsa miktarı güncelle
-            result = carts_collection.update_one(
-                {'_id': existing_item['_id']},
-                {
-                    '$set': {
-                        'quantity': existing_item['quantity'] + quantity,
-                        'price': price
-                    }
-                }
-            )
-            return str(existing_item['_id'])
-        else:
-            # Sepete yeni ürün ekle
-            cart_item = {
-                'user_id': user_id,
-                'product_id': product_id,
-                'quantity': quantity,
-                'price': float(price),
+        }
+        update = {
+            '$inc': {'quantity': quantity},
+            '$set': {'price': float(price)},
+            '$setOnInsert': {
                 'added_at': datetime.now(timezone.utc),
-                'is_checked_out': False,
                 'checked_out_at': None
             }
-            
-            result = carts_collection.insert_one(cart_item)
-            return str(result.inserted_id)
+        }
+        
+        try:
+            cart_item = carts_collection.find_one_and_update(
+                cart_filter,
+                update,
+                projection={'_id': 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Eşzamanlı bir ekleme satırı az önce oluşturdu; mevcut satırı güncelle
+            cart_item = carts_collection.find_one_and_update(
+                cart_filter,
+                update,
+                projection={'_id': 1},
+                return_document=ReturnDocument.AFTER
+            )
+        
+        return str(cart_item['_id'])
     
     @staticmethod
     def get_user_cart(user_id):
@@ -50,71 +61,74 @@ class Cart:
         db = get_db()
         carts_collection = db.carts
         
-        cart_items = list(carts_collection.find({
+        return list(carts_collection.find({
             'user_id': user_id,
             'is_checked_out': False
         }))
-        
-        # ObjectId'yi stringe çevir
-        for item in cart_items:
-            item['_id'] = str(item['_id'])
-        
-        return cart_items
     
+    @staticmethod
+    def hydrate_items(cart_items, products_collection=None, projection=None):
+        """Sepet öğelerini ürün bilgileriyle zenginleştir
+
+        Sepetteki tüm ürün ID'leri tek bir $in sorgusuyla çözülür, böylece
+        veritabanı çağrısı sayısı sepet boyutuna bağlı değildir. Her öğenin
+        kopyasına 'product' anahtarı eklenir (ürün bulunamazsa None).
+        Silinmiş ürünler de döner; çağıran 'is_deleted' alanını kontrol etmelidir.
+        projection verilirse ürünlerin yalnızca bu alanları (ve _id) getirilir.
+        """
+        if products_collection is None:
+            products_collection = get_db().products
+
+        # Geçerli ObjectId'leri sırayı koruyarak tekilleştir
+        object_ids = {}
+        for item in cart_items:
+            try:
+                object_ids[ObjectId(item['product_id'])] = True
+            except Exception:
+                # Geçersiz ID'li öğeler ürünsüz kalır
+                continue
+
+        products = {}
+        if object_ids:
+            for product in products_collection.find({'_id': {'$in': list(object_ids)}}, projection):
+                products[str(product['_id'])] = product
+
+        hydrated = []
+        for item in cart_items:
+            enriched = dict(item)
+            enriched['product'] = products.get(str(item['product_id']))
+            hydrated.append(enriched)
+
+        return hydrated
+
     @staticmethod
     def get_items(user_id):
         """Kullanıcının sepetindeki ürünleri, ürün bilgileriyle birlikte getir"""
         db = get_db()
         carts_collection = db.carts
-        
+
         # Get cart items
         cart_items = list(carts_collection.find({
             'user_id': user_id,
             'is_checked_out': False
-        }))
-        
-        # Get product details for each item
-        products_collection = db.products
+        }, {'product_id': 1, 'quantity': 1, 'price': 1}))
+
         result = []
-        
-        for item in cart_items:
-            # Convert MongoDB ObjectId to string
-            item_id = str(item['_id'])
-            
-            # Get product details from MongoDB
-            try:
-                product = products_collection.find_one({
-                    '_id': ObjectId(item['product_id']),
-                    'is_deleted': False
-                })
-                
-                if product:
-                    result.append({
-                        'id': item_id,
-                        'product_id': str(product['_id']),
-                        'quantity': item['quantity'],
-                        'price': float(item['price']),
-                        'product_name': product['name'],
-                        'product_image': product.get('image', '/static/images/default-product.jpg')
-                    })
-            except Exception as e:
-                # Eğer ObjectId dönüştürme başarısız olursa, item['product_id'] zaten string olabilir
-                # Bu durumda eski mantığı kullan ama MongoDB'den ara
-                product = products_collection.find_one({
-                    'name': {'$exists': True},  # Basit bir kontrol
-                    'is_deleted': False
-                })
-                
-                if product and str(product['_id']) == str(item['product_id']):
-                    result.append({
-                        'id': item_id,
-                        'product_id': item['product_id'],
-                        'quantity': item['quantity'],
-                        'price': float(item['price']),
-                        'product_name': product['name'],
-                        'product_image': product.get('image', '/static/images/default-product.jpg')
-                    })
-        
+        product_fields = {'name': 1, 'image': 1, 'is_deleted': 1}
+        for item in Cart.hydrate_items(cart_items, db.products, product_fields):
+            product = item['product']
+            if not product or product.get('is_deleted'):
+                continue
+
+            result.append({
+                'id': str(item['_id']),
+                'product_id': str(product['_id']),
+                'quantity': item['quantity'],
+                'price': float(item['price']),
+                'product_name': product['name'],
+                'product_image': product.get('image', '/static/images/default-product.jpg')
+            })
+
         return result
     
     @staticmethod
@@ -164,15 +178,23 @@ class Cart:
         return result.modified_count
     
     @staticmethod
-    def clear(user_id):
-        """Kullanıcının sepetini temizle"""
+    def clear(user_id, cart_ids=None):
+        """Kullanıcının sepetini temizle
+        
+        cart_ids verilirse yalnızca bu satırlar silinir; böylece sipariş oluşturulurken
+        sepete eklenen ürünler kaybolmaz.
+        """
         db = get_db()
         carts_collection = db.carts
         
-        result = carts_collection.delete_many({
+        query = {
             'user_id': user_id,
             'is_checked_out': False
-        })
+        }
+        if cart_ids is not None:
+            query['_id'] = {'$in': [ObjectId(cart_id) for cart_id in cart_ids]}
+        
+        result = carts_collection.delete_many(query)
         
         return result.deleted_count
 
@@ -183,19 +205,21 @@ class Cart:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = """
-        SELECT c.*, p.name as product_name, p.price as product_price, p.image as product_image
-        FROM cart c
-        JOIN products p ON c.product_id = p.id
-        WHERE c.user_id = %s
-        """
-        cursor.execute(query, (user_id,))
-        
-        cart_items = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
-        return cart_items
+        try:
+            query = """
+            SELECT c.*, p.name as product_name, p.price as product_price, p.image as product_image
+            FROM cart c
+            JOIN products p ON c.product_id = p.id
+            WHERE c.user_id = %s
+            """
+            cursor.execute(query, (user_id,))
+            
+            cart_items = cursor.fetchall()
+            
+            return cart_items
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def add_to_cart(user_id, product_id, quantity):
@@ -203,33 +227,33 @@ class Cart:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        # Ürün sepette var mı kontrol et
-        check_query = "SELECT * FROM cart WHERE user_id = %s AND product_id = %s"
-        cursor.execute(check_query, (user_id, product_id))
-        
-        existing_item = cursor.fetchone()
-        
-        if existing_item:
-            # Ürün varsa miktarı güncelle
-            update_query = "UPDATE cart SET quantity = quantity + %s WHERE id = %s"
-            cursor.execute(update_query, (quantity, existing_item['id']))
+        try:
+            # Ürün sepette var mı kontrol et
+            check_query = "SELECT * FROM cart WHERE user_id = %s AND product_id = %s"
+            cursor.execute(check_query, (user_id, product_id))
             
-            conn.commit()
-            cursor.close()
-            conn.close()
+            existing_item = cursor.fetchone()
             
-            return {'cart_id': existing_item['id'], 'status': 'updated'}
-        else:
-            # Yeni ürün ekle
-            insert_query = "INSERT INTO cart (user_id, product_id, quantity) VALUES (%s, %s, %s)"
-            cursor.execute(insert_query, (user_id, product_id, quantity))
+            if existing_item:
+                # Ürün varsa miktarı güncelle
+                update_query = "UPDATE cart SET quantity = quantity + %s WHERE id = %s"
+                cursor.execute(update_query, (quantity, existing_item['id']))
             
-            cart_id = cursor.lastrowid
-            conn.commit()
+                conn.commit()
+            
+                return {'cart_id': existing_item['id'], 'status': 'updated'}
+            else:
+                # Yeni ürün ekle
+                insert_query = "INSERT INTO cart (user_id, product_id, quantity) VALUES (%s, %s, %s)"
+                cursor.execute(insert_query, (user_id, product_id, quantity))
+            
+                cart_id = cursor.lastrowid
+                conn.commit()
+            
+                return {'cart_id': cart_id, 'status': 'added'}
+        finally:
             cursor.close()
             conn.close()
-            
-            return {'cart_id': cart_id, 'status': 'added'}
     
     @staticmethod
     def update_cart_item(cart_id, user_id, quantity):
@@ -237,15 +261,17 @@ class Cart:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = "UPDATE cart SET quantity = %s WHERE id = %s AND user_id = %s"
-        cursor.execute(query, (quantity, cart_id, user_id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
+        try:
+            query = "UPDATE cart SET quantity = %s WHERE id = %s AND user_id = %s"
+            cursor.execute(query, (quantity, cart_id, user_id))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def remove_from_cart(cart_id, user_id):
@@ -253,15 +279,17 @@ class Cart:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = "DELETE FROM cart WHERE id = %s AND user_id = %s"
-        cursor.execute(query, (cart_id, user_id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
+        try:
+            query = "DELETE FROM cart WHERE id = %s AND user_id = %s"
+            cursor.execute(query, (cart_id, user_id))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def clear_cart(user_id):
@@ -269,12 +297,14 @@ class Cart:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = "DELETE FROM cart WHERE user_id = %s"
-        cursor.execute(query, (user_id,))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
+        try:
+            query = "DELETE FROM cart WHERE user_id = %s"
+            cursor.execute(query, (user_id,))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
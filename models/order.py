@@ -1,5 +1,11 @@
 from config.mysql_db import get_mysql_connection
 
+# Sipariş geçmişinde seçilebilecek kolonlar (fields parametresi için beyaz liste)
+ORDER_FIELDS = ['id', 'user_id', 'total_amount', 'shipping_address', 'status', 'created_at']
+
+# Sipariş geçmişi için varsayılan özet projeksiyon (shipping_address gibi büyük alanlar hariç)
+ORDER_SUMMARY_FIELDS = ['id', 'total_amount', 'status', 'created_at']
+
 class Order:
     @staticmethod
     def create(user_id, total_amount, shipping_address):
@@ -7,24 +13,72 @@ class Order:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = """
-        INSERT INTO orders (user_id, total_amount, shipping_address, status) 
-        VALUES (%s, %s, %s, %s)
-        """
+        try:
+            query = """
+            INSERT INTO orders (user_id, total_amount, shipping_address, status) 
+            VALUES (%s, %s, %s, %s)
+            """
+            
+            cursor.execute(query, (
+                user_id,
+                total_amount,
+                shipping_address,
+                'pending'
+            ))
+            
+            order_id = cursor.lastrowid
+            conn.commit()
+            
+            return order_id
+        finally:
+            cursor.close()
+            conn.close()
+    
+    @staticmethod
+    def create_with_items(user_id, total_amount, shipping_address, items):
+        """Sipariş başlığını ve tüm öğelerini tek bağlantıda, tek transaction ile oluştur
+        
+        Öğeler tek bir executemany çağrısıyla eklenir ve sipariş başına yalnızca bir
+        commit yapılır. Herhangi bir adım başarısız olursa transaction geri alınır ve
+        hata yeniden fırlatılır; yarım kalmış sipariş oluşmaz.
         
-        cursor.execute(query, (
-            user_id,
-            total_amount,
-            shipping_address,
-            'pending'
-        ))
+        Args:
+            items: product_id, quantity ve price anahtarlarını içeren sözlük listesi
         
-        order_id = cursor.lastrowid
-        conn.commit()
-        cursor.close()
-        conn.close()
+        Returns:
+            int: Oluşturulan siparişin ID'si
+        """
+        conn = get_mysql_connection()
+        cursor = conn.cursor()
         
-        return order_id
+        try:
+            cursor.execute("""
+            INSERT INTO orders (user_id, total_amount, shipping_address, status) 
+            VALUES (%s, %s, %s, %s)
+            """, (
+                user_id,
+                total_amount,
+                shipping_address,
+                'pending'
+            ))
+            order_id = cursor.lastrowid
+            
+            cursor.executemany("""
+            INSERT INTO order_items (order_id, product_id, quantity, price) 
+            VALUES (%s, %s, %s, %s)
+            """, [
+                (order_id, item['product_id'], item['quantity'], item['price'])
+                for item in items
+            ])
+            
+            conn.commit()
+            return order_id
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def get_by_id(order_id):
@@ -32,29 +86,87 @@ class Order:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = "SELECT * FROM orders WHERE id = %s"
-        cursor.execute(query, (order_id,))
-        
-        order = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        
-        return order
+        try:
+            query = "SELECT * FROM orders WHERE id = %s"
+            cursor.execute(query, (order_id,))
+            
+            order = cursor.fetchone()
+            
+            return order
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
-    def get_by_user(user_id):
-        """Kullanıcının tüm siparişlerini getir"""
+    def get_with_items(order_id, user_id):
+        """Kullanıcıya ait siparişi ve öğelerini aynı bağlantı üzerinden getir
+        
+        Returns:
+            tuple: (sipariş, öğeler); sipariş bulunamazsa veya kullanıcıya ait değilse (None, [])
+        """
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = "SELECT * FROM orders WHERE user_id = %s ORDER BY created_at DESC"
-        cursor.execute(query, (user_id,))
+        try:
+            cursor.execute(
+                "SELECT * FROM orders WHERE id = %s AND user_id = %s",
+                (order_id, user_id)
+            )
+            order = cursor.fetchone()
+            if not order:
+                return None, []
+            
+            cursor.execute(
+                "SELECT * FROM order_items WHERE order_id = %s",
+                (order_id,)
+            )
+            items = cursor.fetchall()
+            return order, items
+        finally:
+            cursor.close()
+            conn.close()
+    
+    @staticmethod
+    def get_by_user(user_id, limit=None, after=None, fields=None):
+        """Kullanıcının siparişlerini en yeniden eskiye getir
         
-        orders = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        (user_id, created_at DESC, id) indeksi üzerinden keyset sayfalama yapar.
         
-        return orders
+        Args:
+            limit: En fazla kaç sipariş döneceği (None ise tümü)
+            after: Son görülen siparişin (created_at, id) çifti; verilirse ondan sonrakiler döner
+            fields: Seçilecek kolonlar (ORDER_FIELDS içinden); None ise tüm kolonlar
+        """
+        conn = get_mysql_connection()
+        cursor = conn.cursor(dictionary=True)
+        
+        if fields is None:
+            columns = '*'
+        else:
+            # Sayfalama için created_at ve id her zaman seçilir
+            selected = [field for field in ORDER_FIELDS if field in fields or field in ('id', 'created_at')]
+            columns = ', '.join(selected)
+        
+        query = f"SELECT {columns} FROM orders WHERE user_id = %s"
+        params = [user_id]
+        
+        if after is not None:
+            last_created_at, last_id = after
+            query += " AND (created_at < %s OR (created_at = %s AND id < %s))"
+            params.extend([last_created_at, last_created_at, last_id])
+        
+        query += " ORDER BY created_at DESC, id DESC"
+        
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(int(limit))
+        
+        try:
+            cursor.execute(query, tuple(params))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def update_status(order_id, status):
@@ -62,15 +174,17 @@ class Order:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = "UPDATE orders SET status = %s WHERE id = %s"
-        cursor.execute(query, (status, order_id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
+        try:
+            query = "UPDATE orders SET status = %s WHERE id = %s"
+            cursor.execute(query, (status, order_id))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
 
 
 class OrderItem:
@@ -80,24 +194,26 @@ class OrderItem:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = """
-        INSERT INTO order_items (order_id, product_id, quantity, price) 
-        VALUES (%s, %s, %s, %s)
-        """
-        
-        cursor.execute(query, (
-            order_id,
-            product_id,
-            quantity,
-            price
-        ))
-        
-        item_id = cursor.lastrowid
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return item_id
+        try:
+            query = """
+            INSERT INTO order_items (order_id, product_id, quantity, price) 
+            VALUES (%s, %s, %s, %s)
+            """
+            
+            cursor.execute(query, (
+                order_id,
+                product_id,
+                quantity,
+                price
+            ))
+            
+            item_id = cursor.lastrowid
+            conn.commit()
+            
+            return item_id
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def get_by_order(order_id):
@@ -105,11 +221,13 @@ class OrderItem:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = "SELECT * FROM order_items WHERE order_id = %s"
-        cursor.execute(query, (order_id,))
-        
-        items = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
-        return items
+        try:
+            query = "SELECT * FROM order_items WHERE order_id = %s"
+            cursor.execute(query, (order_id,))
+            
+            items = cursor.fetchall()
+            
+            return items
+        finally:
+            cursor.close()
+            conn.close()
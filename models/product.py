@@ -2,8 +2,43 @@ from config.mongodb_db import get_db
 from config.mysql_db import get_mysql_connection
 from bson import ObjectId
 from datetime import datetime, timezone
+from pymongo import UpdateOne
+from utils.helpers import mongo_projection, normalize_search_text
+from utils.cache import product_cache
+import copy
+
+# Bulunamayan ürünlerin önbellekte kalma süresi (sn)
+NEGATIVE_CACHE_TTL = 10
+
+# get_summaries kayıtları tam ürün kayıtlarından ayrı anahtarlarda tutulur
+SUMMARY_KEY_PREFIX = 'summary:'
+
+_NOT_CACHED = object()
+
+# API'nin döndürebileceği ürün alanları; fields= parametresi bu listeyle sınırlıdır
+# (name_search/description_search gibi iç alanlar hariç)
+PRODUCT_FIELDS = [
+    '_id', 'supplier_id', 'name', 'description', 'price', 'stock',
+    'image', 'image_url', 'category', 'created_at', 'updated_at'
+]
+
+# Ürün ızgarası ve listeleri için varsayılan projeksiyon
+PRODUCT_LIST_FIELDS = ['_id', 'supplier_id', 'name', 'description', 'price', 'stock', 'image', 'created_at']
 
 class Product:
+    @staticmethod
+    def search_fields(name=None, description=None):
+        """Metin ve önek araması için normalize edilmiş alanları oluştur
+
+        Yalnızca verilen alanlar döner; güncellemelerde değişmeyen alanlara dokunulmaz.
+        """
+        fields = {}
+        if name is not None:
+            fields['name_search'] = normalize_search_text(name)
+        if description is not None:
+            fields['description_search'] = normalize_search_text(description)
+        return fields
+    
     @staticmethod
     def create(supplier_id, name, description, price, stock):
         """Yeni bir ürün oluştur"""
@@ -19,59 +54,171 @@ class Product:
             'created_at': datetime.now(timezone.utc),
             'is_deleted': False
         }
+        product.update(Product.search_fields(name, description))
         
         result = products_collection.insert_one(product)
         return str(result.inserted_id)
     
     @staticmethod
     def get_by_id(product_id):
-        """Ürünü ID'ye göre getir"""
-        db = get_db()
-        products_collection = db.products
-        
+        """Ürünü ID'ye göre getir
+
+        Sonuçlar product_cache üzerinden sunulur; bulunamayan veya geçersiz ID'ler
+        de kısa süreliğine önbelleğe alınır.
+        """
         try:
-            product = products_collection.find_one({
-                '_id': ObjectId(product_id),
-                'is_deleted': False
-            })
-            
-            if product:
-                product['_id'] = str(product['_id'])
-            
-            return product
+            return Product.get_many([product_id]).get(str(product_id))
         except:
             return None
     
     @staticmethod
-    def get_all(limit=20, skip=0):
-        """Tüm ürünleri getir"""
+    def get_many(product_ids):
+        """Birden fazla ürünü ID'ye göre getir
+        
+        Önbellekte olanlar bellekten, olmayanların tamamı tek bir $in sorgusuyla
+        getirilir. Silinmiş, bulunamayan veya geçersiz ID'ler sonuçta yer almaz.
+        
+        Returns:
+            dict: {ürün ID'si (str): ürün} eşlemesi; ürünler çağırana ait kopyalardır
+        """
+        found = {}
+        missing = {}
+        for product_id in product_ids:
+            key = str(product_id)
+            if key in found or key in missing:
+                continue
+            cached = product_cache.get(key, _NOT_CACHED)
+            if cached is _NOT_CACHED:
+                missing[key] = None
+            elif cached is not None:
+                found[key] = cached
+        
+        if missing:
+            object_ids = []
+            for key in missing:
+                try:
+                    object_ids.append(ObjectId(key))
+                except Exception:
+                    # Geçersiz ID; negatif kayıt olarak kalır
+                    continue
+            
+            generation = product_cache.generation
+            fetched = {}
+            if object_ids:
+                db = get_db()
+                products_collection = db.products
+                for product in products_collection.find({
+                    '_id': {'$in': object_ids},
+                    'is_deleted': False
+                }):
+                    product['_id'] = str(product['_id'])
+                    fetched[product['_id']] = product
+            
+            product_cache.set_many(fetched, generation=generation)
+            product_cache.set_many(
+                {key: None for key in missing if key not in fetched},
+                ttl=NEGATIVE_CACHE_TTL,
+                generation=generation
+            )
+            found.update(fetched)
+        
+        return {key: copy.deepcopy(product) for key, product in found.items()}
+    
+    @staticmethod
+    def get_summaries(product_ids):
+        """Sipariş ve sepet görünümleri için ürünlerin yalnızca ad ve görselini getir
+        
+        Önbellekte olmayanlar tek bir $in sorgusuyla, yalnızca name ve image alanları
+        okunarak getirilir. Silinmiş ürünler de önbelleğe alınır; eski siparişler
+        tekrar görüntülendiğinde veritabanına gidilmez.
+        
+        Returns:
+            dict: {ürün ID'si (str): {'name', 'image'}} eşlemesi; silinmiş, bulunamayan
+            veya geçersiz ID'ler için değer None'dır
+        """
+        summaries = {}
+        missing = []
+        for product_id in product_ids:
+            key = str(product_id)
+            if key in summaries:
+                continue
+            cached = product_cache.get(SUMMARY_KEY_PREFIX + key, _NOT_CACHED)
+            if cached is _NOT_CACHED:
+                missing.append(key)
+                summaries[key] = None
+            else:
+                summaries[key] = cached
+        
+        if missing:
+            object_ids = []
+            for key in missing:
+                try:
+                    object_ids.append(ObjectId(key))
+                except Exception:
+                    continue
+            
+            generation = product_cache.generation
+            fetched = {}
+            if object_ids:
+                db = get_db()
+                products_collection = db.products
+                for product in products_collection.find(
+                    {'_id': {'$in': object_ids}},
+                    {'name': 1, 'image': 1, 'is_deleted': 1}
+                ):
+                    key = str(product['_id'])
+                    if product.get('is_deleted'):
+                        fetched[key] = None
+                    else:
+                        fetched[key] = {
+                            'name': product.get('name'),
+                            'image': product.get('image')
+                        }
+            
+            product_cache.set_many(
+                {SUMMARY_KEY_PREFIX + key: value for key, value in fetched.items()},
+                generation=generation
+            )
+            product_cache.set_many(
+                {SUMMARY_KEY_PREFIX + key: None for key in missing if key not in fetched},
+                ttl=NEGATIVE_CACHE_TTL,
+                generation=generation
+            )
+            summaries.update(fetched)
+        
+        return {key: dict(value) if value else None for key, value in summaries.items()}
+    
+    @staticmethod
+    def evict_cache(*product_ids):
+        """Ürün yazımlarından sonra ilgili önbellek kayıtlarını çıkar"""
+        keys = []
+        for product_id in product_ids:
+            keys.append(str(product_id))
+            keys.append(SUMMARY_KEY_PREFIX + str(product_id))
+        product_cache.delete(*keys)
+    
+    @staticmethod
+    def get_all(limit=20, skip=0, fields=PRODUCT_LIST_FIELDS):
+        """Tüm ürünleri getir (yalnızca fields alanlarıyla)"""
         db = get_db()
         products_collection = db.products
         
         products = list(products_collection.find(
-            {'is_deleted': False}
+            {'is_deleted': False}, mongo_projection(fields)
         ).sort('created_at', -1).skip(skip).limit(limit))
         
-        # ObjectId'yi string'e çevir
-        for product in products:
-            product['_id'] = str(product['_id'])
-        
         return products
     
     @staticmethod
-    def get_by_supplier(supplier_id):
-        """Tedarikçi ID'sine göre ürünleri getir"""
+    def get_by_supplier(supplier_id, fields=PRODUCT_LIST_FIELDS):
+        """Tedarikçi ID'sine göre ürünleri getir (yalnızca fields alanlarıyla)"""
         db = get_db()
         products_collection = db.products
         
         products = list(products_collection.find({
             'supplier_id': supplier_id,
             'is_deleted': False
-        }))
-        
-        # ObjectId'yi string'e çevir
-        for product in products:
-            product['_id'] = str(product['_id'])
+        }, mongo_projection(fields)))
         
         return products
     
@@ -81,6 +228,12 @@ class Product:
         db = get_db()
         products_collection = db.products
         
+        update_data = dict(update_data)
+        update_data.update(Product.search_fields(
+            update_data.get('name'),
+            update_data.get('description')
+        ))
+        
         try:
             result = products_collection.update_one(
                 {'_id': ObjectId(product_id)},
@@ -90,6 +243,8 @@ class Product:
             return result.modified_count > 0
         except:
             return False
+        finally:
+            Product.evict_cache(product_id)
     
     @staticmethod
     def delete(product_id):
@@ -106,6 +261,64 @@ class Product:
             return result.modified_count > 0
         except:
             return False
+        finally:
+            Product.evict_cache(product_id)
+
+    @staticmethod
+    def backfill_search_fields(batch_size=1000):
+        """Arama alanları olmayan eski ürünleri toplu olarak güncelle"""
+        db = get_db()
+        products_collection = db.products
+        
+        operations = []
+        updated = 0
+        for product in products_collection.find(
+            {'name_search': {'$exists': False}},
+            {'name': 1, 'description': 1}
+        ):
+            operations.append(UpdateOne(
+                {'_id': product['_id']},
+                {'$set': Product.search_fields(product.get('name', ''), product.get('description', ''))}
+            ))
+            if len(operations) >= batch_size:
+                updated += products_collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        
+        if operations:
+            updated += products_collection.bulk_write(operations, ordered=False).modified_count
+        
+        return updated
+
+    @staticmethod
+    def backfill_created_at(batch_size=1000):
+        """created_at'i olmayan ürünlere ObjectId'nin oluşturulma zamanını yaz
+
+        Ürün listesi (created_at, _id) ile sıralanır ve keyset cursor'ı bu alanı
+        taşır; alanı eksik ürünler sıralamanın sonuna düşer ve sayfalamayı keser.
+        """
+        db = get_db()
+        products_collection = db.products
+        
+        operations = []
+        updated = 0
+        for product in products_collection.find(
+            {'created_at': {'$not': {'$type': 'date'}}},
+            {'_id': 1}
+        ):
+            if not isinstance(product['_id'], ObjectId):
+                continue
+            operations.append(UpdateOne(
+                {'_id': product['_id']},
+                {'$set': {'created_at': product['_id'].generation_time}}
+            ))
+            if len(operations) >= batch_size:
+                updated += products_collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        
+        if operations:
+            updated += products_collection.bulk_write(operations, ordered=False).modified_count
+        
+        return updated
 
     # MySQL methods for testing
     @staticmethod
@@ -114,14 +327,16 @@ class Product:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = "SELECT * FROM products WHERE is_deleted = 0 ORDER BY created_at DESC"
-        cursor.execute(query)
-        
-        products = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
-        return products
+        try:
+            query = "SELECT * FROM products WHERE is_deleted = 0 ORDER BY created_at DESC"
+            cursor.execute(query)
+            
+            products = cursor.fetchall()
+            
+            return products
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def get_product_by_id(product_id):
@@ -129,14 +344,16 @@ class Product:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = "SELECT * FROM products WHERE id = %s AND is_deleted = 0"
-        cursor.execute(query, (product_id,))
-        
-        product = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        
-        return product
+        try:
+            query = "SELECT * FROM products WHERE id = %s AND is_deleted = 0"
+            cursor.execute(query, (product_id,))
+            
+            product = cursor.fetchone()
+            
+            return product
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def create_product(product_data):
@@ -144,25 +361,27 @@ class Product:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = """
-        INSERT INTO products (name, price, description, image, category_id) 
-        VALUES (%s, %s, %s, %s, %s)
-        """
-        
-        cursor.execute(query, (
-            product_data['name'],
-            product_data['price'],
-            product_data['description'],
-            product_data['image'],
-            product_data['category_id']
-        ))
-        
-        product_id = cursor.lastrowid
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return product_id
+        try:
+            query = """
+            INSERT INTO products (name, price, description, image, category_id) 
+            VALUES (%s, %s, %s, %s, %s)
+            """
+            
+            cursor.execute(query, (
+                product_data['name'],
+                product_data['price'],
+                product_data['description'],
+                product_data['image'],
+                product_data['category_id']
+            ))
+            
+            product_id = cursor.lastrowid
+            conn.commit()
+            
+            return product_id
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def update_product(product_id, product_data):
@@ -170,27 +389,29 @@ class Product:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = """
-        UPDATE products 
-        SET name = %s, price = %s, description = %s, image = %s, category_id = %s
-        WHERE id = %s
-        """
-        
-        cursor.execute(query, (
-            product_data['name'],
-            product_data['price'],
-            product_data['description'],
-            product_data['image'],
-            product_data['category_id'],
-            product_id
-        ))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
+        try:
+            query = """
+            UPDATE products 
+            SET name = %s, price = %s, description = %s, image = %s, category_id = %s
+            WHERE id = %s
+            """
+            
+            cursor.execute(query, (
+                product_data['name'],
+                product_data['price'],
+                product_data['description'],
+                product_data['image'],
+                product_data['category_id'],
+                product_id
+            ))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def delete_product(product_id):
@@ -198,12 +419,14 @@ class Product:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        query = "UPDATE products SET is_deleted = 1 WHERE id = %s"
-        cursor.execute(query, (product_id,))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
+        try:
+            query = "UPDATE products SET is_deleted = 1 WHERE id = %s"
+            cursor.execute(query, (product_id,))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
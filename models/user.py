@@ -1,6 +1,8 @@
 from config.mysql_db import get_mysql_connection
 from datetime import datetime, timedelta
-from utils.helpers import generate_reset_token, hash_password, check_password
+from utils.helpers import generate_reset_token
+from utils.last_login import get_last_login_buffer
+from utils.password_hasher import hash_password, check_password, password_needs_rehash
 
 class User:
     @staticmethod
@@ -9,14 +11,16 @@ class User:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = "SELECT * FROM users WHERE email = %s"
-        cursor.execute(query, (email,))
-        
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        
-        return user
+        try:
+            query = "SELECT * FROM users WHERE email = %s"
+            cursor.execute(query, (email,))
+            
+            user = cursor.fetchone()
+            
+            return user
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def find_by_id(user_id):
@@ -24,14 +28,16 @@ class User:
         conn = get_mysql_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = "SELECT * FROM users WHERE id = %s"
-        cursor.execute(query, (user_id,))
-        
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        
-        return user
+        try:
+            query = "SELECT * FROM users WHERE id = %s"
+            cursor.execute(query, (user_id,))
+            
+            user = cursor.fetchone()
+            
+            return user
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def create(user_data):
@@ -39,57 +45,13 @@ class User:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        # Şifreyi hash'le
-        hashed_password = hash_password(user_data['password'])
-        
-        query = """
-        INSERT INTO users (username, first_name, last_name, email, password, role) 
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        
-        cursor.execute(query, (
-            user_data['username'],
-            user_data['first_name'],
-            user_data['last_name'],
-            user_data['email'],
-            hashed_password,
-            user_data.get('role', 'customer')
-        ))
-        
-        user_id = cursor.lastrowid
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return user_id
-    
-    @staticmethod
-    def update(user_id, user_data):
-        """Kullanıcı bilgilerini güncelle"""
-        conn = get_mysql_connection()
-        cursor = conn.cursor()
-        
-        # Eğer şifre güncelleniyor ise
-        if 'password' in user_data:
-            query = """
-            UPDATE users 
-            SET username = %s, first_name = %s, last_name = %s, email = %s, password = %s
-            WHERE id = %s
-            """
+        try:
+            # Şifreyi hash'le
+            hashed_password = hash_password(user_data['password'])
             
-            cursor.execute(query, (
-                user_data['username'],
-                user_data['first_name'],
-                user_data['last_name'],
-                user_data['email'],
-                user_data['password'],
-                user_id
-            ))
-        else:
             query = """
-            UPDATE users 
-            SET username = %s, first_name = %s, last_name = %s, email = %s
-            WHERE id = %s
+            INSERT INTO users (username, first_name, last_name, email, password, role) 
+            VALUES (%s, %s, %s, %s, %s, %s)
             """
             
             cursor.execute(query, (
@@ -97,15 +59,63 @@ class User:
                 user_data['first_name'],
                 user_data['last_name'],
                 user_data['email'],
-                user_id
+                hashed_password,
+                user_data.get('role', 'customer')
             ))
+            
+            user_id = cursor.lastrowid
+            conn.commit()
+            
+            return user_id
+        finally:
+            cursor.close()
+            conn.close()
+    
+    @staticmethod
+    def update(user_id, user_data):
+        """Kullanıcı bilgilerini güncelle"""
+        conn = get_mysql_connection()
+        cursor = conn.cursor()
         
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
+        try:
+            # Eğer şifre güncelleniyor ise
+            if 'password' in user_data:
+                query = """
+                UPDATE users 
+                SET username = %s, first_name = %s, last_name = %s, email = %s, password = %s
+                WHERE id = %s
+                """
+            
+                cursor.execute(query, (
+                    user_data['username'],
+                    user_data['first_name'],
+                    user_data['last_name'],
+                    user_data['email'],
+                    user_data['password'],
+                    user_id
+                ))
+            else:
+                query = """
+                UPDATE users 
+                SET username = %s, first_name = %s, last_name = %s, email = %s
+                WHERE id = %s
+                """
+            
+                cursor.execute(query, (
+                    user_data['username'],
+                    user_data['first_name'],
+                    user_data['last_name'],
+                    user_data['email'],
+                    user_id
+                ))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
     
     @staticmethod
     def verify_password(email, password):
@@ -115,6 +125,9 @@ class User:
             return None
         
         if check_password(password, user['password']):
+            if password_needs_rehash(user['password']):
+                # Saklanan maliyet hedeften farklı; şifreyi hedef maliyetle yeniden hashle
+                User.rehash_password(user['id'], password)
             try:
                 # Başarılı girişte last_login alanını güncelle
                 User.update_last_login(user['id'])
@@ -126,19 +139,33 @@ class User:
         return None
     
     @staticmethod
-    def update_last_login(user_id):
-        """Kullanıcının son giriş zamanını güncelle"""
+    def rehash_password(user_id, password):
+        """Doğrulanmış şifreyi güncel bcrypt maliyetiyle yeniden hashleyip kaydet"""
         try:
+            hashed_password = hash_password(password)
+            
             conn = get_mysql_connection()
             cursor = conn.cursor()
             
-            query = "UPDATE users SET last_login = %s WHERE id = %s"
-            cursor.execute(query, (datetime.now(), user_id))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
+            try:
+                query = "UPDATE users SET password = %s WHERE id = %s"
+                cursor.execute(query, (hashed_password, user_id))
+                
+                conn.commit()
+                
+                return True
+            finally:
+                cursor.close()
+                conn.close()
+        except Exception as e:
+            print(f"Şifre yeniden hashlenemedi: {str(e)}")
+            return False
+    
+    @staticmethod
+    def update_last_login(user_id):
+        """Kullanıcının son giriş zamanını toplu yazım tamponuna ekle"""
+        try:
+            get_last_login_buffer().record(user_id, datetime.now())
             return True
         except Exception as e:
             print(f"Son giriş güncellemesi başarısız: {str(e)}")
@@ -150,18 +177,20 @@ class User:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        token = generate_reset_token()
-        expires = datetime.now() + timedelta(hours=24)
-        
-        query = "UPDATE users SET reset_token = %s, reset_token_expires = %s WHERE email = %s"
-        cursor.execute(query, (token, expires, email))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return token if success else None
+        try:
+            token = generate_reset_token()
+            expires = datetime.now() + timedelta(hours=24)
+            
+            query = "UPDATE users SET reset_token = %s, reset_token_expires = %s WHERE email = %s"
+            cursor.execute(query, (token, expires, email))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            
+            return token if success else None
+        finally:
+            cursor.close()
+            conn.close()
 
     @staticmethod
     def reset_password(token, new_password):
@@ -169,14 +198,16 @@ class User:
         conn = get_mysql_connection()
         cursor = conn.cursor()
         
-        hashed_password = hash_password(new_password)
-        
-        query = "UPDATE users SET password = %s, reset_token = NULL, reset_token_expires = NULL WHERE reset_token = %s"
-        cursor.execute(query, (hashed_password, token))
-        
-        success = cursor.rowcount > 0 
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return success
\ No newline at end of file
+        try:
+            hashed_password = hash_password(new_password)
+            
+            query = "UPDATE users SET password = %s, reset_token = NULL, reset_token_expires = NULL WHERE reset_token = %s"
+            cursor.execute(query, (hashed_password, token))
+            
+            success = cursor.rowcount > 0 
+            conn.commit()
+            
+            return success
+        finally:
+            cursor.close()
+            conn.close()
\ No newline at end of file
@@ -1,8 +1,14 @@
-from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, session
+from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, session, send_file, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.product import Product
 from models.user import User
+from utils.email_outbox import get_outbox_stats, get_dead_letters, retry_dead_letter
+from utils.cache import response_cache, invalidate_product_responses
+from utils.password_hasher import get_password_hasher
+from utils.metrics import metrics_snapshot
+from utils.profiler import get_profile_store, collapsed_stacks, stats_text
 from werkzeug.utils import secure_filename
+from bson import ObjectId
 import os
 from functools import wraps
 import logging
@@ -112,6 +118,7 @@ def admin_add_product():
             )
             
             if product_id:
+                invalidate_product_responses()
                 flash(f'Ürün başarıyla eklendi! ID: {product_id}', 'success')
                 return redirect(url_for('admin.admin_products'))
             else:
@@ -148,6 +155,7 @@ def admin_edit_product(product_id):
             if update_data:
                 success = Product.update(product_id, update_data)
                 if success:
+                    invalidate_product_responses()
                     flash('Ürün başarıyla güncellendi!', 'success')
                     return redirect(url_for('admin.admin_products'))
                 else:
@@ -167,6 +175,7 @@ def admin_delete_product(product_id):
     try:
         success = Product.delete(product_id)
         if success:
+            invalidate_product_responses()
             flash('Ürün başarıyla silindi!', 'success')
         else:
             flash('Ürün silinirken bir hata oluştu.', 'error')
@@ -213,4 +222,113 @@ def admin_api_get_product(product_id):
         return jsonify({
             'status': 'error',
             'message': str(e)
-        }), 500 
\ No newline at end of file
+        }), 500
+
+@admin_bp.route('/admin/api/email-outbox', methods=['GET'])
+@admin_required
+def admin_api_email_outbox():
+    """API: E-posta kuyruğu derinliği ve dead-letter mesajları"""
+    try:
+        stats = get_outbox_stats()
+        if stats is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Veritabanı bağlantı hatası'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'outbox': stats,
+            'dead_letters': get_dead_letters(limit=request.args.get('limit', 20, type=int))
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@admin_bp.route('/admin/api/email-outbox/<message_id>/retry', methods=['POST'])
+@admin_required
+def admin_api_retry_email(message_id):
+    """API: Dead-letter e-postayı yeniden kuyruğa al"""
+    if not ObjectId.is_valid(message_id):
+        return jsonify({
+            'status': 'error',
+            'message': 'Geçersiz e-posta ID'
+        }), 400
+    try:
+        if retry_dead_letter(message_id):
+            return jsonify({
+                'status': 'success',
+                'message': 'E-posta yeniden kuyruğa alındı'
+            })
+        return jsonify({
+            'status': 'error',
+            'message': 'Dead-letter e-posta bulunamadı'
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@admin_bp.route('/admin/api/cache', methods=['GET'])
+@admin_required
+def admin_api_cache():
+    """API: Ürün yanıt önbelleği isabet/ıska sayaçları"""
+    return jsonify({
+        'status': 'success',
+        'cache': response_cache.stats()
+    })
+
+@admin_bp.route('/admin/api/password-pool', methods=['GET'])
+@admin_required
+def admin_api_password_pool():
+    """API: bcrypt parola havuzu doluluk, ret sayısı ve gecikme histogramları"""
+    return jsonify({
+        'status': 'success',
+        'password_pool': get_password_hasher().stats()
+    })
+
+@admin_bp.route('/admin/api/metrics', methods=['GET'])
+@admin_required
+def admin_api_metrics():
+    """API: Uç nokta gecikmeleri, durum kodları ve istek başına veritabanı gidiş-dönüşleri"""
+    return jsonify({
+        'status': 'success',
+        'metrics': metrics_snapshot()
+    })
+
+@admin_bp.route('/admin/api/profiles', methods=['GET'])
+@admin_required
+def admin_api_profiles():
+    """API: Diskteki istek profillerinin listesi"""
+    store = get_profile_store()
+    if store is None:
+        return jsonify({'status': 'error', 'message': 'İstek profilleme etkin değil'}), 404
+    
+    return jsonify({
+        'status': 'success',
+        'profiles': store.list()
+    })
+
+@admin_bp.route('/admin/api/profiles/<profile_id>', methods=['GET'])
+@admin_required
+def admin_api_profile_download(profile_id):
+    """API: Profili indir (format=pstats | collapsed | text)"""
+    store = get_profile_store()
+    path = store.path(profile_id) if store is not None else None
+    if path is None:
+        return jsonify({'status': 'error', 'message': 'Profil bulunamadı'}), 404
+    
+    output_format = request.args.get('format', 'pstats')
+    if output_format == 'pstats':
+        return send_file(path, mimetype='application/octet-stream',
+                         as_attachment=True, download_name=f"{profile_id}.prof")
+    if output_format == 'collapsed':
+        return Response(collapsed_stacks(path), mimetype='text/plain',
+                        headers={'Content-Disposition': f'attachment; filename={profile_id}.folded'})
+    if output_format == 'text':
+        return Response(stats_text(path), mimetype='text/plain')
+    
+    return jsonify({'status': 'error', 'message': 'Geçersiz format: pstats, collapsed veya text olmalı'}), 400
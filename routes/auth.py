@@ -3,7 +3,8 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from config.mongodb_db import get_db
 from config.mysql_db import get_mysql_connection
 from models.user import User
-from utils.helpers import send_email, hash_password, check_password, send_reset_email
+from utils.password_hasher import hash_password, check_password
+from utils.email_outbox import queue_email
 from config.settings import Config
 from datetime import datetime, timedelta, timezone
 import os
@@ -165,8 +166,8 @@ def forgot_password():
             # Sender email parametresini al (varsa)
             sender_email = data.get('sender_email', None)
             
-            # HTML şablonu kullanarak şifre sıfırlama e-postası gönder
-            email_sent = send_email(
+            # HTML şablonu kullanarak şifre sıfırlama e-postasını kuyruğa ekle
+            email_queued = queue_email(
                 "Şifre Sıfırlama İsteği",
                 user['email'],
                 f"Lütfen aşağıdaki linki tıklayarak şifrenizi sıfırlayın: {reset_link}",
@@ -180,8 +181,9 @@ def forgot_password():
                 sender=sender_email
             )
             
-            # send_email şimdi gerçek email gönderildiğinde True, dosyaya kaydedildiğinde False döndürür
-            if email_sent:
+            # queue_email kuyruğa eklendiğinde mesaj ID'si döndürür; kuyruk kullanılamazsa
+            # senkron gönderime düşer ve dosyaya kaydedildiğinde False döndürür
+            if email_queued:
                 return jsonify({'message': 'Şifre sıfırlama bağlantısı e-posta adresinize gönderildi'}), 200
             else:
                 # E-posta gönderilemedi ama dosyaya kaydedildi, yine de token oluşturuldu
@@ -266,16 +268,17 @@ def verify_token():
     conn = get_mysql_connection()
     cursor = conn.cursor(dictionary=True)
     
-    query = """
-    SELECT * FROM users 
-    WHERE reset_token = %s AND reset_token_expires > %s
-    """
-    
-    cursor.execute(query, (token, datetime.now(timezone.utc)))
-    user = cursor.fetchone()
-    
-    cursor.close()
-    conn.close()
+    try:
+        query = """
+        SELECT * FROM users 
+        WHERE reset_token = %s AND reset_token_expires > %s
+        """
+        
+        cursor.execute(query, (token, datetime.now(timezone.utc)))
+        user = cursor.fetchone()
+    finally:
+        cursor.close()
+        conn.close()
     
     return jsonify({'valid': user is not None}), 200
 
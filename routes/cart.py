@@ -1,11 +1,15 @@
 from flask import Blueprint, request, jsonify
 from config.mongodb_db import get_db
 from models.user import User
-from utils.helpers import send_email
+from models.cart import Cart, CART_ITEM_FIELDS, CART_VIEW_FIELDS
+from utils.email_outbox import queue_email
+from utils.helpers import mongo_projection, parse_fields
 from decorators.auth import customer_required
 from datetime import datetime, timezone
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import traceback
 
 
@@ -42,46 +46,47 @@ def add_to_cart():
         quantity = data.get('quantity', 1)
         
         # Ürünü kontrol et
-        product = products_collection.find_one({'_id': ObjectId(product_id)})
+        product = products_collection.find_one(
+            {'_id': ObjectId(product_id)},
+            {'name': 1, 'price': 1, 'image_url': 1}
+        )
         if not product:
             return jsonify({'message': 'Ürün bulunamadı'}), 404
         
-        # Sepette bu ürün zaten var mı kontrol et
-        existing_item = cart_collection.find_one({
+        # Tek işlemde ekle veya miktarı artır: satır yoksa $setOnInsert alanlarıyla oluşturulur.
+        # Açık sepet satırlarındaki tekil indeks eşzamanlı tıklamaların çift satır oluşturmasını engeller.
+        cart_filter = {
             'user_id': current_user['id'],
             'product_id': product_id,
             'is_checked_out': False
-        })
-        
-        if existing_item:
-            # Varolan öğeyi güncelle
+        }
+        try:
             cart_collection.update_one(
-                {'_id': existing_item['_id']},
-                {'$inc': {'quantity': quantity}}
+                cart_filter,
+                {
+                    '$inc': {'quantity': quantity},
+                    '$setOnInsert': {
+                        'product_name': product['name'],
+                        'price': product['price'],
+                        'image_url': product.get('image_url', ''),
+                        'created_at': datetime.now(timezone.utc)
+                    }
+                },
+                upsert=True
             )
-        else:
-            # Yeni bir sepet öğesi ekle
-            cart_item = {
-                'user_id': current_user['id'],
-                'product_id': product_id,
-                'product_name': product['name'],
-                'quantity': quantity,
-                'price': product['price'],
-                'image_url': product.get('image_url', ''),
-                'created_at': datetime.now(timezone.utc),
-                'is_checked_out': False
-            }
-            cart_collection.insert_one(cart_item)
+        except DuplicateKeyError:
+            # Eşzamanlı bir istek satırı az önce oluşturdu; artık mevcut satır güncellenir
+            cart_collection.update_one(cart_filter, {'$inc': {'quantity': quantity}})
         
-        # Ürün bilgilerini al
+        # Ürün bilgilerini tek sorguda al
         products_with_details = []
-        updated_cart = cart_collection.find({
+        updated_cart = list(cart_collection.find({
             'user_id': current_user['id'],
             'is_checked_out': False
-        })
+        }))
         
-        for cart_item in updated_cart:
-            product_info = products_collection.find_one({'_id': ObjectId(cart_item['product_id'])})
+        for cart_item in Cart.hydrate_items(updated_cart, products_collection):
+            product_info = cart_item['product']
             if product_info:
                 item_details = {
                     'product_id': str(product_info['_id']),
@@ -114,30 +119,30 @@ def add_to_cart():
                     'price': item['price'],
                     'subtotal': subtotal
                 })
-                
-                # Kullanıcı adını al
-                user_name = user['first_name']
-                if 'last_name' in user and user['last_name']:
-                    user_name += f" {user['last_name']}"
-                
-                from config.settings import Config
-                
-                # Gönderici email parametresini al (varsa)
-                sender_email = data.get('sender_email', None)
-                
-                # "Sepetiniz Güncellendi" e-postası gönder
-                send_email(
-                    "Sepetiniz Güncellendi",
-                    user['email'],
-                    "Sepetinize yeni bir ürün eklediniz.",
-                    template="emails/cart_updated.html",
-                    template_data={
-                        'user_name': user_name,
-                        'cart_items': formatted_items,
-                        'app_url': Config.APP_URL or "http://localhost:5000"
-                    },
-                    sender=sender_email
-                )
+            
+            # Kullanıcı adını al
+            user_name = user['first_name']
+            if 'last_name' in user and user['last_name']:
+                user_name += f" {user['last_name']}"
+            
+            from config.settings import Config
+            
+            # Gönderici email parametresini al (varsa)
+            sender_email = data.get('sender_email', None)
+            
+            # "Sepetiniz Güncellendi" e-postasını kuyruğa ekle (sepet başına bir kez)
+            queue_email(
+                "Sepetiniz Güncellendi",
+                user['email'],
+                "Sepetinize yeni bir ürün eklediniz.",
+                template="emails/cart_updated.html",
+                template_data={
+                    'user_name': user_name,
+                    'cart_items': formatted_items,
+                    'app_url': Config.APP_URL or "http://localhost:5000"
+                },
+                sender=sender_email
+            )
         except Exception as e:
             # Sadece hata logla, e-posta başarısız olursa istek başarısız olma
             print(f"Sepet güncelleme e-postası gönderimi hatası: {str(e)}")
@@ -194,9 +199,8 @@ def checkout_cart():
             formatted_items = []
             order_total = 0
             
-            for item in cart_items:
-                product_id = item['product_id']
-                product_info = products_collection.find_one({'_id': ObjectId(product_id)})
+            for item in Cart.hydrate_items(cart_items, products_collection):
+                product_info = item['product']
                 if product_info:
                     subtotal = item['quantity'] * item['price']
                     order_total += subtotal
@@ -219,8 +223,8 @@ def checkout_cart():
             # Gönderici email parametresini al (varsa)
             sender_email = data.get('sender_email', None)
             
-            # "Siparişiniz Alındı" e-postası gönder
-            send_email(
+            # "Siparişiniz Alındı" e-postasını kuyruğa ekle
+            queue_email(
                 "Siparişiniz Alındı",
                 user['email'],
                 "Siparişiniz başarıyla alındı.",
@@ -257,23 +261,39 @@ def get_cart():
     if cart_collection is None or products_collection is None:
         return jsonify({'message': 'Veritabanı bağlantı hatası'}), 500
     
+    # fields= yanıttaki sepet alanlarını CART_ITEM_FIELDS içinden seçer
+    try:
+        fields = parse_fields(request.args.get('fields'), CART_ITEM_FIELDS, CART_VIEW_FIELDS)
+    except ValueError as e:
+        return jsonify({'message': f'Bilinmeyen alanlar: {e}'}), 400
+    
+    # product_available hesaplanan bir alandır; ürün kontrolü için product_id gerekir
+    check_products = 'product_available' in fields
+    stored_fields = [field for field in fields if field != 'product_available']
+    hidden_fields = set()
+    if check_products and 'product_id' not in stored_fields:
+        stored_fields.append('product_id')
+        hidden_fields.add('product_id')
+    
     cart_items = list(cart_collection.find({
         'user_id': current_user['id'],
         'is_checked_out': False
-    }))
+    }, mongo_projection(stored_fields)))
     
-    # ObjectId'i JSON serileştirme için dizeye çevir
-    for item in cart_items:
-        item['_id'] = str(item['_id'])
-        # Ürün hala var mı kontrol et
-        product = products_collection.find_one({
-            '_id': ObjectId(item['product_id']),
-            'is_deleted': False
-        })
+    if not check_products:
+        return jsonify({"items": cart_items}), 200
+    
+    # Ürünlerin hala var olup olmadığını tek sorguda kontrol et; yalnızca silinme durumu gerekir
+    items = []
+    for item in Cart.hydrate_items(cart_items, products_collection, {'is_deleted': 1}):
+        product = item.pop('product')
         # Don't overwrite the product_name to avoid duplication
-        item['product_available'] = product is not None
+        item['product_available'] = product is not None and not product.get('is_deleted', False)
+        for field in hidden_fields:
+            item.pop(field, None)
+        items.append(item)
     
-    return jsonify({"items": cart_items}), 200
+    return jsonify({"items": items}), 200
 
 @cart_bp.route('/cart/count', methods=['GET'])
 def get_cart_count():
@@ -331,26 +351,20 @@ def remove_cart_item(cart_id):
         if cart_collection is None:
             return jsonify({'message': 'Veritabanı bağlantı hatası'}), 500
         
-        # Sepet öğesini bul
-        cart_item = cart_collection.find_one({
-            '_id': ObjectId(cart_id),
-            'user_id': current_user['id'],
-            'is_checked_out': False
-        })
+        # Sepet öğesini bul ve tek işlemde sil
+        cart_item = cart_collection.find_one_and_delete(
+            {
+                '_id': ObjectId(cart_id),
+                'user_id': current_user['id'],
+                'is_checked_out': False
+            },
+            projection={'_id': 1}
+        )
         
         if not cart_item:
             return jsonify({'message': 'Sepet öğesi bulunamadı'}), 404
         
-        # Sepet öğesini sil
-        result = cart_collection.delete_one({
-            '_id': ObjectId(cart_id),
-            'user_id': current_user['id']
-        })
-        
-        if result.deleted_count > 0:
-            return jsonify({'message': 'Ürün sepetten kaldırıldı'}), 200
-        else:
-            return jsonify({'message': 'Ürün sepetten kaldırılamadı'}), 500
+        return jsonify({'message': 'Ürün sepetten kaldırıldı'}), 200
     except Exception as e:
         print(f"Sepetten ürün kaldırma hatası: {str(e)}")
         return jsonify({'message': f'Sepetten ürün kaldırma hatası: {str(e)}'}), 500
@@ -374,26 +388,22 @@ def update_cart_item(cart_id):
         if cart_collection is None:
             return jsonify({'message': 'Veritabanı bağlantı hatası'}), 500
         
-        # Sepet öğesini bul
-        cart_item = cart_collection.find_one({
-            '_id': ObjectId(cart_id),
-            'user_id': current_user['id'],
-            'is_checked_out': False
-        })
+        # Sepet öğesini bul ve tek işlemde güncelle
+        cart_item = cart_collection.find_one_and_update(
+            {
+                '_id': ObjectId(cart_id),
+                'user_id': current_user['id'],
+                'is_checked_out': False
+            },
+            {'$set': {'quantity': quantity}},
+            projection={'_id': 1},
+            return_document=ReturnDocument.AFTER
+        )
         
         if not cart_item:
             return jsonify({'message': 'Sepet öğesi bulunamadı'}), 404
         
-        # Sepet öğesini güncelle
-        result = cart_collection.update_one(
-            {'_id': ObjectId(cart_id), 'user_id': current_user['id']},
-            {'$set': {'quantity': quantity}}
-        )
-        
-        if result.modified_count > 0:
-            return jsonify({'message': 'Sepet öğesi güncellendi'}), 200
-        else:
-            return jsonify({'message': 'Sepet öğesi güncellenemedi'}), 500
+        return jsonify({'message': 'Sepet öğesi güncellendi'}), 200
     except Exception as e:
         print(f"Sepet öğesi güncelleme hatası: {str(e)}")
         return jsonify({'message': f'Sepet öğesi güncelleme hatası: {str(e)}'}), 500 
\ No newline at end of file
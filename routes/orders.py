@@ -1,40 +1,77 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models.order import Order, OrderItem
+from models.order import Order, ORDER_FIELDS, ORDER_SUMMARY_FIELDS
+from utils.helpers import encode_cursor, decode_cursor
 from models.product import Product
 from models.cart import Cart
 
 orders_bp = Blueprint('orders', __name__)
 
+DEFAULT_ORDER_PAGE_SIZE = 20
+MAX_ORDER_PAGE_SIZE = 100
+
 @orders_bp.route('/orders', methods=['GET'])
 @jwt_required()
 def get_user_orders():
-    """Get all orders for the current user"""
+    """Get a page of orders for the current user, newest first
+    
+    Query parameters:
+        limit: page size (default 20, max 100)
+        cursor: next_cursor from the previous page
+        fields: comma separated columns; defaults to a compact summary
+    """
     current_user = get_jwt_identity()
     user_id = current_user['id']
     
-    # Get all orders for the user
-    orders = Order.get_by_user(user_id)
-    
-    # Process orders for JSON serialization
-    processed_orders = []
-    for order in orders:
-        # Convert datetime objects to ISO format strings
-        processed_order = {
-            'id': order['id'],
-            'user_id': order['user_id'],
-            'total_amount': float(order['total_amount']),
-            'shipping_address': order['shipping_address'],
-            'status': order['status'],
-            'created_at': order['created_at'].isoformat() if order['created_at'] else None,
-            'updated_at': order['updated_at'].isoformat() if order['updated_at'] else None
-        }
-        processed_orders.append(processed_order)
+    try:
+        limit = int(request.args.get('limit', DEFAULT_ORDER_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if limit < 1 or limit > MAX_ORDER_PAGE_SIZE:
+        return jsonify({
+            'success': False,
+            'message': f'limit must be between 1 and {MAX_ORDER_PAGE_SIZE}'
+        }), 400
+    
+    fields = ORDER_SUMMARY_FIELDS
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in ORDER_FIELDS]
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Unknown fields: {', '.join(unknown)}"
+            }), 400
+    
+    after = None
+    if request.args.get('cursor'):
+        try:
+            after = decode_cursor(request.args['cursor'])
+        except ValueError:
+            after = None
+        if after is None or after[0] is None or not isinstance(after[1], int):
+            return jsonify({
+                'success': False,
+                'message': 'Invalid cursor'
+            }), 400
+    
+    # One extra row tells whether there is a next page
+    orders = Order.get_by_user(user_id, limit=limit + 1, after=after, fields=fields)
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+    
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(orders[-1]['created_at'], orders[-1]['id'])
+    
+    # Keep only the requested fields; Decimal and datetime values are encoded by the JSON provider
+    processed_orders = [{field: order.get(field) for field in fields} for order in orders]
     
     # Return the orders
     return jsonify({
         'success': True,
-        'orders': processed_orders
+        'orders': processed_orders,
+        'next_cursor': next_cursor
     })
 
 @orders_bp.route('/orders/<int:order_id>', methods=['GET'])
@@ -44,38 +81,35 @@ def get_order_details(order_id):
     current_user = get_jwt_identity()
     user_id = current_user['id']
     
-    # Get the order
-    order = Order.get_by_id(order_id)
+    # Get the order and its items over one connection (only if it belongs to the current user)
+    order, items = Order.get_with_items(order_id, user_id)
     
-    # Check if order exists and belongs to the current user
-    if not order or order['user_id'] != user_id:
+    if not order:
         return jsonify({
             'success': False,
             'message': 'Order not found'
         }), 404
     
-    # Get order items
-    items = OrderItem.get_by_order(order_id)
-    
-    # Get product details for each item
+    # Resolve all referenced products with a single query; deleted products fall back to a placeholder
+    products = Product.get_summaries([item['product_id'] for item in items])
     for item in items:
-        product = Product.get_by_id(item['product_id'])
+        product = products.get(str(item['product_id']))
         if product:
             item['product_name'] = product['name']
-            item['product_image'] = product['image']
+            item['product_image'] = product.get('image')
         else:
             item['product_name'] = 'Product not found'
             item['product_image'] = None
     
-    # Process order for JSON serialization
+    # Decimal and datetime values are encoded by the JSON provider
     processed_order = {
         'id': order['id'],
         'user_id': order['user_id'],
-        'total_amount': float(order['total_amount']),
+        'total_amount': order['total_amount'],
         'shipping_address': order['shipping_address'],
         'status': order['status'],
-        'created_at': order['created_at'].isoformat() if order['created_at'] else None,
-        'updated_at': order['updated_at'].isoformat() if order['updated_at'] else None,
+        'created_at': order['created_at'],
+        'updated_at': order.get('updated_at'),
         'items': items
     }
     
@@ -115,24 +149,23 @@ def create_order():
     for item in cart_items:
         total_amount += item['price'] * item['quantity']
     
-    # Create the order
-    order_id = Order.create(
-        user_id=user_id,
-        total_amount=total_amount,
-        shipping_address=data['shipping_address']
-    )
-    
-    # Create order items
-    for item in cart_items:
-        OrderItem.create(
-            order_id=order_id,
-            product_id=item['product_id'],
-            quantity=item['quantity'],
-            price=item['price']
+    # Create the order and all of its items in a single transaction
+    try:
+        order_id = Order.create_with_items(
+            user_id=user_id,
+            total_amount=total_amount,
+            shipping_address=data['shipping_address'],
+            items=cart_items
         )
+    except Exception as e:
+        print(f"Sipariş oluşturma hatası: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Order could not be created'
+        }), 500
     
-    # Clear the user's cart
-    Cart.clear(user_id)
+    # Clear only the ordered cart lines, after the order has been committed
+    Cart.clear(user_id, cart_ids=[item['id'] for item in cart_items])
     
     # Return the new order ID
     return jsonify({
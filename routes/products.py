@@ -2,12 +2,15 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import get_jwt_identity
 from config.mongodb_db import get_db
 from models.user import User
-from models.product import Product
-from utils.helpers import send_email
+from models.product import Product, PRODUCT_FIELDS, PRODUCT_LIST_FIELDS
+from utils.email_outbox import queue_email
+from utils.helpers import encode_cursor, decode_cursor, normalize_search_text, parse_fields, mongo_projection
+from utils.cache import cached_response, invalidate_product_responses
 from decorators.auth import supplier_required
 from datetime import datetime, timezone
 from bson import ObjectId
 import traceback
+import re
 
 products_bp = Blueprint('products', __name__)
 
@@ -82,12 +85,14 @@ def add_product():
             'created_at': datetime.now(timezone.utc),
             'is_deleted': False
         }
+        product.update(Product.search_fields(data['name'], data['description']))
         
         # Add image if provided
         if 'image' in data:
             product['image'] = data['image']
         
         result = products_collection.insert_one(product)
+        invalidate_product_responses()
         return jsonify({'message': 'Ürün başarıyla eklendi', 'product_id': str(result.inserted_id)}), 201
     except Exception as e:
         traceback.print_exc()
@@ -144,13 +149,17 @@ def update_product(product_id):
             update_data['stock'] = int(data['stock'])
         if 'image' in data:
             update_data['image'] = data['image']
+        update_data.update(Product.search_fields(data.get('name'), data.get('description')))
         
         result = products_collection.update_one(
             {'_id': product['_id']},
             {'$set': update_data}
         )
         
+        Product.evict_cache(product['_id'])
+        
         if result.modified_count > 0:
+            invalidate_product_responses()
             return jsonify({'message': 'Ürün başarıyla güncellendi'}), 200
         else:
             return jsonify({'message': 'Ürün güncellendi ancak değişiklik yapılmadı'}), 200
@@ -197,6 +206,8 @@ def delete_product(product_id):
         # In test mode, skip cart check
         if product_id.startswith('product'):
             products_collection.delete_one({'_id': product_id})
+            Product.evict_cache(product_id)
+            invalidate_product_responses()
             return jsonify({'message': 'Ürün başarıyla silindi'}), 200
             
         # Ürünün herhangi bir sepette olup olmadığını kontrol et
@@ -211,12 +222,14 @@ def delete_product(product_id):
                 {'_id': product['_id']},
                 {'$set': {'is_deleted': True}}
             )
+            Product.evict_cache(product['_id'])
+            invalidate_product_responses()
             
             # Sepetinde bu ürünü olan kullanıcılara bildirim gönder
             for cart in carts_with_product:
                 user = User.query.get(cart['user_id'])
                 if user:
-                    send_email(
+                    queue_email(
                         "Product Unavailable",
                         user.email,
                         f"Sepetinizdeki '{product['name']}' ürünü artık mevcut değil."
@@ -228,12 +241,15 @@ def delete_product(product_id):
         
         # Ürünün herhangi bir sepette olmadığını kontrol et
         products_collection.delete_one({'_id': product['_id']})
+        Product.evict_cache(product['_id'])
+        invalidate_product_responses()
         return jsonify({'message': 'Ürün başarıyla silindi'}), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({'message': 'Ürün silinirken bir hata oluştu', 'error': str(e)}), 500
 
 @products_bp.route('/products', methods=['GET'])
+@cached_response('products:list')
 def get_products():
     products_collection = get_products_collection()
     if products_collection is None:
@@ -242,16 +258,50 @@ def get_products():
     # Sorgu parametrelerini al
     page = int(request.args.get('page', 1))
     per_page = 12  # Ürünlerin sayfa başına düşeceği sayı
-    search = request.args.get('search', '')
+    search = request.args.get('search', '').strip()
+    # substring: ürün adının herhangi bir yerinde eşleşme (varsayılan, eski istemcilerin davranışı),
+    # prefix: ürün adının başından eşleşme, text: ilgiye göre sıralanan tam metin (tam kelime) araması
+    search_mode = request.args.get('search_mode', 'substring')
     min_price = request.args.get('min_price', '')
     max_price = request.args.get('max_price', '')
+    # cursor verilirse page yerine (created_at, _id) üzerinden keyset sayfalama yapılır
+    cursor = request.args.get('cursor', '')
+    # include_total=false toplam sayım sorgusunu atlar
+    include_total = request.args.get('include_total', 'true').lower() != 'false'
+    # fields= yanıttaki ürün alanlarını PRODUCT_FIELDS içinden seçer
+    try:
+        fields = parse_fields(request.args.get('fields'), PRODUCT_FIELDS, PRODUCT_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({'message': f'Bilinmeyen alanlar: {e}'}), 400
+    
+    # Cursor üretimi için _id ve created_at her zaman getirilir, istenmediyse yanıttan çıkarılır
+    hidden_fields = {field for field in ('_id', 'created_at') if field not in fields}
+    projection = mongo_projection(fields + sorted(hidden_fields))
     
     # Sorgu oluştur
     query = {'is_deleted': False}
     
+    if search_mode not in ('substring', 'prefix', 'text'):
+        return jsonify({'message': 'Geçersiz search_mode'}), 400
+    
+    # Metin aramasında sıralama ilgiye göredir, keyset cursor uygulanamaz
+    text_search = bool(search) and search_mode == 'text'
+    if text_search and cursor:
+        return jsonify({'message': 'cursor metin aramasıyla birlikte kullanılamaz'}), 400
+    
     # Arama kriteri eğer sağlanmışsa ekle
     if search:
-        query['name'] = {'$regex': search, '$options': 'i'}
+        normalized_search = normalize_search_text(search)
+        if text_search:
+            # Türkçe metin indeksi (name_search, description_search) üzerinden arama
+            query['$text'] = {'$search': normalized_search}
+        elif search_mode == 'prefix':
+            # Sabitlenmiş önek regex'i name_search indeksini kullanabilir
+            query['name_search'] = {'$regex': '^' + re.escape(normalized_search)}
+        else:
+            # Kelime parçaları da eşleşir ("tel" -> "telefon"); normalize alan sayesinde
+            # büyük/küçük harf ve Türkçe karakter farkı gözetilmez
+            query['name_search'] = {'$regex': re.escape(normalized_search)}
     
     # Fiyat aralığı eğer sağlanmışsa ekle
     if min_price or max_price:
@@ -263,21 +313,67 @@ def get_products():
         if price_filter:
             query['price'] = price_filter
     
-    # Toplam ürün sayısını al
-    total_products = products_collection.count_documents(query)
+    # Toplam ürün sayısını al (istenmediyse atla)
+    total_products = None
+    total_pages = None
+    if include_total:
+        total_products = products_collection.count_documents(query)
+        # Toplam sayfa sayısını hesapla
+        total_pages = (total_products + per_page - 1) // per_page
     
-    # Toplam sayfa sayısını hesapla
-    total_pages = (total_products + per_page - 1) // per_page
+    # _id eşitlik bozucu olarak kullanılır, böylece sıralama kararlıdır
+    sort_order = [('created_at', -1), ('_id', -1)]
     
-    # Şu anki sayfadaki ürünleri al
-    products = list(products_collection.find(query)
-                   .sort('created_at', -1)
-                   .skip((page - 1) * per_page)
-                   .limit(per_page))
+    if cursor:
+        try:
+            last_created_at, last_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'message': 'Geçersiz cursor'}), 400
+        # Ürün cursor'ı her zaman (tarih, ObjectId) taşır; None tarih seek sorgusunu boş döndürür
+        if not isinstance(last_created_at, datetime) or not isinstance(last_id, ObjectId):
+            return jsonify({'message': 'Geçersiz cursor'}), 400
+        
+        # Son görülen üründen sonrasına doğrudan indeks aralığıyla atla
+        seek_query = {'$and': [query, {'$or': [
+            {'created_at': {'$lt': last_created_at}},
+            {'created_at': last_created_at, '_id': {'$lt': last_id}}
+        ]}]}
+        products = list(products_collection.find(seek_query, projection)
+                       .sort(sort_order)
+                       .limit(per_page + 1))
+    elif text_search:
+        # En ilgili ürünler önce, eşitlikte en yeni ürün önce
+        products = list(products_collection.find(query, {**projection, 'score': {'$meta': 'textScore'}})
+                       .sort([('score', {'$meta': 'textScore'})] + sort_order)
+                       .skip((page - 1) * per_page)
+                       .limit(per_page + 1))
+    else:
+        # Eski istemciler için sayfa numarasıyla sayfalama
+        products = list(products_collection.find(query, projection)
+                       .sort(sort_order)
+                       .skip((page - 1) * per_page)
+                       .limit(per_page + 1))
+    
+    # Fazladan alınan bir ürün sonraki sayfanın varlığını gösterir
+    has_more = len(products) > per_page
+    products = products[:per_page]
+    
+    next_cursor = None
+    if has_more and not text_search:
+        last_product = products[-1]
+        # created_at backfill_product_created_at migration'ı ile her üründe bulunur; yoksa
+        # migration'ın yazacağı değer (ObjectId zamanı) kullanılır ve sayfalama kesilmez
+        last_created_at = last_product.get('created_at') or last_product['_id'].generation_time
+        next_cursor = encode_cursor(last_created_at, last_product['_id'])
     
-    # Her ürünün ObjectId'ini string'e çevir
-    for product in products:
-        product['_id'] = str(product['_id'])
+    # Metin skorunu ve yalnızca sayfalama için getirilen alanları çıkar; ObjectId ve
+    # tarihler JSON sağlayıcısında serileştirilir
+    if text_search:
+        hidden_fields.add('score')
+    if hidden_fields:
+        for product in products:
+            for field in hidden_fields:
+                product.pop(field, None)
     
     # Sayfalanmış yanıt döndür
     return jsonify({
@@ -285,18 +381,25 @@ def get_products():
         'total': total_products,
         'total_pages': total_pages,
         'page': page,
-        'per_page': per_page
+        'per_page': per_page,
+        'next_cursor': next_cursor
     }), 200
 
 @products_bp.route('/products/featured', methods=['GET'])
+@cached_response('products:featured')
 def get_featured_products():
     products_collection = get_products_collection()
     if products_collection is None:
         return jsonify({'message': 'Database connection error'}), 500
+    
+    try:
+        fields = parse_fields(request.args.get('fields'), PRODUCT_FIELDS, PRODUCT_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({'message': f'Bilinmeyen alanlar: {e}'}), 400
         
     # En son 6 ürünü öne çıkaran
     featured_products = list(products_collection.find(
-        {'is_deleted': False}
+        {'is_deleted': False}, mongo_projection(fields)
     ).sort('created_at', -1).limit(6))
     
     # Eğer hiç ürün yoksa, bir örnek ürün oluştur
@@ -309,12 +412,9 @@ def get_featured_products():
             'created_at': datetime.now(timezone.utc),
             'is_deleted': False
         }
-        product_id = products_collection.insert_one(sample_product).inserted_id
-        sample_product['_id'] = str(product_id)
-        featured_products = [sample_product]
-    else:
-        # Her ürünün ObjectId'ini string'e çevir
-        for product in featured_products:
-            product['_id'] = str(product['_id'])
+        sample_product.update(Product.search_fields(sample_product['name'], sample_product['description']))
+        # insert_one oluşturulan _id'yi belgeye ekler
+        products_collection.insert_one(sample_product)
+        featured_products = [{field: sample_product[field] for field in fields if field in sample_product}]
     
     return jsonify(featured_products), 200 
\ No newline at end of file
@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.user import User
-from utils.helpers import hash_password
+from utils.password_hasher import hash_password
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -10,6 +10,11 @@ import sys
 import subprocess
 import argparse
 import time
+import csv
+import json
+import shutil
+import urllib.request
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Proje kök dizinini tanımla
@@ -166,10 +171,202 @@ def run_performance_tests():
     print("Locust ile DoS testlerini çalıştırmak için:")
     print("locust -f tests/performance/test_dos.py --host=http://localhost:5000")
     print("ve tarayıcıda http://localhost:8089 adresini açın.")
+    print("Headless, karşılaştırılabilir ölçüm için: python run_tests.py --benchmark")
     
     # Burada locust'u otomatik başlatmak yerine kullanıcıya nasıl çalıştıracağını gösteriyoruz
     return True
 
+# Headless benchmark senaryoları: ad -> tests/performance/scenarios.py içindeki kullanıcı sınıfı
+BENCHMARK_SCENARIOS = {
+    'browse': 'BrowseUser',
+    'search': 'SearchUser',
+    'cart_churn': 'CartChurnUser',
+    'checkout': 'CheckoutUser',
+    'login_storm': 'LoginStormUser'
+}
+BENCHMARK_PERCENTILES = (('p50', '50%'), ('p95', '95%'), ('p99', '99%'))
+# Gecikme artışı bu kadar ms'nin altındaysa ölçüm gürültüsü sayılır
+BENCHMARK_MIN_DELTA_MS = 5.0
+# Hata oranındaki izin verilen mutlak artış
+BENCHMARK_MAX_ERROR_RATE_INCREASE = 0.01
+# Bundan az istek alan uç noktaların yüzdelikleri karşılaştırılmaz
+BENCHMARK_MIN_REQUESTS = 20
+
+def _stat_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_locust_stats(csv_path):
+    """locust --csv çıktısındaki *_stats.csv dosyasını uç nokta başına özete çevir"""
+    endpoints = {}
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            name = 'aggregate' if row['Name'] == 'Aggregated' else f"{row['Type']} {row['Name']}"
+            endpoints[name] = {
+                'requests': int(row['Request Count']),
+                'failures': int(row['Failure Count']),
+                'rps': _stat_number(row['Requests/s']) or 0.0
+            }
+            for key, column in BENCHMARK_PERCENTILES:
+                endpoints[name][key] = _stat_number(row.get(column))
+    return endpoints
+
+def compare_benchmark(results, baseline, tolerance):
+    """Sonuçları taban çizgisiyle karşılaştır ve gerileme açıklamalarını döndür
+
+    Yüzdelik gecikmeler uç nokta başına, throughput senaryo toplamı üzerinden
+    karşılaştırılır; yalnızca her iki tarafta da bulunan ve yeterince istek alan uç
+    noktalar değerlendirilir.
+    """
+    regressions = []
+    for scenario, current in results.get('scenarios', {}).items():
+        reference = baseline.get('scenarios', {}).get(scenario)
+        if not reference:
+            continue
+        for endpoint, stats in current['endpoints'].items():
+            old = reference['endpoints'].get(endpoint)
+            if not old or min(old['requests'], stats['requests']) < BENCHMARK_MIN_REQUESTS:
+                continue
+            for key, _ in BENCHMARK_PERCENTILES:
+                before, after = old.get(key), stats.get(key)
+                if before is None or after is None:
+                    continue
+                if after > before * (1 + tolerance) and after - before >= BENCHMARK_MIN_DELTA_MS:
+                    regressions.append(f"{scenario} {endpoint} {key}: {before:.0f} ms -> {after:.0f} ms")
+
+            old_rate = old['failures'] / old['requests'] if old['requests'] else 0.0
+            new_rate = stats['failures'] / stats['requests'] if stats['requests'] else 0.0
+            if new_rate - old_rate > BENCHMARK_MAX_ERROR_RATE_INCREASE:
+                regressions.append(f"{scenario} {endpoint} hata oranı: {old_rate:.1%} -> {new_rate:.1%}")
+
+        old_total = reference['endpoints'].get('aggregate', {}).get('rps')
+        new_total = current['endpoints'].get('aggregate', {}).get('rps')
+        if old_total and new_total is not None and new_total < old_total * (1 - tolerance):
+            regressions.append(f"{scenario} throughput: {old_total:.1f} -> {new_total:.1f} istek/sn")
+    return regressions
+
+def start_benchmark_app(port, log_path, in_memory=False, products=0):
+    """Uygulamayı benchmark için arka planda başlat ve hazır olmasını bekle
+
+    Uygulama çıktısı (istek logları dahil) log_path dosyasına yazılır.
+    """
+    env = dict(os.environ, TESTING='True')
+    if in_memory:
+        env.update(MONGO_IN_MEMORY='True', MONGO_IN_MEMORY_PRODUCTS=str(products))
+    with open(log_path, 'w') as log_file:
+        proc = subprocess.Popen([sys.executable, "-m", "flask", "run", "--port", str(port)],
+                                env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            break
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/products/featured", timeout=2)
+            return proc
+        except Exception:
+            time.sleep(0.5)
+    proc.terminate()
+    return None
+
+def run_benchmark_scenario(name, host, users, spawn_rate, duration, output_dir):
+    """Bir senaryoyu headless locust ile çalıştır ve uç nokta özetini döndür"""
+    prefix = os.path.join(output_dir, name)
+    result = subprocess.run([
+        sys.executable, '-m', 'locust', '-f', 'tests/performance/scenarios.py', BENCHMARK_SCENARIOS[name],
+        '--headless', '-u', str(users), '-r', str(spawn_rate), '-t', f"{duration}s",
+        '--host', host, '--csv', prefix, '--only-summary', '--exit-code-on-error', '0'
+    ], capture_output=True, text=True)
+
+    stats_path = f"{prefix}_stats.csv"
+    if result.returncode != 0 or not os.path.exists(stats_path):
+        print(f"Senaryo çalıştırılamadı: {name}")
+        print("STDERR:", result.stderr[-2000:])
+        return None
+    return parse_locust_stats(stats_path)
+
+def print_benchmark_summary(name, endpoints):
+    print(f"\n--- {name} ---")
+    print(f"{'Uç nokta':<45} {'istek':>7} {'hata':>6} {'istek/sn':>9} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for endpoint, stats in endpoints.items():
+        latencies = ['-' if stats[key] is None else f"{stats[key]:.0f}" for key, _ in BENCHMARK_PERCENTILES]
+        print(f"{endpoint:<45} {stats['requests']:>7} {stats['failures']:>6} {stats['rps']:>9.1f} "
+              f"{latencies[0]:>7} {latencies[1]:>7} {latencies[2]:>7}")
+
+def run_benchmark(args):
+    """Seçilen senaryoları sabit süre ve kullanıcı sayısıyla çalıştır, sonuçları taban çizgisiyle karşılaştır"""
+    print("\n=== Benchmark Çalıştırılıyor ===")
+    os.chdir(project_root)
+    output_dir = os.path.dirname(os.path.abspath(args.results))
+    os.makedirs(output_dir, exist_ok=True)
+
+    host = args.host
+    app_proc = None
+    original_manifest = os.environ.get('SEED_MANIFEST')
+    if not host:
+        if args.in_memory:
+            # Uygulama ürün ID'lerini bu kopyaya yazar; locust aynı dosyayı okur
+            manifest_path = os.path.join(output_dir, 'seed_manifest.json')
+            source = original_manifest or os.path.join(project_root, 'seed_manifest.json')
+            if os.path.exists(source) and os.path.abspath(source) != manifest_path:
+                shutil.copyfile(source, manifest_path)
+            os.environ['SEED_MANIFEST'] = manifest_path
+        log_path = os.path.join(output_dir, 'app.log')
+        app_proc = start_benchmark_app(args.port, log_path, args.in_memory, args.in_memory_products)
+        if app_proc is None:
+            print(f"Uygulama başlatılamadı, benchmark iptal edildi (log: {log_path}).")
+            return False
+        host = f"http://127.0.0.1:{args.port}"
+
+    scenarios = args.scenario or list(BENCHMARK_SCENARIOS)
+    results = {
+        'generated_at': datetime.now().isoformat(),
+        'config': {
+            'host': host, 'users': args.users, 'spawn_rate': args.spawn_rate,
+            'duration': args.duration, 'in_memory': args.in_memory
+        },
+        'scenarios': {}
+    }
+    success = True
+    try:
+        for name in scenarios:
+            endpoints = run_benchmark_scenario(name, host, args.users, args.spawn_rate, args.duration, output_dir)
+            if endpoints is None:
+                success = False
+                continue
+            results['scenarios'][name] = {'endpoints': endpoints}
+            print_benchmark_summary(name, endpoints)
+    finally:
+        if app_proc is not None:
+            app_proc.terminate()
+            app_proc.wait(timeout=10)
+        if original_manifest is None:
+            os.environ.pop('SEED_MANIFEST', None)
+        else:
+            os.environ['SEED_MANIFEST'] = original_manifest
+
+    with open(args.results, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSonuçlar kaydedildi: {args.results}")
+
+    if args.save_baseline:
+        shutil.copyfile(args.results, args.baseline)
+        print(f"Taban çizgisi güncellendi: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_benchmark(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ Gerileme: {regression}")
+        if regressions:
+            success = False
+        else:
+            print(f"✅ Taban çizgisine göre gerileme yok (tolerans: %{args.tolerance * 100:.0f})")
+    else:
+        print(f"Taban çizgisi bulunamadı ({args.baseline}); --save-baseline ile oluşturabilirsiniz.")
+    return success
+
 def run_tests():
     """Tüm test türlerini çalıştırır"""
     os.chdir(project_root)
@@ -208,8 +405,29 @@ def main():
     parser.add_argument("--firefox", action="store_true", help="Firefox kullanarak testleri çalıştır")
     parser.add_argument("--chromium", action="store_true", help="Chromium kullanarak testleri çalıştır")
     
+    benchmark = parser.add_argument_group("benchmark")
+    benchmark.add_argument("--benchmark", action="store_true", help="Headless yük testi senaryolarını çalıştır")
+    benchmark.add_argument("--scenario", action="append", choices=sorted(BENCHMARK_SCENARIOS),
+                           help="Çalıştırılacak senaryo (tekrarlanabilir; varsayılan: tümü)")
+    benchmark.add_argument("--users", type=int, default=20, help="Eşzamanlı sanal kullanıcı sayısı")
+    benchmark.add_argument("--spawn-rate", type=float, default=10, help="Saniyede başlatılacak kullanıcı")
+    benchmark.add_argument("--duration", type=int, default=60, help="Senaryo başına süre (sn)")
+    benchmark.add_argument("--host", help="Çalışan uygulamanın adresi; verilmezse uygulama yerelde başlatılır")
+    benchmark.add_argument("--port", type=int, default=5055, help="Yerelde başlatılan uygulamanın portu")
+    benchmark.add_argument("--in-memory", action="store_true", help="MongoDB yerine bellek içi depoyu kullan")
+    benchmark.add_argument("--in-memory-products", type=int, default=10000,
+                           help="Bellek içi depoya yüklenecek ürün sayısı")
+    benchmark.add_argument("--results", default="benchmark_results/latest.json", help="Sonuç JSON dosyası")
+    benchmark.add_argument("--baseline", default="tests/performance/baseline.json", help="Taban çizgisi JSON dosyası")
+    benchmark.add_argument("--save-baseline", action="store_true", help="Sonuçları yeni taban çizgisi olarak kaydet")
+    benchmark.add_argument("--tolerance", type=float, default=0.15,
+                           help="İzin verilen göreli gerileme (0.15 = %%15)")
+    
     args = parser.parse_args()
     
+    if args.benchmark:
+        return 0 if run_benchmark(args) else 1
+    
     # Hiçbir argüman verilmezse --all kullan
     if not any([args.unit, args.integration, args.selenium, args.performance, args.all]):
         args.all = True
@@ -31,8 +31,15 @@ document.addEventListener('DOMContentLoaded', function() {
     document.getElementById('save-profile-btn').addEventListener('click', function() {
         updateProfile();
     });
+    
+    document.getElementById('orders-load-more').addEventListener('click', function() {
+        loadOrders(ordersNextCursor);
+    });
 });
 
+// Cursor for the next page of orders (null when there are no more)
+let ordersNextCursor = null;
+
 // Function to format price
 function formatPrice(price) {
     return '$' + parseFloat(price).toFixed(2);
@@ -330,14 +337,17 @@ function updateProfile() {
     });
 }
 
-// Function to load orders
-function loadOrders() {
+// Function to load orders; with a cursor the next page is appended to the table
+function loadOrders(cursor) {
     const token = localStorage.getItem('token');
+    const loadMoreButton = document.getElementById('orders-load-more');
+    loadMoreButton.disabled = true;
     
     axios.get('/api/orders', {
         headers: {
             'Authorization': 'Bearer ' + token
-        }
+        },
+        params: cursor ? { cursor: cursor } : {}
     })
     .then(function(response) {
         // Hide loading spinner
@@ -345,7 +355,7 @@ function loadOrders() {
         
         const orders = response.data.orders;
         
-        if (!orders || orders.length === 0) {
+        if (!cursor && (!orders || orders.length === 0)) {
             // Show empty orders message
             document.getElementById('orders-empty').classList.remove('d-none');
             return;
@@ -355,10 +365,16 @@ function loadOrders() {
         document.getElementById('orders-content').classList.remove('d-none');
         
         // Display orders
-        displayOrders(orders);
+        displayOrders(orders || [], Boolean(cursor));
+        
+        // Show the load more button while the API reports older orders
+        ordersNextCursor = response.data.next_cursor || null;
+        loadMoreButton.classList.toggle('d-none', !ordersNextCursor);
+        loadMoreButton.disabled = false;
     })
     .catch(function(error) {
         console.error('Error loading orders:', error);
+        loadMoreButton.disabled = false;
         
         // Hide loading spinner
         document.getElementById('orders-loading').classList.add('d-none');
@@ -373,9 +389,11 @@ function loadOrders() {
 }
 
 // Function to display orders
-function displayOrders(orders) {
+function displayOrders(orders, append) {
     const ordersTableBody = document.getElementById('orders-table-body');
-    ordersTableBody.innerHTML = '';
+    if (!append) {
+        ordersTableBody.innerHTML = '';
+    }
     
     orders.forEach(function(order) {
         const row = document.createElement('tr');
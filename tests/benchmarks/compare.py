@@ -0,0 +1,87 @@
+"""İki mikro-benchmark sonuç dosyasını karşılaştırır
+
+Kullanım:
+    python tests/benchmarks/compare.py eski.json yeni.json [--threshold 0.1] [--fail-on-regression]
+
+Medyan süreler karşılaştırılır; değişim eşiği aşan ölçümler YAVAŞ/HIZLI olarak
+işaretlenir. Yalnızca bir dosyada bulunan ölçümler ayrıca listelenir.
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    """Sonuç dosyasındaki benchmark özetlerini yükle"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get('benchmarks', {})
+
+
+def compare_results(old, new, threshold=0.1):
+    """Ortak ölçümlerin medyanlarını karşılaştır
+
+    Dönen her satır: (ad, eski medyan, yeni medyan, oransal değişim, durum).
+    Durum 'slower', 'faster' ya da 'same' olur.
+    """
+    rows = []
+    for name in sorted(set(old) & set(new)):
+        old_median, new_median = old[name]['median'], new[name]['median']
+        change = (new_median - old_median) / old_median if old_median else 0.0
+        if change > threshold:
+            status = 'slower'
+        elif change < -threshold:
+            status = 'faster'
+        else:
+            status = 'same'
+        rows.append((name, old_median, new_median, change, status))
+    return rows
+
+
+def _format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def print_report(rows, old, new):
+    """Karşılaştırma tablosunu yazdır"""
+    labels = {'slower': 'YAVAŞ', 'faster': 'HIZLI', 'same': ''}
+    width = max([len(row[0]) for row in rows] + [10])
+    print(f"{'Benchmark':<{width}}  {'Eski':>12}  {'Yeni':>12}  {'Değişim':>9}")
+    print('-' * (width + 41))
+    for name, old_median, new_median, change, status in rows:
+        print(f"{name:<{width}}  {_format_time(old_median):>12}  {_format_time(new_median):>12}  "
+              f"{change:>+9.1%}  {labels[status]}")
+
+    for name in sorted(set(old) - set(new)):
+        print(f"Yalnızca eski dosyada: {name}")
+    for name in sorted(set(new) - set(old)):
+        print(f"Yalnızca yeni dosyada: {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mikro-benchmark sonuçlarını karşılaştır')
+    parser.add_argument('old', help='Referans sonuç dosyası')
+    parser.add_argument('new', help='Yeni sonuç dosyası')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Anlamlı kabul edilen oransal değişim (varsayılan: 0.1)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Yavaşlayan ölçüm varsa 1 çıkış koduyla bitir')
+    args = parser.parse_args(argv)
+
+    old, new = load_results(args.old), load_results(args.new)
+    rows = compare_results(old, new, args.threshold)
+    print_report(rows, old, new)
+
+    slower = [row for row in rows if row[4] == 'slower']
+    if slower:
+        print(f"\n{len(slower)} ölçüm %{args.threshold * 100:.0f} eşiğinden fazla yavaşladı")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import platform
+from datetime import datetime, timezone
+
+import pytest
+
+# harness modülü için bu dizini ekle
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import Benchmark
+
+from config import mongodb_db
+from config.mock_mongo import MockDatabase
+from utils.db_migrations import apply_mongo_indexes
+from utils.seed_data import generate_cart_lines, generate_products
+
+# Mikro-benchmark'lar normal test çalıştırmasında atlanır:
+#   RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -q
+BENCHMARKS_ENABLED = os.environ.get('RUN_BENCHMARKS', 'False').lower() in ('1', 'true')
+RESULTS_PATH = os.environ.get('BENCHMARK_JSON', os.path.join('benchmark_results', 'micro.json'))
+
+BENCH_SEED = 2024
+BENCH_AS_OF = datetime(2025, 1, 1, tzinfo=timezone.utc)
+BENCH_PRODUCTS = 5000
+BENCH_USERS = list(range(1, 201))
+BENCH_CART_LINES = 2000
+
+_benchmark = Benchmark()
+
+@pytest.fixture
+def bench():
+    """Ölçümü kaydeden Benchmark nesnesi; RUN_BENCHMARKS ayarlı değilse test atlanır"""
+    if not BENCHMARKS_ENABLED:
+        pytest.skip("Mikro-benchmark'lar için RUN_BENCHMARKS=1 ayarlayın")
+    return _benchmark
+
+@pytest.fixture(scope='session')
+def bench_db():
+    """Sabit seed'le doldurulmuş, üretim indeksleri uygulanmış bellek içi MongoDB"""
+    if not BENCHMARKS_ENABLED:
+        pytest.skip("Mikro-benchmark'lar için RUN_BENCHMARKS=1 ayarlayın")
+
+    db = MockDatabase()
+    apply_mongo_indexes(db)
+    products = list(generate_products(BENCH_PRODUCTS, [1, 2, 3], seed=BENCH_SEED, now=BENCH_AS_OF))
+    db.products.insert_many(products)
+    db.carts.insert_many(list(generate_cart_lines(
+        BENCH_CART_LINES, BENCH_USERS, [str(product['_id']) for product in products],
+        [product['price'] for product in products], seed=BENCH_SEED, now=BENCH_AS_OF
+    )))
+    return db
+
+@pytest.fixture
+def seeded_db(bench_db, monkeypatch):
+    """Tohumlanmış veritabanını test süresince etkin MongoDB olarak ayarla
+
+    Test başına ayarlanır; `app` fikstürü uygulama oluştururken mongo_db'yi
+    yeniden başlattığından oturum boyunca tek seferlik atama yetmez.
+    """
+    monkeypatch.setattr(mongodb_db, 'mongo_db', bench_db)
+    return bench_db
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _benchmark.results:
+        return
+    directory = os.path.dirname(RESULTS_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(RESULTS_PATH, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'warmup': _benchmark.warmup,
+            'repeat': _benchmark.repeat,
+            'benchmarks': _benchmark.results
+        }, f, indent=2, sort_keys=True)
+    print(f"\nMikro-benchmark sonuçları: {RESULTS_PATH}")
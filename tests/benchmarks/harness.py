@@ -0,0 +1,75 @@
+"""Mikro-benchmark ölçüm yardımcıları
+
+Her ölçüm önce ısınma turlarını çalıştırır, ardından her biri `number` çağrıdan
+oluşan `repeat` tur ölçer. `number`, bir tur en az MIN_ROUND_TIME sürecek şekilde
+otomatik seçilir; böylece çok hızlı fonksiyonlarda zamanlayıcı çözünürlüğü sonucu
+bozmaz. Sonuçlar çağrı başına saniye cinsindendir.
+"""
+import gc
+import os
+import statistics
+import time
+
+MIN_ROUND_TIME = 0.005
+MAX_CALIBRATION_NUMBER = 100000
+
+DEFAULT_WARMUP = int(os.environ.get('BENCHMARK_WARMUP', '3'))
+DEFAULT_REPEAT = int(os.environ.get('BENCHMARK_REPEAT', '15'))
+
+
+def summarize(timings):
+    """Tur başına çağrı sürelerinden özet istatistik üret"""
+    ordered = sorted(timings)
+    return {
+        'rounds': len(ordered),
+        'min': ordered[0],
+        'max': ordered[-1],
+        'mean': statistics.fmean(ordered),
+        'median': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+    }
+
+
+class Benchmark:
+    """Bir benchmark oturumundaki ölçümleri toplayan çağrılabilir nesne"""
+
+    def __init__(self, warmup=DEFAULT_WARMUP, repeat=DEFAULT_REPEAT):
+        self.warmup = warmup
+        self.repeat = repeat
+        self.results = {}
+
+    def _calibrate(self, func, args, kwargs):
+        number = 1
+        while number < MAX_CALIBRATION_NUMBER:
+            started = time.perf_counter()
+            for _ in range(number):
+                func(*args, **kwargs)
+            if time.perf_counter() - started >= MIN_ROUND_TIME:
+                break
+            number *= 10
+        return number
+
+    def __call__(self, name, func, *args, number=None, repeat=None, extra=None, **kwargs):
+        """func(*args, **kwargs) çağrısını ölç, özeti kaydet ve son sonucu döndür"""
+        result = None
+        for _ in range(self.warmup):
+            result = func(*args, **kwargs)
+        number = number or self._calibrate(func, args, kwargs)
+
+        timings = []
+        gc_enabled = gc.isenabled()
+        # Ölçüm sırasında çöp toplayıcı turları rastgele sapma oluşturmasın
+        gc.disable()
+        try:
+            for _ in range(repeat or self.repeat):
+                started = time.perf_counter()
+                for _ in range(number):
+                    result = func(*args, **kwargs)
+                timings.append((time.perf_counter() - started) / number)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        self.results[name] = dict(summarize(timings), iterations=number, **(extra or {}))
+        return result
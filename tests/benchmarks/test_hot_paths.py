@@ -0,0 +1,141 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+from jinja2 import ChoiceLoader, DictLoader
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from decorators.auth import customer_required, supplier_required
+from models.cart import Cart
+from models.product import Product
+from utils import helpers
+from utils.helpers import render_email_body, send_email
+from utils.password_hasher import check_password, hash_password
+
+# Benchmark'ta ölçülecek bcrypt maliyeti (TestConfig'in düşük maliyeti yerine)
+BCRYPT_ROUNDS = int(os.environ.get('BENCHMARK_BCRYPT_ROUNDS', helpers.BCRYPT_DEFAULT_ROUNDS))
+
+ORDER_TEMPLATE = """
+<h1>Siparişiniz alındı, {{ name }}</h1>
+<table>
+{% for item in items %}
+  <tr><td>{{ item.product_name }}</td><td>{{ item.quantity }}</td><td>{{ '%.2f'|format(item.price) }} TL</td></tr>
+{% endfor %}
+</table>
+<p>Toplam: {{ '%.2f'|format(total) }} TL</p>
+"""
+
+@pytest.fixture
+def cart_user(seeded_db):
+    """En çok açık sepet satırı olan kullanıcı"""
+    rows = list(seeded_db.carts.aggregate([
+        {'$match': {'is_checked_out': False}},
+        {'$group': {'_id': '$user_id', 'lines': {'$sum': 1}}},
+        {'$sort': {'lines': -1}},
+        {'$limit': 1}
+    ]))
+    return rows[0]['_id']
+
+def view():
+    return 'ok'
+
+
+class TestModelBenchmarks:
+
+    def test_product_get_all(self, bench, seeded_db):
+        products = bench('Product.get_all', Product.get_all, limit=20)
+
+        assert len(products) == 20
+
+    def test_product_get_by_supplier(self, bench, seeded_db):
+        products = bench('Product.get_by_supplier', Product.get_by_supplier, 2)
+
+        assert products and all(product['supplier_id'] == 2 for product in products)
+
+    def test_cart_hydrate_items(self, bench, seeded_db, cart_user):
+        items = list(seeded_db.carts.find({'user_id': cart_user, 'is_checked_out': False}))
+        hydrated = bench('Cart.hydrate_items', Cart.hydrate_items, items, seeded_db.products,
+                         extra={'cart_lines': len(items)})
+
+        assert all(item['product'] is not None for item in hydrated)
+
+    def test_cart_get_items(self, bench, seeded_db, cart_user):
+        items = bench('Cart.get_items', Cart.get_items, cart_user)
+
+        assert items
+
+
+class TestSerializationBenchmarks:
+
+    def test_product_list_json(self, bench, app, seeded_db):
+        products = Product.get_all(limit=100)
+        body = bench('json.dumps products[100]', app.json.dumps, {'products': products})
+
+        assert len(products) == 100 and body.startswith('{')
+
+    def test_product_list_jsonify(self, bench, app, seeded_db):
+        products = Product.get_all(limit=100)
+        with app.test_request_context():
+            response = bench('jsonify products[100]', jsonify, {'products': products})
+
+        assert len(products) == 100 and response.status_code == 200
+
+
+class TestDecoratorBenchmarks:
+
+    @pytest.mark.parametrize('decorator, role', [
+        (customer_required, 'customer'),
+        (supplier_required, 'supplier')
+    ])
+    def test_role_decorator_overhead(self, bench, app, decorator, role):
+        token = create_access_token(identity={'id': 1, 'role': role})
+        wrapped = decorator(view)
+
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+            bench('view (dekoratörsüz)', view)
+            result = bench(decorator.__name__, wrapped)
+
+        assert result == 'ok'
+
+
+class TestEmailBenchmarks:
+
+    def test_email_template_rendering(self, bench, app):
+        app.jinja_env.loader = ChoiceLoader([
+            DictLoader({'emails/order_received.html': ORDER_TEMPLATE}), app.jinja_env.loader
+        ])
+        data = {
+            'name': 'Ayşe',
+            'items': [{'product_name': f"Ürün {i}", 'quantity': 2, 'price': 99.9} for i in range(10)],
+            'total': 1998.0
+        }
+
+        body, is_html = bench('render_email_body', render_email_body, 'yedek', False,
+                              'emails/order_received.html', data)
+        with patch('utils.helpers.deliver_email', return_value=True):
+            sent = bench('send_email (SMTP hariç)', send_email, 'Sipariş', 'user@example.com', 'yedek',
+                         template='emails/order_received.html', template_data=data)
+
+        assert is_html and 'Ürün 9' in body
+        assert sent is True
+
+
+class TestPasswordBenchmarks:
+
+    def test_hash_and_check_password(self, bench, app):
+        previous = helpers.get_bcrypt_rounds()
+        helpers.set_bcrypt_rounds(BCRYPT_ROUNDS)
+        try:
+            hashed = bench('hash_password', hash_password, 'BenchPassword123!', number=1, repeat=5,
+                           extra={'rounds': BCRYPT_ROUNDS})
+            matched = bench('check_password', check_password, 'BenchPassword123!', hashed, number=1, repeat=5,
+                            extra={'rounds': BCRYPT_ROUNDS})
+        finally:
+            helpers.set_bcrypt_rounds(previous)
+
+        assert matched
@@ -8,6 +8,26 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app import create_app
 from config.settings import TestConfig
+from utils.query_detector import query_budget
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'query_budget(max_queries=None, max_repeats=None): test bu sorgu bütçesini aşarsa başarısız olur'
+    )
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """@pytest.mark.query_budget ile işaretlenen testlerde sorgu sayısını denetle
+
+    Bütçe yalnızca test gövdesini kapsar; fikstürlerdeki veri hazırlığı sayılmaz.
+    Aşım test çağrısının hatası olarak raporlanır.
+    """
+    marker = item.get_closest_marker('query_budget')
+    if marker is None:
+        return (yield)
+    with query_budget(*marker.args, **marker.kwargs):
+        return (yield)
 
 @pytest.fixture
 def app():
@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch
+from bson import ObjectId
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app import create_app
+from config.mock_mongo import MockDatabase
+from config.settings import TestConfig
+from utils.email_outbox import STATUS_DEAD, STATUS_PENDING
+
+class TestAdminAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.client.session_transaction() as session:
+            session['admin_logged_in'] = True
+
+    @patch('utils.email_outbox.get_outbox_collection')
+    def test_retry_email_validates_id(self, mock_get_collection):
+        """Bozuk ID 400, bulunamayan ID 404 döndürmeli, dead-letter mesaj yeniden kuyruğa alınmalı"""
+        outbox = MockDatabase()['email_outbox']
+        dead_id = outbox.insert_one({'status': STATUS_DEAD, 'attempts': 5}).inserted_id
+        mock_get_collection.return_value = outbox
+
+        malformed = self.client.post('/admin/api/email-outbox/bozuk-id/retry')
+        unknown = self.client.post(f'/admin/api/email-outbox/{ObjectId()}/retry')
+        retried = self.client.post(f'/admin/api/email-outbox/{dead_id}/retry')
+
+        self.assertEqual(malformed.status_code, 400)
+        self.assertEqual(json.loads(malformed.data)['message'], 'Geçersiz e-posta ID')
+        self.assertEqual(unknown.status_code, 404)
+        self.assertEqual(retried.status_code, 200)
+        self.assertEqual(outbox.find_one({'_id': dead_id})['status'], STATUS_PENDING)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -138,10 +138,10 @@ class TestAuthAPI(unittest.TestCase):
         self.assertEqual(response_data['message'], 'Geçersiz e-posta veya şifre')
     
     @patch('routes.auth.User')
-    @patch('routes.auth.send_email')
-    def test_forgot_password_success(self, mock_send_email, mock_user):
-        # Mock email sending to return True (successful)
-        mock_send_email.return_value = True
+    @patch('routes.auth.queue_email')
+    def test_forgot_password_success(self, mock_queue_email, mock_user):
+        # Mock email queueing to return a message id (successful)
+        mock_queue_email.return_value = 'outbox-message-id'
         
         # Mock User.find_by_email
         mock_user.find_by_email.return_value = {
@@ -168,7 +168,7 @@ class TestAuthAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         response_data = json.loads(response.data)
         self.assertEqual(response_data['message'], 'Şifre sıfırlama bağlantısı e-posta adresinize gönderildi')
-        mock_send_email.assert_called_once()
+        mock_queue_email.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
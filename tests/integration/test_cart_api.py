@@ -55,8 +55,7 @@ class TestCartAPI:
         token = self.get_auth_token()
         
         # Mock collections
-        mock_cart_collection.return_value.find_one.return_value = None  # Sepette ürün yok
-        mock_cart_collection.return_value.insert_one.return_value = MagicMock()
+        mock_cart_collection.return_value.update_one.return_value = MagicMock(upserted_id=ObjectId())
         mock_cart_collection.return_value.find.return_value = []
         
         mock_products_collection.return_value.find_one.return_value = {
@@ -79,6 +78,14 @@ class TestCartAPI:
         data = json.loads(response.data)
         assert 'message' in data
         assert 'başarıyla eklendi' in data['message']
+        
+        # Sepet satırı tek bir upsert ile yazılmalı
+        mock_cart_collection.return_value.find_one.assert_not_called()
+        mock_cart_collection.return_value.insert_one.assert_not_called()
+        args, kwargs = mock_cart_collection.return_value.update_one.call_args
+        assert args[1]['$inc'] == {'quantity': 2}
+        assert args[1]['$setOnInsert']['product_name'] == 'Test Product'
+        assert kwargs['upsert'] is True
     
     @patch('routes.cart.get_cart_collection')
     @patch('routes.cart.get_products_collection')
@@ -145,6 +152,29 @@ class TestCartAPI:
         data = json.loads(response.data)
         assert 'items' in data
     
+    @patch('routes.cart.get_cart_collection')
+    @patch('routes.cart.get_products_collection')
+    def test_get_cart_fields_projection(self, mock_products_collection, mock_cart_collection):
+        """fields= sepet satırlarını ve ürün sorgusunu yalnızca gerekli alanlarla sınırlamalı"""
+        token = self.get_auth_token()
+        product_id = ObjectId()
+        
+        mock_cart_collection.return_value.find.return_value = [
+            {'quantity': 2, 'product_id': str(product_id)}
+        ]
+        mock_products_collection.return_value.find.return_value = [
+            {'_id': product_id, 'is_deleted': False}
+        ]
+        
+        response = self.client.get('/api/cart?fields=quantity,product_available',
+            headers={'Authorization': f'Bearer {token}'}
+        )
+        
+        assert response.status_code == 200
+        assert json.loads(response.data)['items'] == [{'quantity': 2, 'product_available': True}]
+        assert mock_cart_collection.return_value.find.call_args[0][1] == {'quantity': 1, 'product_id': 1, '_id': 0}
+        assert mock_products_collection.return_value.find.call_args[0][1] == {'is_deleted': 1}
+    
     def test_get_cart_unauthorized(self):
         """Yetkisiz sepet görüntüleme"""
         response = self.client.get('/api/cart')
@@ -187,12 +217,9 @@ class TestCartAPI:
         cart_id = str(ObjectId())
         
         # Mock cart item
-        mock_cart_collection.return_value.find_one.return_value = {
-            '_id': ObjectId(cart_id),
-            'user_id': 1,
-            'is_checked_out': False
+        mock_cart_collection.return_value.find_one_and_update.return_value = {
+            '_id': ObjectId(cart_id)
         }
-        mock_cart_collection.return_value.update_one.return_value = MagicMock(modified_count=1)
         
         response = self.client.put(f'/api/cart/update/{cart_id}',
             data=json.dumps({
@@ -231,12 +258,9 @@ class TestCartAPI:
         cart_id = str(ObjectId())
         
         # Mock cart item
-        mock_cart_collection.return_value.find_one.return_value = {
-            '_id': ObjectId(cart_id),
-            'user_id': 1,
-            'is_checked_out': False
+        mock_cart_collection.return_value.find_one_and_delete.return_value = {
+            '_id': ObjectId(cart_id)
         }
-        mock_cart_collection.return_value.delete_one.return_value = MagicMock(deleted_count=1)
         
         response = self.client.delete(f'/api/cart/remove/{cart_id}',
             headers={'Authorization': f'Bearer {token}'}
@@ -253,7 +277,7 @@ class TestCartAPI:
         cart_id = str(ObjectId())
         
         # Mock cart item not found
-        mock_cart_collection.return_value.find_one.return_value = None
+        mock_cart_collection.return_value.find_one_and_delete.return_value = None
         
         response = self.client.delete(f'/api/cart/remove/{cart_id}',
             headers={'Authorization': f'Bearer {token}'}
@@ -263,6 +287,28 @@ class TestCartAPI:
         data = json.loads(response.data)
         assert 'bulunamadı' in data['message']
     
+    @patch('routes.cart.get_cart_collection')
+    def test_update_cart_item_not_found(self, mock_cart_collection):
+        """Sepet öğesi güncelleme - bulunamadı"""
+        token = self.get_auth_token()
+        cart_id = str(ObjectId())
+        
+        # Mock cart item not found
+        mock_cart_collection.return_value.find_one_and_update.return_value = None
+        
+        response = self.client.put(f'/api/cart/update/{cart_id}',
+            data=json.dumps({
+                'quantity': 3
+            }),
+            content_type='application/json',
+            headers={'Authorization': f'Bearer {token}'}
+        )
+        
+        assert response.status_code == 404
+        query = mock_cart_collection.return_value.find_one_and_update.call_args[0][0]
+        assert query['user_id'] == 1
+        assert query['is_checked_out'] is False
+    
     @patch('routes.cart.get_cart_collection')
     @patch('routes.cart.get_products_collection')
     def test_checkout_cart_success(self, mock_products_collection, mock_cart_collection):
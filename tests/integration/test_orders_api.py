@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Orders API Integration Tests
+
+Bu dosya sipariş (orders) API endpoint'lerinin entegrasyon testlerini içerir.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+# Proje kök dizinini sys.path'e ekle
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from app import create_app
+from config.settings import TestConfig
+from flask_jwt_extended import create_access_token
+from utils.helpers import encode_cursor
+
+class TestOrdersAPI:
+    """Orders API integration tests"""
+
+    @classmethod
+    def setup_class(cls):
+        """Test sınıfı için kurulum"""
+        cls.app = create_app(TestConfig)
+        cls.client = cls.app.test_client()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+
+        cls.test_user_data = {
+            'id': 1,
+            'email': 'ordertest@example.com',
+            'role': 'customer'
+        }
+
+    @classmethod
+    def teardown_class(cls):
+        """Test sınıfı için temizlik"""
+        cls.app_context.pop()
+
+    def get_auth_headers(self):
+        """Kimlik doğrulama başlıklarını al"""
+        with self.app.app_context():
+            token = create_access_token(identity=self.test_user_data)
+        return {'Authorization': f'Bearer {token}'}
+
+    def make_orders(self, count):
+        return [
+            {
+                'id': 100 - i,
+                'total_amount': Decimal('10.50'),
+                'status': 'pending',
+                'created_at': datetime(2025, 1, 1, 12, 0, 0)
+            }
+            for i in range(count)
+        ]
+
+    @patch('routes.orders.Order.get_by_user')
+    def test_get_orders_summary_page(self, mock_get_by_user):
+        """Varsayılan yanıt özet projeksiyon ve sonraki sayfa cursor'ı içermeli"""
+        mock_get_by_user.return_value = self.make_orders(3)
+
+        response = self.client.get('/api/orders?limit=2', headers=self.get_auth_headers())
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data['orders']) == 2
+        assert set(data['orders'][0]) == {'id', 'total_amount', 'status', 'created_at'}
+        assert data['orders'][0]['total_amount'] == 10.5
+        assert data['next_cursor'] == encode_cursor(datetime(2025, 1, 1, 12, 0, 0), 99)
+
+        args, kwargs = mock_get_by_user.call_args
+        assert args[0] == 1
+        assert kwargs['limit'] == 3
+        assert kwargs['after'] is None
+        assert 'shipping_address' not in kwargs['fields']
+
+    @patch('routes.orders.Order.get_by_user')
+    def test_get_orders_with_cursor_and_fields(self, mock_get_by_user):
+        """cursor çözülerek modele iletilmeli, fields seçimi yanıtı belirlemeli"""
+        mock_get_by_user.return_value = [
+            {'id': 5, 'status': 'shipped', 'shipping_address': 'Adres', 'created_at': datetime(2024, 5, 1)}
+        ]
+        cursor = encode_cursor(datetime(2025, 1, 1, 12, 0, 0), 99)
+
+        response = self.client.get(
+            f'/api/orders?cursor={cursor}&fields=id,shipping_address',
+            headers=self.get_auth_headers()
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['orders'] == [{'id': 5, 'shipping_address': 'Adres'}]
+        assert data['next_cursor'] is None
+        assert mock_get_by_user.call_args[1]['after'] == (datetime(2025, 1, 1, 12, 0, 0), 99)
+
+    @patch('routes.orders.Order.get_by_user')
+    def test_get_orders_rejects_bad_parameters(self, mock_get_by_user):
+        """Bilinmeyen alan, bozuk cursor ve sınır dışı limit 400 döndürmeli"""
+        headers = self.get_auth_headers()
+
+        assert self.client.get('/api/orders?fields=id,password', headers=headers).status_code == 400
+        assert self.client.get('/api/orders?cursor=bozuk', headers=headers).status_code == 400
+        assert self.client.get('/api/orders?limit=1000', headers=headers).status_code == 400
+        mock_get_by_user.assert_not_called()
+
+    @patch('routes.orders.Order.get_by_user')
+    def test_request_metrics_exported(self, mock_get_by_user):
+        """İstek süresi ve durum kodu /metrics çıktısında görünmeli"""
+        mock_get_by_user.return_value = []
+
+        response = self.client.get('/api/orders', headers=self.get_auth_headers())
+        assert response.headers['X-DB-Round-Trips'] == 'mongo=0, mysql=0'
+
+        metrics = self.client.get('/metrics')
+        assert metrics.status_code == 200
+        assert metrics.mimetype == 'text/plain'
+        text = metrics.get_data(as_text=True)
+        assert 'http_requests_total{method="GET",route="/api/orders",status="200"}' in text
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/orders"}' in text
+
+        assert self.client.get('/metrics?format=json').mimetype == 'text/plain'
+        assert self.client.get('/admin/api/metrics').status_code == 302
+
+        with self.client.session_transaction() as session:
+            session['admin_logged_in'] = True
+        try:
+            data = json.loads(self.client.get('/admin/api/metrics').data)
+        finally:
+            with self.client.session_transaction() as session:
+                session.pop('admin_logged_in', None)
+        assert data['metrics']['http_request_db_round_trips']['type'] == 'histogram'
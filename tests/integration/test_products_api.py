@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from app import create_app
 from config.settings import TestConfig
+from utils.helpers import normalize_search_text
 
 class TestProductsAPI(unittest.TestCase):
     
@@ -95,6 +96,228 @@ class TestProductsAPI(unittest.TestCase):
         response_data = json.loads(response.data)
         self.assertEqual(len(response_data.get('products', [])), 2)
     
+    @patch('routes.products.get_products_collection')
+    def test_get_products_with_cursor(self, mock_get_collection):
+        """cursor verildiğinde skip yerine keyset sorgusu kullanılmalı"""
+        from datetime import datetime
+        from bson import ObjectId
+        from utils.helpers import encode_cursor
+        
+        created_at = datetime(2025, 1, 1, 12, 0, 0)
+        products = [
+            {'_id': ObjectId(), 'name': f'Ürün {i}', 'price': 10.0, 'created_at': created_at}
+            for i in range(13)
+        ]
+        mock_collection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_collection.find.return_value = mock_cursor
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.limit.return_value = products
+        mock_get_collection.return_value = mock_collection
+        
+        last_id = ObjectId()
+        cursor = encode_cursor(created_at, last_id)
+        response = self.client.get(f'/api/products?cursor={cursor}&include_total=false')
+        
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.data)
+        self.assertEqual(len(response_data['products']), 12)
+        self.assertIsNone(response_data['total'])
+        self.assertIsNotNone(response_data['next_cursor'])
+        mock_collection.count_documents.assert_not_called()
+        mock_cursor.skip.assert_not_called()
+        
+        seek_query = mock_collection.find.call_args[0][0]
+        seek_clause = seek_query['$and'][1]['$or']
+        self.assertEqual(seek_clause[1]['_id'], {'$lt': last_id})
+        self.assertEqual(seek_clause[1]['created_at'], created_at)
+    
+    @patch('routes.products.get_products_collection')
+    def test_get_products_text_search(self, mock_get_collection):
+        """Arama $text ile yapılmalı, ilgi puanı yanıta sızmamalı"""
+        mock_collection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_collection.count_documents.return_value = 1
+        mock_collection.find.return_value = mock_cursor
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.skip.return_value = mock_cursor
+        mock_cursor.limit.return_value = [
+            {'_id': 'product1', 'name': 'Kırmızı Şapka', 'price': 50.0, 'score': 3.2}
+        ]
+        mock_get_collection.return_value = mock_collection
+        
+        response = self.client.get('/api/products?search=KIRMIZI%20ŞAPKA&search_mode=text&min_price=10')
+        
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.data)
+        self.assertNotIn('score', response_data['products'][0])
+        query = mock_collection.find.call_args[0][0]
+        self.assertEqual(query['$text'], {'$search': 'kirmizi sapka'})
+        self.assertEqual(query['price'], {'$gte': 10.0})
+        self.assertNotIn('name', query)
+    
+    @patch('routes.products.get_products_collection')
+    def test_get_products_prefix_search(self, mock_get_collection):
+        """Önek araması normalize edilmiş ada sabitlenmiş regex kullanmalı"""
+        mock_collection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_collection.count_documents.return_value = 0
+        mock_collection.find.return_value = mock_cursor
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.skip.return_value = mock_cursor
+        mock_cursor.limit.return_value = []
+        mock_get_collection.return_value = mock_collection
+        
+        response = self.client.get('/api/products?search=İğne.&search_mode=prefix')
+        
+        self.assertEqual(response.status_code, 200)
+        query = mock_collection.find.call_args[0][0]
+        self.assertEqual(query['name_search'], {'$regex': '^igne\\.'})
+    
+    @patch('routes.products.get_products_collection')
+    def test_get_products_default_search_matches_substring(self, mock_get_collection):
+        """search_mode verilmezse eski istemciler için kelime parçası da eşleşmeli"""
+        from config.mock_mongo import MockDatabase
+        
+        products = MockDatabase()['products']
+        for name in ('Akıllı Telefon', 'Telsiz', 'Kalem'):
+            products.insert_one({'name': name, 'name_search': normalize_search_text(name),
+                                 'price': 10.0, 'is_deleted': False})
+        mock_get_collection.return_value = products
+        
+        response = self.client.get('/api/products?search=TEL')
+        
+        self.assertEqual(response.status_code, 200)
+        names = sorted(product['name'] for product in json.loads(response.data)['products'])
+        self.assertEqual(names, ['Akıllı Telefon', 'Telsiz'])
+        self.assertEqual(self.client.get('/api/products?search=tel&search_mode=bozuk').status_code, 400)
+    
+    @patch('routes.products.get_products_collection')
+    def test_get_products_fields_projection(self, mock_get_collection):
+        """fields= yalnızca istenen alanları getirmeli, sayfalama alanları yanıta sızmamalı"""
+        from datetime import datetime
+        from bson import ObjectId
+        
+        mock_collection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_collection.count_documents.return_value = 1
+        mock_collection.find.return_value = mock_cursor
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.skip.return_value = mock_cursor
+        mock_cursor.limit.return_value = [
+            {'_id': ObjectId(), 'name': 'Kalem', 'price': 5.0, 'created_at': datetime(2025, 1, 1)}
+        ]
+        mock_get_collection.return_value = mock_collection
+        
+        response = self.client.get('/api/products?fields=name,price')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['products'], [{'name': 'Kalem', 'price': 5.0}])
+        projection = mock_collection.find.call_args[0][1]
+        self.assertEqual(projection, {'name': 1, 'price': 1, '_id': 1, 'created_at': 1})
+    
+    @patch('routes.products.get_products_collection')
+    def test_get_products_default_projection_and_unknown_fields(self, mock_get_collection):
+        """Varsayılan projeksiyon iç arama alanlarını dışlamalı, bilinmeyen alan 400 döndürmeli"""
+        from models.product import PRODUCT_LIST_FIELDS
+        
+        mock_collection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_collection.find.return_value = mock_cursor
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.limit.return_value = []
+        mock_get_collection.return_value = mock_collection
+        
+        response = self.client.get('/api/products/featured')
+        projection = mock_collection.find.call_args[0][1]
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(projection), set(PRODUCT_LIST_FIELDS))
+        self.assertNotIn('name_search', projection)
+        
+        response = self.client.get('/api/products?fields=name,name_search')
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name_search', json.loads(response.data)['message'])
+    
+    @patch('routes.products.get_products_collection')
+    def test_get_products_invalid_cursor(self, mock_get_collection):
+        """Bozuk cursor 400 döndürmeli"""
+        mock_get_collection.return_value = MagicMock()
+        
+        response = self.client.get('/api/products?cursor=bozuk')
+        
+        self.assertEqual(response.status_code, 400)
+    
+    @patch('routes.products.get_products_collection')
+    def test_get_products_cursor_requires_date_and_object_id(self, mock_get_collection):
+        """Tarihsiz veya ObjectId olmayan cursor sorgu yapılmadan 400 döndürmeli"""
+        from datetime import datetime
+        from bson import ObjectId
+        from utils.helpers import encode_cursor
+        
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        
+        for cursor in (encode_cursor(None, ObjectId()),
+                       encode_cursor(datetime(2025, 1, 1), 42),
+                       encode_cursor(datetime(2025, 1, 1), 'product1')):
+            response = self.client.get(f'/api/products?cursor={cursor}&include_total=false')
+            self.assertEqual(response.status_code, 400)
+        
+        mock_collection.find.assert_not_called()
+    
+    @patch('routes.products.get_products_collection')
+    def test_next_cursor_for_product_without_created_at(self, mock_get_collection):
+        """created_at'i olmayan son ürün sayfalamayı kesmemeli, cursor ObjectId zamanını taşımalı"""
+        from bson import ObjectId
+        from utils.helpers import decode_cursor
+        
+        products = [{'_id': ObjectId(), 'name': f'Ürün {i}', 'price': 10.0} for i in range(13)]
+        mock_collection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_collection.find.return_value = mock_cursor
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.skip.return_value = mock_cursor
+        mock_cursor.limit.return_value = products
+        mock_get_collection.return_value = mock_collection
+        
+        response = self.client.get('/api/products?include_total=false')
+        
+        self.assertEqual(response.status_code, 200)
+        next_cursor = json.loads(response.data)['next_cursor']
+        self.assertEqual(decode_cursor(next_cursor), (products[11]['_id'].generation_time, products[11]['_id']))
+    
+    @patch('routes.products.get_products_collection')
+    def test_featured_products_cached_until_invalidated(self, mock_get_collection):
+        """Öne çıkan ürünler önbellekten sunulmalı, ürün yazımında önbellek temizlenmeli"""
+        from utils.cache import response_cache, invalidate_product_responses
+        
+        self.app.config['RESPONSE_CACHE_ENABLED'] = True
+        response_cache.invalidate()
+        self.addCleanup(response_cache.invalidate)
+        
+        mock_collection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_collection.find.return_value = mock_cursor
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.limit.return_value = [{'_id': 'product1', 'name': 'Test Product 1', 'price': 10.0}]
+        mock_get_collection.return_value = mock_collection
+        
+        first = self.client.get('/api/products/featured')
+        second = self.client.get('/api/products/featured')
+        
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(mock_collection.find.call_count, 1)
+        
+        invalidate_product_responses()
+        third = self.client.get('/api/products/featured')
+        
+        self.assertEqual(third.headers['X-Cache'], 'MISS')
+        self.assertEqual(mock_collection.find.call_count, 2)
+    
     @patch('models.product.Product')
     @patch('routes.products.get_products_collection')
     @patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
@@ -0,0 +1,90 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bson import ObjectId
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config import mongodb_db
+from config.mock_mongo import MockDatabase
+from config.mysql_db import InstrumentedCursor
+from utils.db_migrations import apply_mongo_indexes
+from utils.metrics import record_db_call
+from utils.query_detector import QueryBudgetExceeded, record_sql
+
+CUSTOMER = {'id': 1, 'email': 'budget@example.com', 'role': 'customer'}
+
+@pytest.fixture
+def budget_db(app, monkeypatch):
+    """Üç ürünü ve müşterinin üç açık sepet satırını içeren bellek içi MongoDB"""
+    db = MockDatabase()
+    apply_mongo_indexes(db)
+    product_ids = db.products.insert_many([
+        {'name': f"Ürün {i}", 'price': 10.0 * (i + 1), 'stock': 5, 'is_deleted': False}
+        for i in range(3)
+    ]).inserted_ids
+    db.carts.insert_many([
+        {'user_id': CUSTOMER['id'], 'product_id': str(product_id), 'quantity': 1,
+         'price': 10.0 * (i + 1), 'is_checked_out': False}
+        for i, product_id in enumerate(product_ids)
+    ])
+    monkeypatch.setattr(mongodb_db, 'mongo_db', db)
+    return db
+
+@pytest.fixture
+def auth_headers(app):
+    return {'Authorization': f"Bearer {create_access_token(identity=CUSTOMER)}"}
+
+@pytest.fixture
+def mysql_conn():
+    """Cursor'ları havuzdakiyle aynı InstrumentedCursor vekili olan MySQL bağlantısı"""
+    conn = MagicMock()
+    conn.cursor.side_effect = lambda *args, **kwargs: InstrumentedCursor(
+        MagicMock(lastrowid=42), record_db_call, record_sql
+    )
+    with patch('models.order.get_mysql_connection', return_value=conn):
+        yield conn
+
+
+class TestQueryBudgets:
+
+    @pytest.mark.query_budget(max_queries=2, max_repeats=1)
+    def test_get_cart(self, client, budget_db, auth_headers):
+        """Sepet, ürün sayısından bağımsız olarak bir sepet ve bir ürün sorgusuyla okunmalı"""
+        response = client.get('/api/cart', headers=auth_headers)
+
+        assert response.status_code == 200
+        items = response.get_json()['items']
+        assert len(items) == 3 and all(item['product_available'] for item in items)
+
+    @pytest.mark.query_budget(max_queries=5, max_repeats=1)
+    def test_create_order(self, client, budget_db, auth_headers, mysql_conn):
+        """Sipariş: sepet + ürünler (Mongo), başlık + toplu öğe ekleme (MySQL), sepet silme"""
+        response = client.post('/api/orders', json={'shipping_address': 'Kadıköy, İstanbul'},
+                               headers=auth_headers)
+
+        assert response.status_code == 201
+        assert response.get_json()['order_id'] == 42
+        # docs sorgu kaydetmez, bütçeye sayılmaz
+        assert budget_db.carts.docs == []
+        mysql_conn.commit.assert_called_once()
+
+    @pytest.mark.xfail(raises=QueryBudgetExceeded, strict=True,
+                       reason='Satır başına ürün sorgusu tekrar bütçesini aşmalı')
+    @pytest.mark.query_budget(max_queries=2, max_repeats=1)
+    def test_n_plus_one_cart_exceeds_budget(self, app, client, budget_db, auth_headers):
+        """Ürünleri satır satır getiren sepet görünümü aynı bütçeyle başarısız olmalı"""
+        def naive_cart():
+            items = list(budget_db.carts.find({'user_id': CUSTOMER['id'], 'is_checked_out': False}))
+            for item in items:
+                item['product'] = budget_db.products.find_one({'_id': ObjectId(item['product_id'])})
+            return jsonify({'items': len(items)})
+
+        app.add_url_rule('/api/naive-cart', 'naive_cart', naive_cart)
+
+        assert client.get('/api/naive-cart', headers=auth_headers).status_code == 200
@@ -0,0 +1,32 @@
+"""Yük testlerinin ortak kullandığı seed manifesti (python -m utils.seed_data)"""
+import os
+import json
+import random
+
+# Manifest yoksa kullanılacak ürünler (yalnızca bu ID'lerin bulunduğu veritabanında çalışır)
+DEFAULT_PRODUCT_IDS = [
+    "6838173ed63fc0880e57f43b",  # Laptop
+    "6838173ed63fc0880e57f43c",  # Smartphone
+    "6838173ed63fc0880e57f43d",  # Headphones
+    "6838173ed63fc0880e57f43e",  # Smartwatch
+    "68381c102ddf28a78e5c7f6b"   # Bilgisayar HP
+]
+
+def load_seed_manifest():
+    """Manifesti oku (SEED_MANIFEST ile değiştirilebilir); yoksa boş sözlük"""
+    path = os.environ.get('SEED_MANIFEST', os.path.join(os.path.dirname(__file__), '../..', 'seed_manifest.json'))
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+SEED_MANIFEST = load_seed_manifest()
+PRODUCT_IDS = SEED_MANIFEST.get('product_ids') or DEFAULT_PRODUCT_IDS
+HOT_PRODUCT_IDS = SEED_MANIFEST.get('hot_product_ids') or PRODUCT_IDS
+SEED_USERS = SEED_MANIFEST.get('users', [])
+SEED_PASSWORD = SEED_MANIFEST.get('password')
+
+def pick_product_id():
+    # Eklemelerin yarısı popüler ürünlere gitsin (gerçek trafikteki sıcak ürünler gibi)
+    return random.choice(HOT_PRODUCT_IDS if random.random() < 0.5 else PRODUCT_IDS)
@@ -0,0 +1,139 @@
+"""Headless benchmark senaryoları (python run_tests.py --benchmark)
+
+Her senaryo ayrı bir kullanıcı sınıfıdır ve tek başına çalıştırılır, böylece
+uç nokta yüzdelikleri senaryolar arasında karışmaz. İstekler name= ile
+gruplanır; ID içeren yollar tek bir uç nokta olarak raporlanır.
+"""
+import sys
+import os
+import random
+import time
+from locust import HttpUser, task, between
+
+# Ortak manifest modülü için bu dizini ekle
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from manifest import SEED_PASSWORD, SEED_USERS, pick_product_id
+
+SEARCH_TERMS = ['laptop', 'telefon', 'kulaklık', 'saat', 'tablet', 'klavye', 'akıllı', 'kablosuz']
+
+
+class AuthenticatedUser(HttpUser):
+    """Manifestteki bir kullanıcıyla (yoksa yeni kayıtla) giriş yapan temel sınıf"""
+
+    abstract = True
+    wait_time = between(0.1, 0.5)
+
+    def on_start(self):
+        self.headers = {}
+        if SEED_USERS:
+            user = random.choice(SEED_USERS)
+            self.email, self.password = user['email'], SEED_PASSWORD
+        else:
+            suffix = f"{random.randint(1, 10 ** 6)}_{int(time.time() * 1000)}"
+            self.email, self.password = f"bench{suffix}@example.com", 'BenchPassword123!'
+            self.client.post("/api/auth/register", json={
+                "name": f"Bench {suffix}", "email": self.email,
+                "password": self.password, "account_type": "customer"
+            }, name="/api/auth/register")
+        self.login()
+
+    def login(self):
+        response = self.client.post("/api/auth/login", json={
+            "email": self.email, "password": self.password
+        }, name="/api/auth/login")
+        if response.status_code == 200:
+            data = response.json()
+            token = data.get('access_token') or data.get('token')
+            self.headers = {'Authorization': f'Bearer {token}'}
+
+    def add_to_cart(self):
+        self.client.post("/api/cart/add", json={
+            "product_id": pick_product_id(), "quantity": random.randint(1, 3)
+        }, headers=self.headers, name="/api/cart/add")
+
+
+class BrowseUser(HttpUser):
+    """Katalog gezinme: sayfalar, ürün listesi ve öne çıkanlar"""
+
+    wait_time = between(0.1, 0.5)
+
+    @task(3)
+    def product_list(self):
+        self.client.get(f"/api/products?page={random.randint(1, 20)}&per_page=20",
+                        name="/api/products?page=[n]")
+
+    @task(2)
+    def featured(self):
+        self.client.get("/api/products/featured")
+
+    @task(1)
+    def pages(self):
+        self.client.get(random.choice(["/", "/products"]))
+
+
+class SearchUser(HttpUser):
+    """Ürün araması"""
+
+    wait_time = between(0.1, 0.5)
+
+    @task
+    def search(self):
+        self.client.get(f"/api/products?search={random.choice(SEARCH_TERMS)}&per_page=20",
+                        name="/api/products?search=[term]")
+
+
+class CartChurnUser(AuthenticatedUser):
+    """Sepete ekleme, miktar güncelleme, silme ve sepet okuma döngüsü"""
+
+    @task(4)
+    def add(self):
+        self.add_to_cart()
+
+    @task(3)
+    def view(self):
+        self.client.get("/api/cart/count", headers=self.headers)
+        self.client.get("/api/cart", headers=self.headers)
+
+    @task(2)
+    def update_or_remove(self):
+        response = self.client.get("/api/cart", headers=self.headers)
+        items = response.json().get('items', []) if response.status_code == 200 else []
+        if not items:
+            return
+        item = random.choice(items)
+        if random.random() < 0.5:
+            self.client.put(f"/api/cart/update/{item['_id']}", json={"quantity": random.randint(1, 5)},
+                            headers=self.headers, name="/api/cart/update/[id]")
+        else:
+            self.client.delete(f"/api/cart/remove/{item['_id']}", headers=self.headers,
+                               name="/api/cart/remove/[id]")
+
+
+class CheckoutUser(AuthenticatedUser):
+    """Birkaç ürün ekleyip ödeme yapan ve siparişlerini listeleyen müşteri"""
+
+    @task
+    def checkout(self):
+        for _ in range(random.randint(1, 3)):
+            self.add_to_cart()
+        self.client.post("/api/cart/checkout", json={}, headers=self.headers)
+        self.client.get("/api/orders", headers=self.headers)
+
+
+class LoginStormUser(HttpUser):
+    """Yoğun giriş trafiği; isteklerin bir kısmı hatalı parolayla yapılır"""
+
+    wait_time = between(0.05, 0.2)
+
+    @task
+    def login(self):
+        if SEED_USERS and random.random() < 0.8:
+            email, password = random.choice(SEED_USERS)['email'], SEED_PASSWORD
+        else:
+            email, password = f"nouser{random.randint(1, 10 ** 6)}@example.com", 'wrongpassword'
+        with self.client.post("/api/auth/login", json={"email": email, "password": password},
+                              name="/api/auth/login", catch_response=True) as response:
+            # Hatalı parolanın 401 dönmesi beklenen davranıştır
+            if response.status_code == 401:
+                response.success()
@@ -7,6 +7,10 @@ from locust import HttpUser, task, between
 
 # Proje kök dizinini sys.path'e ekle
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Ortak manifest modülü için bu dizini de ekle
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from manifest import SEED_PASSWORD, SEED_USERS, pick_product_id
 
 class DoSUser(HttpUser):
     """
@@ -32,9 +36,28 @@ class DoSUser(HttpUser):
         self.email = f"test{self.user_id}@example.com"
         self.password = "TestPassword123!"
         
+        if SEED_USERS:
+            # Üretilmiş kullanıcılardan biriyle giriş yap; kayıt trafiği oluşturma
+            seed_user = random.choice(SEED_USERS)
+            self.email = seed_user['email']
+            self.password = SEED_PASSWORD or self.password
+            self.login_seed_user()
+            return
+        
         # Test kullanıcısı oluşturmaya çalış
         self.create_test_user()
     
+    def login_seed_user(self):
+        """Manifestteki kullanıcıyla giriş yap"""
+        response = self.client.post("/api/auth/login", json={
+            "email": self.email,
+            "password": self.password
+        })
+        if response.status_code == 200:
+            self.user_created = True
+            data = response.json()
+            self.auth_token = data.get('access_token') or data.get('token')
+    
     def create_test_user(self):
         """Test kullanıcısı oluştur ve login ol"""
         try:
@@ -130,17 +153,8 @@ class DoSUser(HttpUser):
             # Sepeti görüntüle
             self.client.get("/api/cart", headers=headers)
             
-            # Gerçek ürün ID'lerini kullan
-            real_product_ids = [
-                "6838173ed63fc0880e57f43b",  # Laptop
-                "6838173ed63fc0880e57f43c",  # Smartphone  
-                "6838173ed63fc0880e57f43d",  # Headphones
-                "6838173ed63fc0880e57f43e",  # Smartwatch
-                "68381c102ddf28a78e5c7f6b"   # Bilgisayar HP
-            ]
-            
-            # Rastgele bir ürün ID'si seç
-            product_id = random.choice(real_product_ids)
+            # Manifestteki (veya varsayılan) ürünlerden birini seç
+            product_id = pick_product_id()
             
             # Sepete ürün eklemeyi dene
             self.client.post("/api/cart/add", 
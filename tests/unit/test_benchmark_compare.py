@@ -0,0 +1,29 @@
+import unittest
+import sys
+import os
+
+# Benchmark karşılaştırma modülü için tests/benchmarks dizinini ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks')))
+
+from compare import compare_results
+
+class TestBenchmarkCompare(unittest.TestCase):
+
+    def test_flags_changes_beyond_threshold(self):
+        """Eşiği aşan değişimler yavaş/hızlı olarak işaretlenmeli"""
+        old = {'a': {'median': 1.0}, 'b': {'median': 1.0}, 'c': {'median': 1.0}}
+        new = {'a': {'median': 1.5}, 'b': {'median': 0.5}, 'c': {'median': 1.05}}
+
+        statuses = {row[0]: row[4] for row in compare_results(old, new, threshold=0.1)}
+
+        self.assertEqual(statuses, {'a': 'slower', 'b': 'faster', 'c': 'same'})
+
+    def test_only_common_benchmarks_are_compared(self):
+        """Yalnızca iki dosyada da bulunan ölçümler karşılaştırılmalı"""
+        rows = compare_results({'a': {'median': 2.0}, 'old': {'median': 1.0}},
+                               {'a': {'median': 3.0}, 'new': {'median': 1.0}})
+
+        self.assertEqual([(row[0], row[3]) for row in rows], [('a', 0.5)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from run_tests import compare_benchmark, parse_locust_stats
+
+STATS_CSV = """Type,Name,Request Count,Failure Count,Median Response Time,Average Response Time,Min Response Time,Max Response Time,Average Content Size,Requests/s,Failures/s,50%,66%,75%,80%,90%,95%,98%,99%,99.9%,99.99%,100%
+GET,/api/products?page=[n],120,2,21,30.5,3,210,1500,20.1,0.3,21,25,30,35,80,150,190,200,210,210,210
+POST,/api/cart/add,0,0,0,0,0,0,0,0.0,0.0,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A
+,Aggregated,120,2,21,30.5,3,210,1500,20.1,0.3,21,25,30,35,80,150,190,200,210,210,210
+"""
+
+def scenario(p95, rps=20.0, failures=0, requests=100):
+    endpoint = {'requests': requests, 'failures': failures, 'rps': rps, 'p50': 10.0, 'p95': p95, 'p99': p95}
+    return {'scenarios': {'browse': {'endpoints': {'GET /api/products': endpoint, 'aggregate': dict(endpoint)}}}}
+
+class TestBenchmarkRunner(unittest.TestCase):
+
+    def test_parse_locust_stats(self):
+        """Locust CSV'si uç nokta başına istek, hata, throughput ve yüzdeliklere çevrilmeli"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write(STATS_CSV)
+        try:
+            endpoints = parse_locust_stats(f.name)
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(endpoints['GET /api/products?page=[n]'], {
+            'requests': 120, 'failures': 2, 'rps': 20.1, 'p50': 21.0, 'p95': 150.0, 'p99': 200.0
+        })
+        self.assertIsNone(endpoints['POST /api/cart/add']['p95'])
+        self.assertEqual(endpoints['aggregate']['requests'], 120)
+
+    def test_compare_within_tolerance(self):
+        """Tolerans içindeki veya gürültü eşiğinin altındaki farklar gerileme sayılmamalı"""
+        self.assertEqual(compare_benchmark(scenario(110.0), scenario(100.0), 0.15), [])
+        self.assertEqual(compare_benchmark(scenario(4.0), scenario(1.0), 0.15), [])
+
+    def test_compare_detects_regressions(self):
+        """Yüzdelik, throughput ve hata oranı gerilemeleri raporlanmalı"""
+        latency = compare_benchmark(scenario(130.0), scenario(100.0), 0.15)
+        throughput = compare_benchmark(scenario(100.0, rps=10.0), scenario(100.0), 0.15)
+        errors = compare_benchmark(scenario(100.0, failures=5), scenario(100.0), 0.15)
+
+        self.assertIn('browse GET /api/products p95: 100 ms -> 130 ms', latency)
+        self.assertEqual(throughput, ['browse throughput: 20.0 -> 10.0 istek/sn'])
+        self.assertIn('browse GET /api/products hata oranı: 0.0% -> 5.0%', errors)
+
+    def test_compare_skips_unknown_and_sparse_endpoints(self):
+        """Taban çizgisinde olmayan senaryolar ve az istek alan uç noktalar atlanmalı"""
+        self.assertEqual(compare_benchmark(scenario(500.0), {'scenarios': {}}, 0.15), [])
+        self.assertEqual(compare_benchmark(scenario(500.0, requests=5), scenario(100.0, requests=5), 0.15), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,21 +20,22 @@ class TestCartModel(unittest.TestCase):
         mock_get_db.return_value = mock_db
         mock_db.carts = mock_collection
         
-        # Mock find_one - ürün sepette yok
-        mock_collection.find_one.return_value = None
-        
-        # Mock insert_one
-        mock_insert_result = MagicMock()
-        mock_insert_result.inserted_id = ObjectId()
-        mock_collection.insert_one.return_value = mock_insert_result
+        # Mock find_one_and_update - upsert yeni satırı döndürür
+        cart_id = ObjectId()
+        mock_collection.find_one_and_update.return_value = {'_id': cart_id}
         
         # Test et
         result = Cart.add_item(1, "product123", 2, 99.99)
         
-        # Assert
-        mock_collection.find_one.assert_called_once()
-        mock_collection.insert_one.assert_called_once()
-        self.assertIsNotNone(result)
+        # Assert - okuma ve yazma tek atomik işlemde yapılmalı
+        mock_collection.find_one_and_update.assert_called_once()
+        mock_collection.find_one.assert_not_called()
+        mock_collection.insert_one.assert_not_called()
+        args, kwargs = mock_collection.find_one_and_update.call_args
+        self.assertEqual(args[0], {'user_id': 1, 'product_id': 'product123', 'is_checked_out': False})
+        self.assertEqual(args[1]['$inc'], {'quantity': 2})
+        self.assertTrue(kwargs['upsert'])
+        self.assertEqual(result, str(cart_id))
     
     @patch('models.cart.get_db')
     def test_get_user_cart(self, mock_get_db):
@@ -76,12 +77,14 @@ class TestCartModel(unittest.TestCase):
         mock_db.carts = mock_carts_collection
         mock_db.products = mock_products_collection
         
+        product_id = ObjectId()
+        
         # Mock cart items
         mock_carts_collection.find.return_value = [
             {
                 '_id': ObjectId(),
                 'user_id': 1,
-                'product_id': ObjectId(),
+                'product_id': product_id,
                 'quantity': 2,
                 'price': 99.99,
                 'is_checked_out': False
@@ -89,22 +92,47 @@ class TestCartModel(unittest.TestCase):
         ]
         
         # Mock product details
-        mock_products_collection.find_one.return_value = {
-            '_id': ObjectId(),
+        mock_products_collection.find.return_value = [{
+            '_id': product_id,
             'name': 'Test Product',
             'image': 'test.jpg',
             'is_deleted': False
-        }
+        }]
         
         # Test et
         result = Cart.get_items(1)
         
         # Assert
         mock_carts_collection.find.assert_called_once()
-        mock_products_collection.find_one.assert_called()
+        mock_products_collection.find.assert_called_once()
+        mock_products_collection.find_one.assert_not_called()
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]['product_name'], 'Test Product')
     
+    def test_hydrate_items_single_query(self):
+        """hydrate_items tüm ürünleri tek bir $in sorgusuyla çözmeli"""
+        mock_products_collection = MagicMock()
+        product_ids = [ObjectId() for _ in range(40)]
+        cart_items = [
+            {'_id': ObjectId(), 'product_id': str(pid), 'quantity': 1, 'price': 10.0}
+            for pid in product_ids
+        ]
+        cart_items.append({'_id': ObjectId(), 'product_id': 'gecersiz-id', 'quantity': 1, 'price': 10.0})
+        mock_products_collection.find.return_value = [
+            {'_id': pid, 'name': f'Ürün {i}'} for i, pid in enumerate(product_ids[:-1])
+        ]
+        
+        result = Cart.hydrate_items(cart_items, mock_products_collection)
+        
+        mock_products_collection.find.assert_called_once()
+        query = mock_products_collection.find.call_args[0][0]
+        self.assertEqual(len(query['_id']['$in']), 40)
+        self.assertEqual(len(result), 41)
+        self.assertEqual(result[0]['product']['name'], 'Ürün 0')
+        self.assertIsNone(result[39]['product'])
+        self.assertIsNone(result[40]['product'])
+        self.assertNotIn('product', cart_items[0])
+    
     @patch('models.cart.get_db')
     def test_update_quantity(self, mock_get_db):
         """MongoDB update_quantity metodunu test et"""
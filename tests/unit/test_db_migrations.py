@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils import db_migrations
+from utils.db_migrations import (
+    apply_migrations, apply_mysql_indexes, check_query_plans, merge_duplicate_cart_lines
+)
+
+class TestDbMigrations(unittest.TestCase):
+
+    def test_applied_mongo_migrations_are_skipped(self):
+        """Daha önce uygulanmış sürümler tekrar çalıştırılmamalı"""
+        db = MagicMock()
+        db['schema_migrations'].find.return_value = [{'_id': 1}]
+        first, second = MagicMock(), MagicMock()
+
+        with patch.object(db_migrations, 'MIGRATIONS', [
+            (1, 'mongo', 'first', first),
+            (2, 'mongo', 'second', second)
+        ]):
+            applied = apply_migrations(db=db)
+
+        first.assert_not_called()
+        second.assert_called_once_with(db)
+        self.assertEqual(applied, [('mongo', 2, 'second')])
+        db['schema_migrations'].insert_one.assert_called_once()
+
+    def test_mysql_index_created_only_when_missing(self):
+        """information_schema'da bulunan indeksler yeniden oluşturulmamalı"""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchone.side_effect = [(1,), (0,)]
+
+        apply_mysql_indexes(conn, [
+            ('users', 'idx_exists', '(email)'),
+            ('orders', 'idx_missing', '(user_id, created_at)')
+        ])
+
+        create_calls = [c for c in cursor.execute.call_args_list if c[0][0].startswith('CREATE INDEX')]
+        self.assertEqual(len(create_calls), 1)
+        self.assertIn('idx_missing ON orders (user_id, created_at)', create_calls[0][0][0])
+        conn.commit.assert_called_once()
+
+    def test_check_query_plans_reports_scans(self):
+        """COLLSCAN ve type=ALL planları başarısız sayılmalı"""
+        indexed = MagicMock()
+        indexed.explain.return_value = {'queryPlanner': {'winningPlan': {
+            'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN'}
+        }}}
+        scanned = MagicMock()
+        scanned.explain.return_value = {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}}
+
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.side_effect = [
+            [{'table': 'orders', 'type': 'ref'}],
+            [{'table': 'users', 'type': 'ALL'}],
+            [{'table': 'users', 'type': 'const'}],
+            [{'table': 'order_items', 'type': 'ref'}]
+        ]
+
+        with patch.object(db_migrations, '_mongo_hot_queries',
+                          return_value=[('indexed', indexed), ('scanned', scanned)]):
+            failures = check_query_plans(db=MagicMock(), conn=conn)
+
+        names = [name for name, reason in failures]
+        self.assertEqual(names, ['scanned', 'users: şifre sıfırlama token'])
+
+    def test_merge_duplicate_cart_lines(self):
+        """Çift açık sepet satırları en eski satırda toplanmalı"""
+        collection = MagicMock()
+        collection.aggregate.return_value = [
+            {'_id': {'user_id': 1, 'product_id': 'p1'}, 'ids': ['a', 'b', 'c'], 'quantity': 6, 'count': 3}
+        ]
+
+        merge_duplicate_cart_lines(collection)
+
+        collection.update_one.assert_called_once_with({'_id': 'a'}, {'$set': {'quantity': 6}})
+        collection.delete_many.assert_called_once_with({'_id': {'$in': ['b', 'c']}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.email_outbox import (
+    EmailOutbox, queue_email, STATUS_PENDING, STATUS_SENT, STATUS_DEAD
+)
+
+class TestEmailOutbox(unittest.TestCase):
+
+    def make_message(self, attempts=1):
+        return {
+            '_id': ObjectId(),
+            'subject': 'Test',
+            'recipient': 'test@example.com',
+            'body': 'Merhaba',
+            'is_html': False,
+            'sender': None,
+            'attempts': attempts
+        }
+
+    @patch('utils.email_outbox.get_outbox_collection')
+    @patch('utils.email_outbox.render_email_body')
+    def test_queue_email_only_inserts(self, mock_render, mock_get_collection):
+        """queue_email SMTP'ye dokunmadan mesajı kuyruğa eklemeli"""
+        mock_render.return_value = ('<p>Merhaba</p>', True)
+        mock_collection = MagicMock()
+        mock_collection.insert_one.return_value = MagicMock(inserted_id=ObjectId())
+        mock_get_collection.return_value = mock_collection
+
+        with patch('utils.email_outbox.deliver_email') as mock_deliver:
+            message_id = queue_email('Konu', 'test@example.com', 'Merhaba', template='emails/x.html', template_data={'a': 1})
+            mock_deliver.assert_not_called()
+
+        self.assertIsNotNone(message_id)
+        document = mock_collection.insert_one.call_args[0][0]
+        self.assertEqual(document['status'], STATUS_PENDING)
+        self.assertEqual(document['body'], '<p>Merhaba</p>')
+        self.assertTrue(document['is_html'])
+
+    @patch('utils.email_outbox.get_outbox_collection')
+    @patch('utils.email_outbox.deliver_email')
+    def test_successful_delivery_marks_sent(self, mock_deliver, mock_get_collection):
+        """Başarılı gönderim mesajı 'sent' durumuna almalı"""
+        mock_collection = MagicMock()
+        mock_collection.find_one_and_update.return_value = self.make_message()
+        mock_get_collection.return_value = mock_collection
+
+        outbox = EmailOutbox(app=None)
+        self.assertTrue(outbox.process_next())
+
+        mock_deliver.assert_called_once()
+        update = mock_collection.update_one.call_args[0][1]
+        self.assertEqual(update['$set']['status'], STATUS_SENT)
+
+    @patch('utils.email_outbox.get_outbox_collection')
+    @patch('utils.email_outbox.deliver_email')
+    def test_failed_delivery_is_retried_with_backoff(self, mock_deliver, mock_get_collection):
+        """Başarısız gönderim geri çekilmeyle tekrar kuyruğa alınmalı"""
+        mock_deliver.side_effect = Exception('SMTP zaman aşımı')
+        mock_collection = MagicMock()
+        mock_collection.find_one_and_update.return_value = self.make_message(attempts=2)
+        mock_get_collection.return_value = mock_collection
+
+        outbox = EmailOutbox(app=None, max_attempts=5, backoff_base=30)
+        outbox.process_next()
+
+        update = mock_collection.update_one.call_args[0][1]
+        self.assertEqual(update['$set']['status'], STATUS_PENDING)
+        self.assertIn('SMTP zaman aşımı', update['$set']['last_error'])
+        self.assertEqual(outbox.backoff(2), 60)
+
+    @patch('utils.email_outbox.save_email_to_file')
+    @patch('utils.email_outbox.get_outbox_collection')
+    @patch('utils.email_outbox.deliver_email')
+    def test_exhausted_attempts_move_to_dead_letter(self, mock_deliver, mock_get_collection, mock_save):
+        """Deneme hakkı biten mesaj dead-letter durumuna alınmalı"""
+        mock_deliver.side_effect = Exception('SMTP reddetti')
+        mock_collection = MagicMock()
+        mock_collection.find_one_and_update.return_value = self.make_message(attempts=3)
+        mock_get_collection.return_value = mock_collection
+
+        outbox = EmailOutbox(app=None, max_attempts=3)
+        outbox.process_next()
+
+        update = mock_collection.update_one.call_args[0][1]
+        self.assertEqual(update['$set']['status'], STATUS_DEAD)
+        mock_save.assert_called_once()
+
+    @patch('utils.email_outbox.get_outbox_collection')
+    def test_empty_queue(self, mock_get_collection):
+        """Kuyruk boşsa process_next False döndürmeli"""
+        mock_collection = MagicMock()
+        mock_collection.find_one_and_update.return_value = None
+        mock_get_collection.return_value = mock_collection
+
+        self.assertFalse(EmailOutbox(app=None).process_next())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from flask import Flask, jsonify
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils import json_provider
+from utils.json_provider import JSONProvider
+
+class TestJSONProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = JSONProvider(self.app)
+        self.object_id = ObjectId()
+        self.payload = {
+            '_id': self.object_id,
+            'created_at': datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            'total_amount': Decimal('19.90'),
+            'price': Decimal128('5.25'),
+            'name': 'Çay bardağı'
+        }
+        self.expected = {
+            '_id': str(self.object_id),
+            'created_at': '2025-01-02T03:04:05+00:00',
+            'total_amount': 19.9,
+            'price': 5.25,
+            'name': 'Çay bardağı'
+        }
+
+    def test_jsonify_encodes_mongo_and_mysql_types(self):
+        """ObjectId, datetime ve Decimal türleri dönüştürülmeden yanıtlanabilmeli"""
+        with self.app.test_request_context():
+            response = jsonify(self.payload)
+
+        self.assertEqual(response.get_json(), self.expected)
+        self.assertNotIn(b'": ', response.get_data())
+
+    def test_standard_json_fallback_matches_orjson(self):
+        """orjson kurulu değilse standart json aynı çıktıyı üretmeli"""
+        with patch.object(json_provider, 'orjson', None), self.app.test_request_context():
+            response = jsonify(self.payload)
+            text = self.app.json.dumps(self.payload)
+
+        self.assertEqual(response.get_json(), self.expected)
+        self.assertEqual(json.loads(text), self.expected)
+
+    def test_unknown_type_raises(self):
+        """Bilinmeyen türler TypeError fırlatmalı"""
+        with self.assertRaises(TypeError):
+            self.app.json.dumps({'value': object()})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.last_login import LastLoginBuffer, build_last_login_update
+
+class TestLastLoginBuffer(unittest.TestCase):
+
+    def test_build_update_query(self):
+        """Tüm kullanıcılar tek bir UPDATE ... CASE sorgusunda yazılmalı"""
+        first, second = datetime(2025, 1, 1, 9, 0), datetime(2025, 1, 1, 9, 5)
+
+        query, params = build_last_login_update([(1, first), (2, second)])
+
+        self.assertEqual(
+            query,
+            "UPDATE users SET last_login = CASE id WHEN %s THEN %s WHEN %s THEN %s END WHERE id IN (%s, %s)"
+        )
+        self.assertEqual(params, (1, first, 2, second, 1, 2))
+
+    @patch('utils.last_login.get_mysql_connection')
+    def test_flush_writes_latest_login_once(self, mock_get_conn):
+        """Aynı kullanıcının tekrar girişleri tek satırda en yeni zamanla yazılmalı"""
+        buffer = LastLoginBuffer(flush_interval=3600)
+        buffer.start()
+        self.addCleanup(buffer.stop)
+        earlier, later = datetime(2025, 1, 1, 9, 0), datetime(2025, 1, 1, 9, 30)
+
+        buffer.record(1, later)
+        buffer.record(1, earlier)
+        buffer.record(2, earlier)
+        mock_get_conn.assert_not_called()
+
+        self.assertEqual(buffer.flush(), 2)
+
+        cursor = mock_get_conn.return_value.cursor.return_value
+        cursor.execute.assert_called_once()
+        self.assertEqual(cursor.execute.call_args[0][1], (1, later, 2, earlier, 1, 2))
+        mock_get_conn.return_value.commit.assert_called_once()
+        self.assertEqual(buffer.stats()['pending'], 0)
+
+    @patch('utils.last_login.get_mysql_connection')
+    def test_failed_flush_keeps_pending(self, mock_get_conn):
+        """Yazma başarısız olursa kayıtlar bir sonraki denemeye kalmalı"""
+        mock_get_conn.side_effect = Exception('bağlantı yok')
+        buffer = LastLoginBuffer()
+
+        buffer.record(1, datetime(2025, 1, 1))
+
+        stats = buffer.stats()
+        self.assertEqual(stats['pending'], 1)
+        self.assertEqual(stats['failures'], 1)
+
+    @patch('utils.last_login.get_mysql_connection')
+    def test_failed_update_closes_cursor_and_connection(self, mock_get_conn):
+        """UPDATE başarısız olursa cursor ve bağlantı yine kapatılmalı"""
+        conn = mock_get_conn.return_value
+        conn.cursor.return_value.execute.side_effect = Exception('kilit zaman aşımı')
+        buffer = LastLoginBuffer()
+
+        buffer.record(1, datetime(2025, 1, 1))
+
+        conn.cursor.return_value.close.assert_called_once()
+        conn.close.assert_called_once()
+        conn.commit.assert_not_called()
+        self.assertEqual(buffer.stats()['pending'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import gzip
+import logging
+import subprocess
+import tempfile
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils import log_pipeline
+from utils.log_pipeline import (
+    RotatingGzipFileHandler, attach_sampled_loggers, parse_sample_rates, queued_file_handler
+)
+
+class TestLogPipeline(unittest.TestCase):
+
+    def make_record(self, name, level=logging.DEBUG, message='mesaj'):
+        return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+    def test_size_rotation_gzips_old_segment(self):
+        """Boyut aşılınca dosya döndürülmeli ve eski parça gzip'lenmeli"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'app.log')
+            handler = RotatingGzipFileHandler(path, max_bytes=50, backup_count=2)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            try:
+                for index in range(3):
+                    handler.emit(self.make_record('app', logging.INFO, f'satir-{index}-' + 'x' * 30))
+            finally:
+                handler.close()
+
+            with gzip.open(path + '.1.gz', 'rt', encoding='utf-8') as f:
+                self.assertIn('satir-1', f.read())
+            self.assertTrue(os.path.exists(path + '.2.gz'))
+            with open(path, encoding='utf-8') as f:
+                self.assertIn('satir-2', f.read())
+
+    def test_time_rotation(self):
+        """interval dolunca boyuttan bağımsız döndürme yapılmalı"""
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = RotatingGzipFileHandler(os.path.join(tmp, 'app.log'), max_bytes=0, interval=60)
+            try:
+                record = self.make_record('app', logging.INFO)
+                self.assertFalse(handler.shouldRollover(record))
+                handler.rollover_at = 0
+                self.assertTrue(handler.shouldRollover(record))
+            finally:
+                handler.close()
+
+    def test_sampled_debug_records_reach_log_file(self):
+        """queued_file_handler örneklenen logger'ın DEBUG kayıtlarının her N'incisini dosyaya yazmalı"""
+        self.assertEqual(parse_sample_rates('ornek_surucu=10, bozuk, urllib3=x'), {'ornek_surucu': 10})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'app.log')
+            handler = queued_file_handler(path, logging.Formatter('%(name)s %(levelname)s %(message)s'),
+                                          logging.INFO, sample_rates={'ornek_surucu': 10})
+            app_logger = logging.getLogger('ornek_uygulama')
+            app_logger.setLevel(logging.DEBUG)
+            app_logger.addHandler(handler)
+            attach_sampled_loggers(handler, {'ornek_surucu': 10})
+            driver_logger = logging.getLogger('ornek_surucu.command')
+            try:
+                for index in range(30):
+                    driver_logger.debug('komut-%d', index)
+                driver_logger.warning('uyari')
+                app_logger.debug('uygulama-debug')
+                app_logger.info('uygulama-info')
+            finally:
+                app_logger.removeHandler(handler)
+                logging.getLogger('ornek_surucu').removeHandler(handler)
+                listener = next(l for l in log_pipeline._listeners if l.queue is handler.queue)
+                log_pipeline._listeners.remove(listener)
+                listener.stop()
+                for file_handler in listener.handlers:
+                    file_handler.close()
+
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual([line for line in lines if 'komut-' in line],
+                         ['ornek_surucu.command DEBUG komut-0', 'ornek_surucu.command DEBUG komut-10',
+                          'ornek_surucu.command DEBUG komut-20'])
+        self.assertIn('ornek_surucu.command WARNING uyari', lines)
+        self.assertIn('ornek_uygulama INFO uygulama-info', lines)
+        self.assertNotIn('ornek_uygulama DEBUG uygulama-debug', lines)
+
+    def test_importing_helpers_starts_no_listener_threads(self):
+        """utils.helpers içe aktarıldığında dinleyici iş parçacığı başlamamalı (gevent yaması kilitlenir)"""
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+        output = subprocess.run(
+            [sys.executable, '-c', 'import threading, utils.helpers; print(threading.active_count())'],
+            cwd=root, capture_output=True, text=True, timeout=60
+        )
+
+        self.assertEqual(output.stdout.strip().splitlines()[-1], '1', output.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
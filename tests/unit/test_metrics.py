@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config.mysql_db import MySQLConnectionPool
+from utils import metrics
+from utils.metrics import (
+    counter, gauge, histogram, render_prometheus, record_db_call,
+    start_request_db_stats, finish_request_db_stats
+)
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        # Her test boş bir kayıt defteriyle başlamalı
+        patcher = patch.object(metrics, '_registry', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_render_prometheus(self):
+        """Sayaç, gösterge ve histogramlar Prometheus metin biçiminde yazılmalı"""
+        counter('http_requests_total', 'İstekler', {'route': '/api/"x"', 'status': '200'}).inc(2)
+        gauge('http_requests_in_flight', 'İşlenen').inc()
+        histogram('latency_seconds', 'Gecikme', buckets=(0.1, 1.0)).observe(0.5)
+
+        text = render_prometheus()
+
+        self.assertIn('# TYPE http_requests_total counter', text)
+        self.assertIn('http_requests_total{route="/api/\\"x\\"",status="200"} 2', text)
+        self.assertIn('http_requests_in_flight 1', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 0', text)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn('latency_seconds_count 1', text)
+
+    def test_db_calls_counted_per_request(self):
+        """Gidiş-dönüşler yalnızca başlatılmış istek için sayılmalı"""
+        record_db_call('mongo', 0.01)
+        start_request_db_stats()
+        record_db_call('mongo', 0.01)
+        record_db_call('mongo', 0.02)
+        record_db_call('mysql', 0.005)
+
+        stats = finish_request_db_stats()
+
+        self.assertEqual(stats['mongo'][0], 2)
+        self.assertAlmostEqual(stats['mongo'][1], 0.03)
+        self.assertEqual(stats['mysql'][0], 1)
+        self.assertEqual(counter('db_calls_total', labels={'store': 'mongo'}).value, 3)
+        self.assertEqual(finish_request_db_stats(), {})
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_pooled_cursor_records_mysql_round_trips(self, mock_connect):
+        """Havuzdan alınan bağlantının cursor'u execute/executemany çağrılarını saymalı"""
+        mock_connect.return_value = MagicMock()
+        pool = MySQLConnectionPool({'host': 'localhost'}, pool_size=1, max_overflow=0)
+        conn = pool.get_connection()
+
+        start_request_db_stats()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT 1")
+        cursor.executemany("INSERT INTO t VALUES (%s)", [(1,), (2,)])
+        cursor.fetchall()
+        conn.close()
+
+        self.assertEqual(finish_request_db_stats()['mysql'][0], 2)
+        mock_connect.return_value.cursor.assert_called_once_with(dictionary=True)
+        mock_connect.return_value.cursor.return_value.fetchall.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+import sys
+import os
+import re
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from config.mock_mongo import MockDatabase
+
+class TestMockMongo(unittest.TestCase):
+
+    def setUp(self):
+        self.products = MockDatabase()['products']
+        for i in range(10):
+            self.products.insert_one({
+                'name': f"Ürün {i}",
+                'price': float(i * 10),
+                'supplier_id': i % 3,
+                'tags': ['tek'] if i % 2 else ['çift'],
+                'is_deleted': i == 9
+            })
+
+    def test_query_operators(self):
+        """Karşılaştırma, $in, $regex, $exists ve $or gerçekten filtrelemeli"""
+        names = lambda query: sorted(doc['name'] for doc in self.products.find(query))
+
+        self.assertEqual(len(names({'price': {'$gte': 20, '$lt': 50}})), 3)
+        self.assertEqual(names({'supplier_id': {'$in': [1]}, 'is_deleted': False}), ['Ürün 1', 'Ürün 4', 'Ürün 7'])
+        self.assertEqual(names({'name': {'$regex': 'ürün 9', '$options': 'i'}}), ['Ürün 9'])
+        self.assertEqual(names({'name': re.compile('^Ürün [01]$')}), ['Ürün 0', 'Ürün 1'])
+        self.assertEqual(names({'tags': 'tek', 'price': {'$gt': 60}}), ['Ürün 7', 'Ürün 9'])
+        self.assertEqual(names({'discount': {'$exists': True}}), [])
+        self.assertEqual(len(names({'$or': [{'price': 0.0}, {'is_deleted': True}]})), 2)
+        self.assertEqual(self.products.count_documents({'price': {'$lte': 30}}), 4)
+
+    def test_sort_skip_limit_and_projection(self):
+        """sort/skip/limit çağrı sırasından bağımsız uygulanmalı, projeksiyon alanları süzmeli"""
+        docs = list(self.products.find({}, {'name': 1, '_id': 0}).limit(3).skip(2).sort('price', -1))
+
+        self.assertEqual(docs, [{'name': 'Ürün 7'}, {'name': 'Ürün 6'}, {'name': 'Ürün 5'}])
+        first = self.products.find_one({'supplier_id': 2}, sort=[('price', 1)])
+        self.assertEqual(first['name'], 'Ürün 2')
+
+    def test_update_operators_and_upsert(self):
+        """$set/$inc/$push değişiklik yapmalı, $setOnInsert yalnızca upsert'te uygulanmalı"""
+        result = self.products.update_one(
+            {'name': 'Ürün 1'},
+            {'$set': {'stock': 5}, '$inc': {'price': 1.5}, '$push': {'tags': 'indirim'}, '$setOnInsert': {'new': True}}
+        )
+        doc = self.products.find_one({'name': 'Ürün 1'})
+
+        self.assertEqual((result.matched_count, result.modified_count), (1, 1))
+        self.assertEqual((doc['stock'], doc['price'], doc['tags']), (5, 11.5, ['tek', 'indirim']))
+        self.assertNotIn('new', doc)
+
+        carts = MockDatabase()['carts']
+        created = carts.find_one_and_update(
+            {'user_id': 7},
+            {'$setOnInsert': {'items': []}, '$inc': {'version': 1}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        self.assertEqual((created['user_id'], created['items'], created['version']), (7, [], 1))
+
+        updated = carts.find_one_and_update({'user_id': 7}, {'$inc': {'version': 1}})
+        self.assertEqual(updated['version'], 1)
+        self.assertEqual(carts.find_one({'user_id': 7})['version'], 2)
+
+    def test_text_search_matches_whole_words(self):
+        """$text sunucu gibi yalnızca tam kelimeleri, normalize edilmiş biçimde eşlemeli"""
+        products = MockDatabase()['products']
+        products.create_index([('name', 'text')])
+        products.insert_many([{'name': 'Akıllı Telefon'}, {'name': 'Telsiz Cihazı'}, {'name': 'Kalem'}])
+        names = lambda search: sorted(doc['name'] for doc in products.find({'$text': {'$search': search}}))
+
+        self.assertEqual(names('tel'), [])
+        self.assertEqual(names('TELEFON'), ['Akıllı Telefon'])
+        self.assertEqual(names('akilli cihazi'), ['Akıllı Telefon', 'Telsiz Cihazı'])
+
+    def test_returned_documents_are_copies(self):
+        """Dönen belgeyi değiştirmek saklanan belgeyi etkilememeli"""
+        doc = self.products.find_one({'name': 'Ürün 3'})
+        doc['price'] = -1
+
+        self.assertEqual(self.products.find_one({'_id': doc['_id']})['price'], 30.0)
+
+    def test_delete_and_bulk_write(self):
+        """delete_* yalnızca eşleşenleri silmeli, bulk_write UpdateOne upsert'ü uygulamalı"""
+        self.assertEqual(self.products.delete_many({'is_deleted': True}).deleted_count, 1)
+        self.assertEqual(self.products.delete_one({'name': 'yok'}).deleted_count, 0)
+        self.assertEqual(self.products.count_documents({}), 9)
+
+        result = self.products.bulk_write([
+            UpdateOne({'name': 'Ürün 0'}, {'$set': {'price': 1.0}}),
+            UpdateOne({'name': 'Ürün X'}, {'$set': {'price': 2.0}}, upsert=True)
+        ])
+        self.assertEqual((result.modified_count, result.upserted_count), (1, 1))
+        self.assertEqual(self.products.find_one({'name': 'Ürün X'})['price'], 2.0)
+
+    def test_aggregate_group(self):
+        """$match + $group + $sort toplamları doğru hesaplamalı"""
+        rows = list(self.products.aggregate([
+            {'$match': {'is_deleted': False}},
+            {'$group': {'_id': '$supplier_id', 'count': {'$sum': 1}, 'total': {'$sum': '$price'}}},
+            {'$sort': {'_id': 1}}
+        ]))
+
+        self.assertEqual(rows, [
+            {'_id': 0, 'count': 3, 'total': 90.0},
+            {'_id': 1, 'count': 3, 'total': 120.0},
+            {'_id': 2, 'count': 3, 'total': 150.0}
+        ])
+
+    def test_unique_partial_index(self):
+        """Unique indeks çakışmayı reddetmeli, partial filtre dışındaki belgeler serbest olmalı"""
+        carts = MockDatabase()['carts']
+        carts.create_index([('user_id', 1), ('items.product_id', 1)], unique=True,
+                           partialFilterExpression={'user_id': {'$exists': True}})
+        carts.insert_one({'user_id': 1, 'items': [{'product_id': 'a'}]})
+        carts.insert_one({'session_id': 's1'})
+        carts.insert_one({'session_id': 's2'})
+
+        with self.assertRaises(DuplicateKeyError):
+            carts.insert_one({'user_id': 1, 'items': [{'product_id': 'a'}]})
+        with self.assertRaises(DuplicateKeyError):
+            carts.insert_one({'_id': carts.find_one({'session_id': 's1'})['_id']})
+
+    def test_index_lookup_matches_full_scan(self):
+        """İndeksli eşitlik ve aralık sorguları tam taramayla aynı sonucu vermeli"""
+        expected_eq = [doc['_id'] for doc in self.products.find({'supplier_id': 1})]
+        expected_range = [doc['_id'] for doc in self.products.find({'price': {'$gt': 25, '$lte': 70}})]
+
+        self.products.create_index([('supplier_id', 1)])
+        self.products.create_index([('price', 1)])
+        self.products.update_one({'name': 'Ürün 0'}, {'$set': {'supplier_id': 5}})
+
+        self.assertEqual([doc['_id'] for doc in self.products.find({'supplier_id': 1})], expected_eq)
+        self.assertEqual([doc['_id'] for doc in self.products.find({'price': {'$gt': 25, '$lte': 70}})], expected_range)
+        self.assertEqual(self.products.find_one({'supplier_id': 5})['name'], 'Ürün 0')
+        self.assertEqual(self.products._candidate_keys({'supplier_id': 5}), [self.products.find_one({'supplier_id': 5})['_id']])
+        self.assertIsNone(self.products.find_one({'_id': ObjectId()}))
+
+    def test_database_attribute_access(self):
+        """db.products ve db['products'] aynı koleksiyonu döndürmeli"""
+        db = MockDatabase()
+
+        self.assertIs(db.products, db['products'])
+        self.assertFalse(hasattr(db, 'list_collection_names'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import sys
+import os
+import gc
+import threading
+from unittest.mock import patch, MagicMock
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config.mysql_db import MySQLConnectionPool, PoolTimeoutError, get_mysql_connection
+from models.user import User
+
+class TestMySQLConnectionPool(unittest.TestCase):
+
+    def make_pool(self, **kwargs):
+        return MySQLConnectionPool({'host': 'localhost'}, **kwargs)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_close_returns_connection_to_pool(self, mock_connect):
+        """close() bağlantıyı kapatmamalı, havuza geri vermeli"""
+        mock_connect.return_value = MagicMock()
+        pool = self.make_pool(pool_size=2, max_overflow=0)
+
+        conn = pool.get_connection()
+        conn.close()
+        conn_again = pool.get_connection()
+
+        self.assertIs(conn, conn_again)
+        mock_connect.assert_called_once()
+        mock_connect.return_value.close.assert_not_called()
+        stats = pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['in_use'], 1)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_double_close_is_ignored(self, mock_connect):
+        """Aynı bağlantı iki kez kapatıldığında havuz bozulmamalı"""
+        mock_connect.side_effect = lambda **kwargs: MagicMock()
+        pool = self.make_pool(pool_size=2, max_overflow=0)
+
+        conn = pool.get_connection()
+        conn.close()
+        conn.close()
+
+        self.assertEqual(pool.stats()['idle'], 1)
+        self.assertEqual(pool.stats()['in_use'], 0)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_overflow_connections_are_closed_on_release(self, mock_connect):
+        """pool_size üzerindeki bağlantılar geri verilince kapatılmalı"""
+        mock_connect.side_effect = lambda **kwargs: MagicMock()
+        pool = self.make_pool(pool_size=1, max_overflow=1)
+
+        first = pool.get_connection()
+        second = pool.get_connection()
+        first.close()
+        second.close()
+
+        stats = pool.stats()
+        self.assertEqual(stats['open'], 1)
+        self.assertEqual(stats['idle'], 1)
+        second._raw.close.assert_called_once()
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_checkout_timeout(self, mock_connect):
+        """Havuz dolduğunda belirtilen süre sonunda hata verilmeli"""
+        mock_connect.side_effect = lambda **kwargs: MagicMock()
+        pool = self.make_pool(pool_size=1, max_overflow=0, timeout=0.05)
+
+        held = pool.get_connection()
+        with self.assertRaises(PoolTimeoutError):
+            pool.get_connection()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_waiter_receives_released_connection(self, mock_connect):
+        """Bekleyen istek, başka bir bağlantı geri verildiğinde devam etmeli"""
+        mock_connect.side_effect = lambda **kwargs: MagicMock()
+        pool = self.make_pool(pool_size=1, max_overflow=0, timeout=2)
+
+        conn = pool.get_connection()
+        result = {}
+
+        def waiter():
+            result['conn'] = pool.get_connection()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        conn.close()
+        thread.join(2)
+
+        self.assertIs(result.get('conn'), conn)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_stale_connection_is_recycled(self, mock_connect):
+        """Ping başarısız olan bağlantı yenisiyle değiştirilmeli"""
+        mock_connect.side_effect = lambda **kwargs: MagicMock()
+        pool = self.make_pool(pool_size=1, max_overflow=0, pre_ping_interval=0)
+
+        conn = pool.get_connection()
+        conn.close()
+        conn._raw.ping.side_effect = Exception('MySQL server has gone away')
+
+        new_conn = pool.get_connection()
+
+        self.assertIsNot(new_conn, conn)
+        stats = pool.stats()
+        self.assertEqual(stats['recycled'], 1)
+        self.assertEqual(stats['created'], 2)
+        self.assertEqual(stats['open'], 1)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_failed_connect_releases_slot(self, mock_connect):
+        """Bağlantı kurulamazsa ayrılan yer serbest bırakılmalı"""
+        mock_connect.side_effect = Exception('Connection refused')
+        pool = self.make_pool(pool_size=1, max_overflow=0)
+
+        with self.assertRaises(Exception):
+            pool.get_connection()
+        self.assertEqual(pool.stats()['open'], 0)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_failed_query_returns_connection(self, mock_connect):
+        """Sorgusu hata veren model çağrısı bağlantıyı havuza geri vermeli"""
+        raw = MagicMock()
+        raw.cursor.return_value.execute.side_effect = Exception('Lost connection')
+        mock_connect.return_value = raw
+        pool = self.make_pool(pool_size=1, max_overflow=0, timeout=0.05)
+
+        with patch('models.user.get_mysql_connection', pool.get_connection):
+            with self.assertRaises(Exception):
+                User.find_by_email('user@example.com')
+            with self.assertRaises(Exception):
+                User.find_by_email('user@example.com')
+
+        stats = pool.stats()
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['timeouts'], 0)
+        # Bağlantı çöp toplamaya kalmadan finally içinde geri verilmeli
+        self.assertEqual(stats['leaked'], 0)
+
+    @patch('config.mysql_db.mysql.connector.connect')
+    def test_unclosed_connection_is_reclaimed(self, mock_connect):
+        """close() çağrılmadan bırakılan bağlantının yeri çöp toplamada geri alınmalı"""
+        mock_connect.side_effect = lambda **kwargs: MagicMock()
+        pool = self.make_pool(pool_size=1, max_overflow=0, timeout=0.05)
+
+        conn = pool.get_connection()
+        raw = conn._raw
+        del conn
+        gc.collect()
+
+        stats = pool.stats()
+        self.assertEqual((stats['in_use'], stats['open'], stats['leaked']), (0, 0, 1))
+        raw.close.assert_called_once()
+        pool.get_connection()
+
+    @patch('config.mysql_db.get_pool')
+    def test_pool_timeout_propagates(self, mock_get_pool):
+        """Havuz zaman aşımı None'a çevrilmemeli, çağırana iletilmeli"""
+        mock_get_pool.return_value.get_connection.side_effect = PoolTimeoutError('dolu')
+
+        with self.assertRaises(PoolTimeoutError):
+            get_mysql_connection()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from models.order import Order
+
+class TestOrderModel(unittest.TestCase):
+
+    def make_items(self, count):
+        return [
+            {'id': str(i), 'product_id': f'product{i}', 'quantity': 1, 'price': 10.0}
+            for i in range(count)
+        ]
+
+    @patch('models.order.get_mysql_connection')
+    def test_create_with_items_single_transaction(self, mock_get_conn):
+        """Sipariş ve öğeleri tek bağlantı, tek executemany ve tek commit ile yazılmalı"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.lastrowid = 42
+
+        order_id = Order.create_with_items(1, 300.0, 'Adres', self.make_items(30))
+
+        self.assertEqual(order_id, 42)
+        mock_get_conn.assert_called_once()
+        mock_cursor.execute.assert_called_once()
+        mock_cursor.executemany.assert_called_once()
+        rows = mock_cursor.executemany.call_args[0][1]
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(rows[0], (42, 'product0', 1, 10.0))
+        mock_conn.commit.assert_called_once()
+        mock_conn.rollback.assert_not_called()
+        mock_conn.close.assert_called_once()
+
+    @patch('models.order.get_mysql_connection')
+    def test_create_with_items_rolls_back_on_failure(self, mock_get_conn):
+        """Öğe ekleme başarısız olursa sipariş geri alınmalı"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.executemany.side_effect = Exception('bağlantı koptu')
+
+        with self.assertRaises(Exception):
+            Order.create_with_items(1, 20.0, 'Adres', self.make_items(2))
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_called_once()
+
+    @patch('models.order.get_mysql_connection')
+    def test_get_with_items_uses_one_connection(self, mock_get_conn):
+        """Sipariş başlığı ve öğeleri aynı bağlantıdan okunmalı"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = {'id': 7, 'user_id': 1}
+        mock_cursor.fetchall.return_value = [{'id': 1, 'product_id': 'p1'}]
+
+        order, items = Order.get_with_items(7, 1)
+
+        self.assertEqual(order['id'], 7)
+        self.assertEqual(len(items), 1)
+        mock_get_conn.assert_called_once()
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        self.assertEqual(mock_cursor.execute.call_args_list[0][0][1], (7, 1))
+
+    @patch('models.order.get_mysql_connection')
+    def test_get_with_items_other_user(self, mock_get_conn):
+        """Başka kullanıcının siparişi için öğeler sorgulanmamalı"""
+        mock_cursor = mock_get_conn.return_value.cursor.return_value
+        mock_cursor.fetchone.return_value = None
+
+        order, items = Order.get_with_items(7, 2)
+
+        self.assertIsNone(order)
+        self.assertEqual(items, [])
+        mock_cursor.execute.assert_called_once()
+
+    @patch('models.order.get_mysql_connection')
+    def test_get_by_user_keyset_query(self, mock_get_conn):
+        """Sipariş geçmişi seçili kolonlarla ve (created_at, id) üzerinden sayfalanmalı"""
+        mock_cursor = mock_get_conn.return_value.cursor.return_value
+        mock_cursor.fetchall.return_value = []
+        last_created_at = datetime(2025, 1, 1)
+
+        Order.get_by_user(1, limit=21, after=(last_created_at, 99), fields=['total_amount', 'status'])
+
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('SELECT id, total_amount, status, created_at FROM orders', query)
+        self.assertIn('(created_at < %s OR (created_at = %s AND id < %s))', query)
+        self.assertIn('ORDER BY created_at DESC, id DESC LIMIT %s', query)
+        self.assertEqual(params, (1, last_created_at, last_created_at, 99, 21))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.helpers import hash_password, check_password, bcrypt_cost, password_needs_rehash
+from utils.metrics import Histogram
+from utils.password_hasher import PasswordHasher, PasswordHasherBusy, calibrate_bcrypt_cost
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def setUp(self):
+        self.hasher = PasswordHasher(workers=1, max_queue=0, timeout=5)
+
+    def tearDown(self):
+        self.hasher.shutdown()
+
+    def test_runs_bcrypt_in_pool(self):
+        """Doğrulama havuzda çalışmalı ve süre histogramına yazılmalı"""
+        hashed = hash_password('password123')
+        before = self.hasher.hash_time.snapshot()['count']
+
+        self.assertTrue(self.hasher.run(check_password, 'password123', hashed))
+        self.assertEqual(self.hasher.hash_time.snapshot()['count'], before + 1)
+        self.assertEqual(self.hasher.stats()['in_flight'], 0)
+
+    def test_rejects_when_full(self):
+        """İşçi ve kuyruk doluyken yeni iş beklemeden reddedilmeli"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return True
+
+        worker = threading.Thread(target=self.hasher.run, args=(blocking,))
+        worker.start()
+        started.wait(5)
+
+        with self.assertRaises(PasswordHasherBusy):
+            self.hasher.run(lambda: True)
+        self.assertEqual(self.hasher.stats()['rejected'], 1)
+
+        release.set()
+        worker.join(5)
+        self.assertTrue(self.hasher.run(lambda: True))
+
+    def test_timeout_raises_busy(self):
+        """Sonuç timeout içinde gelmezse PasswordHasherBusy fırlatılmalı"""
+        release = threading.Event()
+        hasher = PasswordHasher(workers=1, max_queue=0, timeout=0.05)
+        try:
+            with self.assertRaises(PasswordHasherBusy):
+                hasher.run(release.wait, 5)
+            self.assertEqual(hasher.stats()['timeouts'], 1)
+        finally:
+            release.set()
+            hasher.shutdown()
+
+class TestBcryptCost(unittest.TestCase):
+
+    def test_needs_rehash_when_cost_differs(self):
+        """Hedef maliyetten farklı hash yeniden hashlenmeli, bcrypt dışı hash'e dokunulmamalı"""
+        stored = hash_password('password123', rounds=4)
+
+        self.assertEqual(bcrypt_cost(stored), 4)
+        with patch('utils.helpers._bcrypt_rounds', 4):
+            self.assertFalse(password_needs_rehash(stored))
+        with patch('utils.helpers._bcrypt_rounds', 5):
+            self.assertTrue(password_needs_rehash(stored))
+            self.assertFalse(password_needs_rehash('hashedpassword'))
+
+    @patch('utils.password_hasher.benchmark_bcrypt')
+    def test_calibrate_picks_highest_cost_within_budget(self, mock_benchmark):
+        """Bütçeye sığan en yüksek maliyet seçilmeli, aşılınca ölçüm durmalı"""
+        timings = {10: 60.0, 11: 120.0, 12: 240.0, 13: 480.0}
+        mock_benchmark.side_effect = lambda costs, samples: [(c, timings[c]) for c in costs]
+
+        self.assertEqual(calibrate_bcrypt_cost(250, min_cost=10, max_cost=16), 12)
+        self.assertEqual(mock_benchmark.call_count, 4)
+        self.assertEqual(calibrate_bcrypt_cost(10, min_cost=10, max_cost=16), 10)
+
+class TestHistogram(unittest.TestCase):
+
+    def test_percentiles_from_buckets(self):
+        """Yüzdelikler kova üst sınırlarından tahmin edilmeli"""
+        histogram = Histogram('test', buckets=(0.1, 0.5, 1.0))
+        for value in [0.05] * 90 + [0.4] * 9 + [3.0]:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 100)
+        self.assertEqual(snapshot['buckets']['0.5'], 99)
+        self.assertEqual(snapshot['p50'], 0.1)
+        self.assertEqual(snapshot['p95'], 0.5)
+        self.assertEqual(snapshot['p99'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,8 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from models.product import Product
+from utils.cache import TTLCache
+from bson import ObjectId
 
 class TestProductModel(unittest.TestCase):
     
@@ -142,5 +144,79 @@ class TestProductModel(unittest.TestCase):
         mock_cursor.execute.assert_called_once()
         self.assertTrue(result)
 
+    @patch('models.product.get_db')
+    def test_get_many_fetches_misses_in_one_query(self, mock_get_db):
+        """Önbellekteki ürünler bellekten, eksikler tek $in sorgusuyla gelmeli"""
+        cached_id, fetched_id, missing_id = ObjectId(), ObjectId(), ObjectId()
+        collection = mock_get_db.return_value.products
+        collection.find.return_value = [{'_id': fetched_id, 'name': 'Yeni'}]
+        
+        with patch('models.product.product_cache', TTLCache(max_entries=100, ttl=60)) as cache:
+            cache.set(str(cached_id), {'_id': str(cached_id), 'name': 'Önbellekte'})
+            
+            result = Product.get_many([cached_id, fetched_id, missing_id, 'gecersiz'])
+            
+            self.assertEqual(set(result), {str(cached_id), str(fetched_id)})
+            collection.find.assert_called_once()
+            query = collection.find.call_args[0][0]
+            self.assertEqual(query['_id'], {'$in': [fetched_id, missing_id]})
+            
+            # Bulunan ve bulunamayan ID'ler ikinci çağrıda veritabanına gitmemeli
+            result[str(fetched_id)]['name'] = 'Değiştirildi'
+            again = Product.get_many([fetched_id, missing_id, 'gecersiz'])
+            collection.find.assert_called_once()
+            self.assertEqual(again[str(fetched_id)]['name'], 'Yeni')
+            self.assertNotIn(str(missing_id), again)
+    
+    @patch('models.product.get_db')
+    def test_update_evicts_cached_product(self, mock_get_db):
+        """Product.update önbellekteki ürünü çıkarmalı"""
+        product_id = str(ObjectId())
+        
+        with patch('models.product.product_cache', TTLCache(max_entries=100, ttl=60)) as cache:
+            cache.set(product_id, {'_id': product_id, 'name': 'Eski'})
+            
+            Product.update(product_id, {'name': 'Yeni'})
+            
+            self.assertIsNone(cache.get(product_id))
+
+    @patch('models.product.get_db')
+    def test_get_summaries_projects_and_caches_deleted(self, mock_get_db):
+        """Özetler name/image projeksiyonuyla tek sorguda gelmeli, silinmiş ürünler de önbelleğe alınmalı"""
+        live_id, deleted_id = ObjectId(), ObjectId()
+        collection = mock_get_db.return_value.products
+        collection.find.return_value = [
+            {'_id': live_id, 'name': 'Kalem'},
+            {'_id': deleted_id, 'name': 'Eski', 'is_deleted': True}
+        ]
+        
+        with patch('models.product.product_cache', TTLCache(max_entries=100, ttl=60)):
+            result = Product.get_summaries([str(live_id), str(deleted_id), str(live_id)])
+            again = Product.get_summaries([str(deleted_id)])
+        
+        collection.find.assert_called_once()
+        query, projection = collection.find.call_args[0]
+        self.assertEqual(query, {'_id': {'$in': [live_id, deleted_id]}})
+        self.assertEqual(projection, {'name': 1, 'image': 1, 'is_deleted': 1})
+        self.assertEqual(result[str(live_id)], {'name': 'Kalem', 'image': None})
+        self.assertIsNone(result[str(deleted_id)])
+        self.assertIsNone(again[str(deleted_id)])
+
+    @patch('models.product.get_db')
+    def test_backfill_created_at_uses_object_id_time(self, mock_get_db):
+        """created_at'i olmayan ürünlere ObjectId zamanı yazılmalı, ObjectId olmayanlar atlanmalı"""
+        product_id = ObjectId()
+        collection = mock_get_db.return_value.products
+        collection.find.return_value = [{'_id': product_id}, {'_id': 'product1'}]
+        collection.bulk_write.return_value.modified_count = 1
+        
+        updated = Product.backfill_created_at()
+        
+        self.assertEqual(updated, 1)
+        self.assertEqual(collection.find.call_args[0][0], {'created_at': {'$not': {'$type': 'date'}}})
+        operations = collection.bulk_write.call_args[0][0]
+        self.assertEqual(len(operations), 1)
+        self.assertEqual(operations[0]._doc, {'$set': {'created_at': product_id.generation_time}})
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import tempfile
+from flask import Flask, jsonify
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.profiler import collapsed_stacks, init_profiler, stats_text
+
+def slow_part():
+    return sum(i * i for i in range(2000))
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.app = Flask(__name__)
+        self.app.secret_key = 'test'
+        self.app.config.update(
+            PROFILING_ENABLED=True,
+            PROFILING_TOKEN='gizli',
+            PROFILING_DIR=self.tmp.name,
+            PROFILING_MAX_PROFILES=2
+        )
+        self.store = init_profiler(self.app)
+
+        @self.app.route('/api/cart/add', methods=['POST'])
+        def add_to_cart():
+            return jsonify({'total': slow_part()})
+
+        self.client = self.app.test_client()
+
+    def test_profiles_only_with_valid_header(self):
+        """Yalnızca doğru token'lı başlık profil üretmeli"""
+        self.assertNotIn('X-Profile-Id', self.client.post('/api/cart/add').headers)
+        self.assertNotIn('X-Profile-Id', self.client.post('/api/cart/add', headers={'X-Profile': 'yanlis'}).headers)
+
+        response = self.client.post('/api/cart/add', headers={'X-Profile': 'gizli'})
+
+        profile_id = response.headers['X-Profile-Id']
+        info = self.store.list()[0]
+        self.assertEqual(info['id'], profile_id)
+        self.assertEqual(info['route'], '/api/cart/add')
+        self.assertEqual(info['status'], 200)
+
+        path = self.store.path(profile_id)
+        self.assertIn('slow_part', stats_text(path))
+        stacks = collapsed_stacks(path)
+        self.assertTrue(any('add_to_cart' in line and 'slow_part' in line for line in stacks.splitlines()))
+
+    def test_ring_keeps_latest_profiles(self):
+        """Sınır aşılınca en eski profiller silinmeli"""
+        ids = [
+            self.client.post('/api/cart/add', headers={'X-Profile': 'gizli'}).headers['X-Profile-Id']
+            for _ in range(3)
+        ]
+
+        self.assertEqual([info['id'] for info in self.store.list()], ids[:0:-1])
+        self.assertIsNone(self.store.path(ids[0]))
+        self.assertIsNone(self.store.path('../app'))
+
+    def test_disabled_adds_no_hooks(self):
+        """Kapalıyken istek kancası eklenmemeli"""
+        app = Flask(__name__)
+        self.assertIsNone(init_profiler(app))
+        self.assertEqual(app.before_request_funcs, {})
+
+if __name__ == '__main__':
+    unittest.main()
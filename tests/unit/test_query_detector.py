@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+from flask import Flask, jsonify
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config.mongodb_db import MockDatabase
+from utils.query_detector import (
+    QueryBudgetExceeded, fingerprint_mongo, fingerprint_sql, init_query_detector,
+    query_budget, record_sql, track_queries
+)
+
+class TestQueryDetector(unittest.TestCase):
+
+    def test_mongo_fingerprint_ignores_values(self):
+        """Değerler ve $in listesinin uzunluğu parmak izini değiştirmemeli"""
+        first = fingerprint_mongo('find', {'find': 'products', 'filter': {'_id': {'$in': [1, 2, 3]}, 'is_deleted': False}})
+        second = fingerprint_mongo('find', {'find': 'products', 'filter': {'is_deleted': True, '_id': {'$in': [9]}}})
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, 'products find {_id: {$in: [?]}, is_deleted: ?}')
+        self.assertEqual(
+            fingerprint_mongo('update', {'update': 'carts', 'updates': [{'q': {'user_id': 1}}]}),
+            'carts update {user_id: ?}'
+        )
+
+    def test_sql_fingerprint_normalizes_literals_and_lists(self):
+        """Sabitler ve IN/VALUES listeleri tek biçime indirgenmeli"""
+        self.assertEqual(
+            fingerprint_sql("SELECT * FROM orders  WHERE user_id = 5 AND status = 'new'"),
+            'SELECT * FROM orders WHERE user_id = ? AND status = ?'
+        )
+        self.assertEqual(
+            fingerprint_sql('SELECT * FROM products WHERE id IN (%s, %s, %s)'),
+            'SELECT * FROM products WHERE id IN (...)'
+        )
+        self.assertEqual(
+            fingerprint_sql('INSERT INTO order_items VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO order_items VALUES (...)'
+        )
+
+    def test_query_budget_catches_n_plus_one(self):
+        """Döngü içindeki tekil sorgular tekrar bütçesini aşmalı"""
+        products = MockDatabase()['products']
+
+        with self.assertRaises(QueryBudgetExceeded) as context:
+            with query_budget(max_repeats=2):
+                for product_id in range(5):
+                    products.find_one({'_id': product_id})
+
+        self.assertIn('products find {_id: ?} x5', str(context.exception))
+
+        with query_budget(max_queries=1) as log:
+            products.find({'_id': {'$in': list(range(5))}})
+        self.assertEqual(log.count('mongo'), 1)
+
+    def test_queries_recorded_only_while_tracking(self):
+        """Etkin kayıt yokken sorgular tutulmamalı"""
+        record_sql('SELECT 1')
+        with track_queries() as log:
+            record_sql('SELECT 1')
+        record_sql('SELECT 1')
+
+        self.assertEqual(log.entries, [('mysql', 'SELECT ?')])
+
+    def test_detector_logs_repeated_shapes(self):
+        """Eşiği aşan tekrarlar rota ve parmak iziyle uyarı olarak loglanmalı"""
+        app = Flask(__name__)
+        app.config.update(QUERY_DETECTOR_ENABLED=True, QUERY_REPEAT_THRESHOLD=3)
+        init_query_detector(app)
+        carts = MockDatabase()['carts']
+
+        @app.route('/cart/<int:user_id>')
+        def cart(user_id):
+            for item_id in range(4):
+                carts.find_one({'_id': item_id})
+            return jsonify({})
+
+        with self.assertLogs(app.logger, level='WARNING') as logs:
+            app.test_client().get('/cart/1')
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('GET /cart/<int:user_id>', logs.output[0])
+        self.assertIn('carts find {_id: ?}', logs.output[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch
+from werkzeug.datastructures import MultiDict
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.cache import TTLCache, make_cache_key
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        """Kapasite aşıldığında en uzun süredir kullanılmayan anahtar atılmalı"""
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        """Süresi dolan kayıt ıska sayılmalı ve yeniden hesaplanmalı"""
+        cache = TTLCache(ttl=10)
+        with patch('utils.cache.time.monotonic', return_value=100):
+            self.assertEqual(cache.get_or_compute('k', lambda: 'eski'), 'eski')
+        with patch('utils.cache.time.monotonic', return_value=111):
+            self.assertEqual(cache.get_or_compute('k', lambda: 'yeni'), 'yeni')
+
+        stats = cache.stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 0)
+
+    def test_single_flight(self):
+        """Eşzamanlı ıskalar tek bir hesaplamayı paylaşmalı"""
+        cache = TTLCache(ttl=60)
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return 'değer'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        # Tüm iş parçacıklarının lideri beklemeye başlaması için kısa süre tanı
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['değer'] * 10)
+        self.assertEqual(cache.stats()['coalesced'], 9)
+
+    def test_invalidate_during_compute_is_not_stored(self):
+        """Hesaplama sırasında yapılan invalidate eski değerin saklanmasını engellemeli"""
+        cache = TTLCache(ttl=60)
+
+        def compute():
+            cache.invalidate('products:')
+            return 'eski'
+
+        self.assertEqual(cache.get_or_compute('products:list?', compute), 'eski')
+        self.assertIsNone(cache.get('products:list?'))
+
+    def test_should_cache_filters_values(self):
+        cache = TTLCache(ttl=60)
+        cache.get_or_compute('k', lambda: (b'{}', 500), should_cache=lambda v: v[1] == 200)
+        self.assertIsNone(cache.get('k'))
+
+    def test_cache_key_is_normalized(self):
+        """Parametre sırası ve boş değerler anahtarı değiştirmemeli"""
+        first = make_cache_key('products:list', MultiDict([('page', '1'), ('search', ''), ('min_price', '10')]))
+        second = make_cache_key('products:list', MultiDict([('min_price', ' 10 '), ('page', '1')]))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, make_cache_key('products:list', MultiDict([('page', '2')])))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config.mock_mongo import MockDatabase
+from utils.seed_data import (
+    generate_cart_lines, generate_products, insert_rows, seed_database, write_manifest
+)
+
+class FakeCursor:
+    """Çalıştırılan ifadeleri kaydeden, MAX(id) için 0 döndüren cursor"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+
+    def fetchone(self):
+        return (0,)
+
+    def close(self):
+        pass
+
+class TestSeedData(unittest.TestCase):
+
+    def setUp(self):
+        self.cursor = FakeCursor()
+        self.conn = MagicMock()
+        self.conn.cursor.return_value = self.cursor
+
+    def seed(self, db, seed=7):
+        with patch('utils.helpers.hash_password', return_value='hash'):
+            return seed_database(db, self.conn, products=200, users=50, carts=300, orders=40,
+                                 seed=seed, batch_size=64, sample_size=10, log=lambda message: None)
+
+    def test_seed_loads_requested_volumes(self):
+        """İstenen hacimler yüklenmeli, manifest ID örneklerini içermeli"""
+        db = MockDatabase()
+        manifest = self.seed(db)
+
+        self.assertEqual(db.products.count_documents({}), 200)
+        self.assertEqual(db.carts.count_documents({}), 300)
+        self.assertEqual(manifest['counts']['users'], 50)
+        self.assertEqual(manifest['counts']['orders'], 40)
+        self.assertEqual(len(manifest['product_ids']), 10)
+        self.assertTrue(all(db.products.find_one({'_id': product['_id']})
+                            for product in db.products.find({}, {'_id': 1}).limit(5)))
+
+    def test_seed_is_reproducible(self):
+        """Aynı seed aynı ID'leri, farklı seed farklı ID'leri üretmeli"""
+        first = self.seed(MockDatabase())
+        second = self.seed(MockDatabase())
+        other = self.seed(MockDatabase(), seed=8)
+
+        self.assertEqual(first['product_ids'], second['product_ids'])
+        self.assertEqual(first['users'], second['users'])
+        self.assertNotEqual(first['product_ids'], other['product_ids'])
+
+    def test_open_cart_lines_are_unique(self):
+        """Bir kullanıcının açık sepetinde aynı ürün iki kez bulunmamalı"""
+        products = list(generate_products(100, [1], seed=3))
+        product_ids = [str(product['_id']) for product in products]
+        prices = [product['price'] for product in products]
+        lines = list(generate_cart_lines(2000, list(range(1, 30)), product_ids, prices, seed=3))
+
+        open_keys = [(line['user_id'], line['product_id']) for line in lines if not line['is_checked_out']]
+        self.assertEqual(len(lines), 2000)
+        self.assertEqual(len(open_keys), len(set(open_keys)))
+        self.assertTrue(all(price >= 1.0 for price in prices))
+
+    def test_insert_rows_uses_single_multi_row_statement(self):
+        """Satırlar tek bir çok satırlı INSERT ile gönderilmeli"""
+        count = insert_rows(self.cursor, 'orders', ('id', 'user_id'), [(1, 10), (2, 11), (3, 12)])
+
+        query, params = self.cursor.statements[0]
+        self.assertEqual(count, 3)
+        self.assertEqual(query, 'INSERT INTO orders (id, user_id) VALUES (%s, %s), (%s, %s), (%s, %s)')
+        self.assertEqual(params, [1, 10, 2, 11, 3, 12])
+
+    def test_write_manifest(self):
+        """Manifest JSON olarak yazılmalı"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_manifest({'seed': 1, 'product_ids': ['a']}, os.path.join(directory, 'manifest.json'))
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['product_ids'], ['a'])
+
+if __name__ == '__main__':
+    unittest.main()
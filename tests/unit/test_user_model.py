@@ -7,7 +7,7 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from models.user import User
-from utils.helpers import hash_password
+from utils.helpers import hash_password, bcrypt_cost
 
 class TestUserModel(unittest.TestCase):
     
@@ -136,6 +136,28 @@ class TestUserModel(unittest.TestCase):
         mock_check_password.assert_called_once_with('wrongpassword', 'hashedpassword')
         self.assertIsNone(result)
     
+    @patch('models.user.get_mysql_connection')
+    @patch('models.user.User.update_last_login')
+    def test_verify_password_rehashes_old_cost(self, mock_update_login, mock_get_conn):
+        # Hedef maliyetten farklı maliyetle saklanmış şifre
+        mock_cursor = mock_get_conn.return_value.cursor.return_value
+        stored = hash_password('password123', rounds=4)
+        
+        with patch('models.user.User.find_by_email') as mock_find, \
+                patch('utils.helpers._bcrypt_rounds', 5):
+            mock_find.return_value = {'id': 1, 'email': 'test@example.com', 'password': stored}
+            
+            # Test et
+            result = User.verify_password('test@example.com', 'password123')
+        
+        # Assert: şifre hedef maliyetle yeniden hashlenip kaydedilmeli
+        self.assertIsNotNone(result)
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('UPDATE users SET password = %s WHERE id = %s', query)
+        self.assertEqual(bcrypt_cost(params[0]), 5)
+        self.assertEqual(params[1], 1)
+        mock_get_conn.return_value.commit.assert_called_once()
+    
     @patch('models.user.get_mysql_connection')
     @patch('models.user.generate_reset_token')
     def test_create_reset_token(self, mock_generate_token, mock_get_conn):
@@ -1,5 +1,6 @@
 from .helpers import generate_token, send_email
+from .email_outbox import queue_email
 
-__all__ = ['generate_token', 'send_email']
+__all__ = ['generate_token', 'send_email', 'queue_email']
 
-# Bu dosya, Python paket olarak işaretlemek için boş bırakılmıştır 
\ No newline at end of file
+# Bu dosya, Python paket olarak işaretlemek için boş bırakılmıştır 
@@ -0,0 +1,239 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request, make_response
+
+_MISSING = object()
+
+class _Flight:
+    """Aynı anahtar için devam eden tek hesaplama"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = _MISSING
+
+
+class TTLCache:
+    """TTL ve LRU tahliyeli, işlem içi (in-process) önbellek
+
+    Bir anahtar önbellekte yokken gelen eşzamanlı istekler tek bir hesaplamayı
+    bekler (single-flight); böylece soğuk önbellekte yük altında veritabanına
+    yüzlerce değil tek bir sorgu gider. Hesaplama sürerken invalidate() çağrılırsa
+    hesaplanan değer bekleyenlere verilir ama önbelleğe yazılmaz.
+    """
+
+    def __init__(self, max_entries=256, ttl=30, wait_timeout=10):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def configure(self, max_entries=None, ttl=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl is not None:
+                self.ttl = ttl
+            self._evict()
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def generation(self):
+        """Her invalidate/delete çağrısında artan sayaç"""
+        return self._generation
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items, ttl=None, generation=None):
+        """Birden fazla kaydı yaz
+
+        generation verilirse ve o andan beri bir invalidate/delete yapıldıysa hiçbir
+        şey yazılmaz; böylece okuma sırasında güncellenen bir kayıt önbelleğe eski
+        haliyle geri girmez.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            self._evict()
+            return True
+
+    def delete(self, *keys):
+        """Verilen anahtarları önbellekten çıkar"""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def get_or_compute(self, key, compute, should_cache=None):
+        """Önbellekteki değeri döndür; yoksa compute() ile tek seferde hesapla
+
+        Args:
+            key: Önbellek anahtarı
+            compute: Değeri üreten parametresiz fonksiyon
+            should_cache: Değerin saklanıp saklanmayacağına karar veren fonksiyon (ör. yalnızca 200 yanıtlar)
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                generation = self._generation
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # Lider hesaplamayı bitirene kadar bekle; lider hata verdiyse kendin hesapla
+            if flight.event.wait(self.wait_timeout) and flight.value is not _MISSING:
+                return flight.value
+            return compute()
+
+        try:
+            value = compute()
+            flight.value = value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if (flight.value is not _MISSING and generation == self._generation
+                        and (should_cache is None or should_cache(flight.value))):
+                    self._entries[key] = (time.monotonic() + self.ttl, flight.value)
+                    self._entries.move_to_end(key)
+                    self._evict()
+            flight.event.set()
+
+        return value
+
+    def invalidate(self, prefix=None):
+        """Önbelleği (veya verilen önekle başlayan anahtarları) temizle"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if prefix is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+            }
+
+
+# Ürün listeleme ve öne çıkan ürün yanıtları için paylaşılan önbellek
+response_cache = TTLCache()
+
+# Product.get_by_id / get_many için ürün ID'si anahtarlı varlık önbelleği
+product_cache = TTLCache(max_entries=2048, ttl=60)
+
+PRODUCT_RESPONSES_PREFIX = 'products:'
+
+def make_cache_key(namespace, args):
+    """Sorgu parametrelerinden sıralamadan bağımsız bir anahtar üret
+
+    Boş değerli parametreler yok sayılır, böylece ?page=1&search= ile ?page=1
+    aynı anahtara düşer.
+    """
+    items = []
+    for name in sorted(args.keys()):
+        values = sorted(value.strip() for value in args.getlist(name) if value.strip())
+        for value in values:
+            items.append(f"{name}={value}")
+    return f"{namespace}?{'&'.join(items)}"
+
+def cached_response(namespace):
+    """Başarılı (200) JSON yanıtlarını response_cache içinde saklayan decorator"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_app.config.get('RESPONSE_CACHE_ENABLED', True):
+                return f(*args, **kwargs)
+
+            key = make_cache_key(namespace, request.args)
+            computed = []
+
+            def compute():
+                response = make_response(f(*args, **kwargs))
+                computed.append(True)
+                return (response.get_data(), response.status_code, response.content_type)
+
+            body, status, content_type = response_cache.get_or_compute(
+                key, compute, should_cache=lambda value: value[1] == 200
+            )
+            response = current_app.response_class(body, status=status, content_type=content_type)
+            response.headers['X-Cache'] = 'MISS' if computed else 'HIT'
+            return response
+        return decorated_function
+    return decorator
+
+def invalidate_product_responses():
+    """Ürün eklendiğinde, güncellendiğinde veya silindiğinde çağrılır"""
+    response_cache.invalidate(PRODUCT_RESPONSES_PREFIX)
+
+def init_caches(app):
+    """Önbellek boyutlarını ve TTL'lerini uygulama ayarlarından yükle"""
+    response_cache.configure(
+        max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 256),
+        ttl=app.config.get('RESPONSE_CACHE_TTL', 30)
+    )
+    product_cache.configure(
+        max_entries=app.config.get('PRODUCT_CACHE_MAX_ENTRIES', 2048),
+        ttl=app.config.get('PRODUCT_CACHE_TTL', 60)
+    )
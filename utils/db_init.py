@@ -1,5 +1,6 @@
 from config.mysql_db import get_mysql_connection, is_test_mode
 from config.mongodb_db import get_db
+from utils.db_migrations import apply_migrations
 import os
 
 def init_tables():
@@ -73,22 +74,23 @@ def init_tables():
         
         conn.commit()
         cursor.close()
+        
+        # MySQL indeks migration'ları
+        try:
+            apply_migrations(conn=conn)
+        except Exception as e:
+            print(f"MySQL migration hatası: {str(e)}")
         conn.close()
     
     # MongoDB toplamlarını başlat
     db = get_db()
     
-    # MongoDB toplamlarını başlat
+    # İndeksler ve veri dönüşümleri sürümlü migration'larla uygulanır
     if hasattr(db, 'list_collection_names'):
-        if 'products' not in db.list_collection_names():
-            db.create_collection('products')
-            db.products.create_index('supplier_id')
-            db.products.create_index('name')
-        
-        if 'carts' not in db.list_collection_names():
-            db.create_collection('carts')
-            db.carts.create_index('user_id')
-            db.carts.create_index('product_id')
+        try:
+            apply_migrations(db=db)
+        except Exception as e:
+            print(f"MongoDB migration hatası: {str(e)}")
     
     print("Veritabanı tabloları başarıyla başlatıldı!")
     return True 
\ No newline at end of file
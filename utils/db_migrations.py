@@ -0,0 +1,356 @@
+"""Veritabanı indeks manifestosu ve sürümlü migration'lar
+
+Deploy sırasında (init_tables içinden veya komut satırından) çalıştırılır:
+
+    python -m utils.db_migrations            # Eksik migration'ları uygula
+    python -m utils.db_migrations --check    # Sıcak sorguların planlarını doğrula
+
+Her migration yalnızca bir kez uygulanır ve ilgili veritabanındaki
+schema_migrations kaydına yazılır. İndeks oluşturma adımları idempotenttir,
+bu yüzden yarım kalan bir migration güvenle tekrar çalıştırılabilir.
+"""
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.mongodb_db import get_db
+from config.mysql_db import get_mysql_connection
+
+def merge_duplicate_cart_lines(collection):
+    """Aynı kullanıcı/ürün için birden fazla açık sepet satırını tek satırda birleştir
+
+    Tekil sepet indeksi oluşturulmadan önce çalıştırılır; miktarlar en eski satırda toplanır.
+    """
+    duplicates = collection.aggregate([
+        {'$match': {'is_checked_out': False}},
+        {'$sort': {'_id': 1}},
+        {'$group': {
+            '_id': {'user_id': '$user_id', 'product_id': '$product_id'},
+            'ids': {'$push': '$_id'},
+            'quantity': {'$sum': '$quantity'},
+            'count': {'$sum': 1}
+        }},
+        {'$match': {'count': {'$gt': 1}}}
+    ])
+    for group in duplicates:
+        keep_id, remove_ids = group['ids'][0], group['ids'][1:]
+        collection.update_one({'_id': keep_id}, {'$set': {'quantity': group['quantity']}})
+        collection.delete_many({'_id': {'$in': remove_ids}})
+
+
+# MongoDB indeks manifestosu: koleksiyon -> indeks tanımları
+# Sorgu biçimleri routes/ ve models/ içindeki sıcak sorgularla eşleşmelidir.
+# 'prepare' verilen indekslerde fonksiyon, indeks oluşturulmadan önce koleksiyonla çağrılır.
+MONGO_INDEXES = {
+    'products': [
+        {'keys': [('supplier_id', 1)], 'name': 'supplier_id_1'},
+        {'keys': [('name', 1)], 'name': 'name_1'},
+        # Listeleme: {is_deleted} + sort(created_at, _id)
+        {'keys': [('is_deleted', 1), ('created_at', -1), ('_id', -1)], 'name': 'is_deleted_1_created_at_-1__id_-1'},
+        # Önek araması: {is_deleted, name_search: /^.../}
+        {'keys': [('is_deleted', 1), ('name_search', 1)], 'name': 'is_deleted_1_name_search_1'},
+        # Tam metin araması
+        {
+            'keys': [('name_search', 'text'), ('description_search', 'text')],
+            'name': 'products_text_search',
+            'options': {
+                'weights': {'name_search': 10, 'description_search': 2},
+                'default_language': 'turkish'
+            }
+        }
+    ],
+    'carts': [
+        # Kullanıcının sepeti: {user_id, is_checked_out}
+        {'keys': [('user_id', 1), ('is_checked_out', 1)], 'name': 'user_id_1_is_checked_out_1'},
+        # Ürün silme kontrolü: {product_id, is_checked_out}
+        {'keys': [('product_id', 1), ('is_checked_out', 1)], 'name': 'product_id_1_is_checked_out_1'},
+        # Sepete ekleme upsert'ü: açık sepette kullanıcı başına ürün başına tek satır
+        {
+            'keys': [('user_id', 1), ('product_id', 1)],
+            'name': 'open_cart_line_unique',
+            'options': {
+                'unique': True,
+                'partialFilterExpression': {'is_checked_out': False}
+            },
+            'prepare': merge_duplicate_cart_lines
+        }
+    ],
+    'password_reset_tokens': [
+        # Token doğrulama: {token, expires: {$gt: now}}
+        {'keys': [('token', 1), ('expires', 1)], 'name': 'token_1_expires_1'}
+    ],
+    'email_outbox': [
+        # Kuyruk işçisi: {status, next_attempt_at <= now} sort(next_attempt_at)
+        {'keys': [('status', 1), ('next_attempt_at', 1)], 'name': 'status_1_next_attempt_at_1'}
+    ]
+}
+
+# MySQL indeks manifestosu: (tablo, indeks adı, kolonlar)
+MYSQL_INDEXES = [
+    # Sipariş geçmişi: WHERE user_id = ? [AND (created_at, id) < ?] ORDER BY created_at DESC, id DESC
+    ('orders', 'idx_orders_user_created_id', '(user_id, created_at DESC, id DESC)'),
+    # Şifre sıfırlama: WHERE reset_token = ?
+    ('users', 'idx_users_reset_token', '(reset_token)'),
+    # Sipariş detayı: WHERE order_id = ?
+    ('order_items', 'idx_order_items_order', '(order_id)')
+]
+
+
+def apply_mongo_indexes(db, manifest=None):
+    """Manifestodaki MongoDB indekslerini oluştur (var olanlar değişmez)"""
+    manifest = manifest or MONGO_INDEXES
+    for collection_name, indexes in manifest.items():
+        for index in indexes:
+            if index.get('prepare'):
+                index['prepare'](db[collection_name])
+            db[collection_name].create_index(
+                index['keys'],
+                name=index['name'],
+                **index.get('options', {})
+            )
+
+
+def mysql_index_exists(cursor, table, index_name):
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        """,
+        (table, index_name)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def apply_mysql_indexes(conn, manifest=None):
+    """Manifestodaki MySQL indekslerini, yoksa oluştur"""
+    manifest = manifest or MYSQL_INDEXES
+    cursor = conn.cursor()
+    try:
+        for table, index_name, columns in manifest:
+            if not mysql_index_exists(cursor, table, index_name):
+                cursor.execute(f"CREATE INDEX {index_name} ON {table} {columns}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def _backfill_product_search_fields(db):
+    from models.product import Product
+    backfilled = Product.backfill_search_fields()
+    if backfilled:
+        print(f"{backfilled} ürün için arama alanları oluşturuldu")
+
+
+def _backfill_product_created_at(db):
+    from models.product import Product
+    backfilled = Product.backfill_created_at()
+    if backfilled:
+        print(f"{backfilled} ürün için created_at oluşturuldu")
+
+
+def _apply_orders_keyset_index(conn):
+    """Sipariş geçmişi keyset indeksini oluştur, yerini aldığı eski indeksi kaldır"""
+    apply_mysql_indexes(conn)
+    cursor = conn.cursor()
+    try:
+        if mysql_index_exists(cursor, 'orders', 'idx_orders_user_created'):
+            cursor.execute("DROP INDEX idx_orders_user_created ON orders")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+# Sürümlü migration listesi: (sürüm, veritabanı, açıklama, fonksiyon)
+# Yeni adımlar her zaman listenin sonuna, artan sürüm numarasıyla eklenir.
+#
+# index_manifest_* adımları o sürümdeki değil, her zaman GÜNCEL manifestoyu
+# uygular. Boş bir veritabanında mysql v1 bu yüzden idx_orders_user_created
+# yerine doğrudan idx_orders_user_created_id'yi, mongo v1 de v3'ün tekil sepet
+# indeksini oluşturur. Sonraki manifesto sürümleri v1'i geçmiş bir veritabanına
+# yeni indeksleri getirir ve yerini aldıkları indeksleri kaldırır. Bu adımlar
+# idempotent olduğu için yeni kurulumda tekrar çalışmaları bir şey değiştirmez.
+MIGRATIONS = [
+    (1, 'mongo', 'index_manifest_v1', apply_mongo_indexes),
+    (2, 'mongo', 'backfill_product_search_fields', _backfill_product_search_fields),
+    (3, 'mongo', 'index_manifest_v3_open_cart_line_unique', apply_mongo_indexes),
+    (4, 'mongo', 'backfill_product_created_at', _backfill_product_created_at),
+    (1, 'mysql', 'index_manifest_v1', apply_mysql_indexes),
+    (2, 'mysql', 'orders_keyset_index', _apply_orders_keyset_index)
+]
+
+
+def _applied_mongo_versions(db):
+    return {doc['_id'] for doc in db['schema_migrations'].find({}, {'_id': 1})}
+
+
+def _applied_mysql_versions(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        cursor.execute("SELECT version FROM schema_migrations")
+        versions = {row[0] for row in cursor.fetchall()}
+        conn.commit()
+        return versions
+    finally:
+        cursor.close()
+
+
+def apply_migrations(db=None, conn=None):
+    """Uygulanmamış migration'ları sırayla çalıştır
+
+    db veya conn None ise o veritabanının migration'ları atlanır.
+
+    Returns:
+        list: Bu çağrıda uygulanan migration'ların (veritabanı, sürüm, ad) listesi
+    """
+    applied = []
+
+    if db is not None:
+        done = _applied_mongo_versions(db)
+        for version, store, name, migration in sorted(MIGRATIONS, key=lambda m: m[0]):
+            if store != 'mongo' or version in done:
+                continue
+            migration(db)
+            db['schema_migrations'].insert_one({
+                '_id': version,
+                'name': name,
+                'applied_at': datetime.now(timezone.utc)
+            })
+            applied.append((store, version, name))
+
+    if conn is not None:
+        done = _applied_mysql_versions(conn)
+        for version, store, name, migration in sorted(MIGRATIONS, key=lambda m: m[0]):
+            if store != 'mysql' or version in done:
+                continue
+            migration(conn)
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (version, name)
+                )
+                conn.commit()
+            finally:
+                cursor.close()
+            applied.append((store, version, name))
+
+    for store, version, name in applied:
+        print(f"Migration uygulandı: {store} v{version} ({name})")
+
+    return applied
+
+
+# Plan doğrulaması yapılan sıcak sorgular. Örnek değerler yalnızca planlama içindir.
+def _mongo_hot_queries(db):
+    now = datetime.now(timezone.utc)
+    return [
+        ('carts: kullanıcı sepeti',
+         db.carts.find({'user_id': 1, 'is_checked_out': False})),
+        ('carts: ürün sepette mi',
+         db.carts.find({'product_id': '000000000000000000000000', 'is_checked_out': False})),
+        ('products: listeleme',
+         db.products.find({'is_deleted': False}).sort([('created_at', -1), ('_id', -1)]).limit(12)),
+        ('products: önek araması',
+         db.products.find({'is_deleted': False, 'name_search': {'$regex': '^ornek'}})),
+        ('password_reset_tokens: token doğrulama',
+         db.password_reset_tokens.find({'token': 'ornek', 'expires': {'$gt': now}})),
+        ('email_outbox: kuyruk',
+         db.email_outbox.find({'status': 'pending', 'next_attempt_at': {'$lte': now}}).sort('next_attempt_at', 1))
+    ]
+
+
+MYSQL_HOT_QUERIES = [
+    ('orders: kullanıcı siparişleri',
+     "SELECT id FROM orders WHERE user_id = 1 ORDER BY created_at DESC, id DESC LIMIT 21"),
+    ('users: şifre sıfırlama token',
+     "SELECT id FROM users WHERE reset_token = 'ornek'"),
+    ('users: e-posta ile giriş',
+     "SELECT id FROM users WHERE email = 'ornek@example.com'"),
+    ('order_items: sipariş öğeleri',
+     "SELECT id FROM order_items WHERE order_id = 1")
+]
+
+
+def _plan_stages(plan):
+    """Bir explain() planındaki tüm aşama adlarını topla"""
+    stages = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.append(plan['stage'])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+def check_query_plans(db=None, conn=None):
+    """Sıcak sorguların koleksiyon/tablo taraması yapmadığını doğrula
+
+    Returns:
+        list: Başarısız sorguların (ad, açıklama) listesi; boşsa tüm planlar indeks kullanıyor
+    """
+    failures = []
+
+    if db is not None:
+        for name, cursor in _mongo_hot_queries(db):
+            explain = cursor.explain()
+            winning_plan = explain.get('queryPlanner', {}).get('winningPlan', {})
+            if 'COLLSCAN' in _plan_stages(winning_plan):
+                failures.append((name, 'COLLSCAN'))
+
+    if conn is not None:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for name, query in MYSQL_HOT_QUERIES:
+                cursor.execute(f"EXPLAIN {query}")
+                for row in cursor.fetchall():
+                    # type=ALL tam tablo taraması demektir
+                    if row.get('type') == 'ALL':
+                        failures.append((name, f"tam tablo taraması ({row.get('table')})"))
+        finally:
+            cursor.close()
+
+    return failures
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Veritabanı migration ve indeks aracı')
+    parser.add_argument('--check', action='store_true', help='Sıcak sorguların planlarını doğrula')
+    args = parser.parse_args(argv)
+
+    db = get_db()
+    if not hasattr(db, 'list_collection_names'):
+        db = None
+    conn = get_mysql_connection()
+
+    try:
+        apply_migrations(db, conn)
+
+        if args.check:
+            failures = check_query_plans(db, conn)
+            for name, reason in failures:
+                print(f"❌ {name}: {reason}")
+            if failures:
+                return 1
+            print("✅ Tüm sıcak sorgular indeks kullanıyor")
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
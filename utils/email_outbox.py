@@ -0,0 +1,302 @@
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from config.mongodb_db import get_db
+from utils.helpers import (
+    email_logger, render_email_body, deliver_email, save_email_to_file, send_email
+)
+
+# E-posta kuyruğu durumları
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_DEAD = 'dead'
+
+OUTBOX_STATUSES = [STATUS_PENDING, STATUS_SENDING, STATUS_SENT, STATUS_DEAD]
+
+_outbox = None
+
+def get_outbox_collection():
+    db = get_db()
+    if db is not None:
+        return db['email_outbox']
+    return None
+
+def queue_email(subject, recipient, body, is_html=False, template=None, template_data=None, sender=None):
+    """E-postayı kalıcı kuyruğa ekle; SMTP gönderimi arka plan işçilerinde yapılır
+
+    send_email ile aynı parametreleri alır. Şablon istek içinde işlenir, böylece
+    işçilerin şablon verisini saklaması gerekmez.
+
+    Returns:
+        Kuyruğa eklenen mesajın ID'si; kuyruk kullanılamazsa senkron gönderimin sonucu
+    """
+    collection = get_outbox_collection()
+    if collection is None:
+        email_logger.error("E-posta kuyruğu kullanılamıyor, e-posta senkron gönderiliyor")
+        return send_email(subject, recipient, body, is_html, template, template_data, sender)
+
+    body, is_html = render_email_body(body, is_html, template, template_data)
+    now = datetime.now(timezone.utc)
+
+    try:
+        result = collection.insert_one({
+            'subject': subject,
+            'recipient': recipient,
+            'body': body,
+            'is_html': is_html,
+            'sender': sender,
+            'status': STATUS_PENDING,
+            'attempts': 0,
+            'last_error': None,
+            'created_at': now,
+            'next_attempt_at': now,
+            'locked_until': None,
+            'sent_at': None
+        })
+    except Exception as e:
+        email_logger.error(f"E-posta kuyruğa eklenemedi, senkron gönderiliyor: {str(e)}")
+        return send_email(subject, recipient, body, is_html, sender=sender)
+
+    email_logger.info(f"E-posta kuyruğa eklendi: {recipient} ({subject})")
+    if _outbox is not None:
+        _outbox.notify()
+    return str(result.inserted_id)
+
+
+class EmailOutbox:
+    """email_outbox koleksiyonunu boşaltan arka plan işçi havuzu
+
+    Her işçi bir mesajı find_one_and_update ile atomik olarak sahiplenir, bu yüzden
+    birden fazla işlem (ör. birden fazla gunicorn worker) aynı kuyruğu güvenle boşaltabilir.
+    Başarısız gönderimler üstel geri çekilmeyle tekrar denenir; max_attempts aşılırsa
+    mesaj 'dead' durumuna alınır ve içeriği sent_emails/messages altına kaydedilir.
+    """
+
+    def __init__(self, app, workers=2, poll_interval=5, max_attempts=5,
+                 backoff_base=30, backoff_max=3600, lease_seconds=300):
+        self.app = app
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"email-outbox-{index}")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Yeni mesaj geldiğinde bekleyen işçileri uyandır"""
+        self._wakeup.set()
+
+    def backoff(self, attempts):
+        """attempts. denemeden sonra beklenecek süre (sn)"""
+        return min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    processed = self.process_next()
+            except Exception as e:
+                email_logger.error(f"E-posta kuyruğu işçi hatası: {str(e)}\n{traceback.format_exc()}")
+                processed = False
+
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def claim_next(self, collection):
+        """Gönderim zamanı gelmiş bir mesajı sahiplen
+
+        Süresi dolmuş 'sending' kayıtları da (ör. işlem çöktüyse) yeniden alınır.
+        """
+        now = datetime.now(timezone.utc)
+        return collection.find_one_and_update(
+            {'$or': [
+                {'status': STATUS_PENDING, 'next_attempt_at': {'$lte': now}},
+                {'status': STATUS_SENDING, 'locked_until': {'$lte': now}}
+            ]},
+            {
+                '$set': {
+                    'status': STATUS_SENDING,
+                    'locked_until': now + timedelta(seconds=self.lease_seconds)
+                },
+                '$inc': {'attempts': 1}
+            },
+            sort=[('next_attempt_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def process_next(self):
+        """Kuyruktan bir mesaj gönder; işlenecek mesaj yoksa False döndür"""
+        collection = get_outbox_collection()
+        if collection is None:
+            return False
+
+        message = self.claim_next(collection)
+        if not message:
+            return False
+
+        try:
+            deliver_email(
+                message['subject'],
+                message['recipient'],
+                message['body'],
+                message.get('is_html', False),
+                message.get('sender')
+            )
+        except Exception as e:
+            self._record_failure(collection, message, str(e))
+            return True
+
+        collection.update_one(
+            {'_id': message['_id']},
+            {'$set': {
+                'status': STATUS_SENT,
+                'sent_at': datetime.now(timezone.utc),
+                'locked_until': None,
+                'last_error': None
+            }}
+        )
+        return True
+
+    def _record_failure(self, collection, message, error):
+        attempts = message.get('attempts', 1)
+        email_logger.error(
+            f"E-posta gönderimi başarısız ({attempts}/{self.max_attempts}) {message['recipient']}: {error}"
+        )
+
+        if attempts >= self.max_attempts:
+            # Dead-letter: tekrar denenmez, içerik dosyaya kaydedilir
+            try:
+                save_email_to_file(
+                    message['subject'],
+                    message['recipient'],
+                    message['body'],
+                    message.get('is_html', False),
+                    message.get('sender')
+                )
+            except Exception as e:
+                email_logger.error(f"Dead-letter e-postası dosyaya kaydedilemedi: {str(e)}")
+
+            collection.update_one(
+                {'_id': message['_id']},
+                {'$set': {'status': STATUS_DEAD, 'last_error': error, 'locked_until': None}}
+            )
+            return
+
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=self.backoff(attempts))
+        collection.update_one(
+            {'_id': message['_id']},
+            {'$set': {
+                'status': STATUS_PENDING,
+                'last_error': error,
+                'next_attempt_at': retry_at,
+                'locked_until': None
+            }}
+        )
+
+
+def get_outbox_stats():
+    """Admin paneli için kuyruk derinliği ve durum sayıları"""
+    collection = get_outbox_collection()
+    if collection is None:
+        return None
+
+    counts = {status: collection.count_documents({'status': status}) for status in OUTBOX_STATUSES}
+    oldest_pending = collection.find_one(
+        {'status': STATUS_PENDING},
+        sort=[('created_at', 1)]
+    )
+
+    oldest_age = None
+    if oldest_pending and oldest_pending.get('created_at'):
+        created_at = oldest_pending['created_at']
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        oldest_age = (datetime.now(timezone.utc) - created_at).total_seconds()
+
+    return {
+        'queue_depth': counts[STATUS_PENDING] + counts[STATUS_SENDING],
+        'counts': counts,
+        'oldest_pending_age_seconds': oldest_age,
+        'workers': len(_outbox._threads) if _outbox is not None else 0
+    }
+
+def get_dead_letters(limit=20):
+    """Son dead-letter mesajlarını getir (gövde hariç)"""
+    collection = get_outbox_collection()
+    if collection is None:
+        return []
+
+    messages = list(collection.find(
+        {'status': STATUS_DEAD},
+        {'body': 0}
+    ).sort('created_at', -1).limit(limit))
+    for message in messages:
+        message['_id'] = str(message['_id'])
+    return messages
+
+def retry_dead_letter(message_id):
+    """Dead-letter bir mesajı yeniden kuyruğa al
+
+    Geçersiz veya bulunamayan ID'ler için False döner.
+    """
+    if not ObjectId.is_valid(message_id):
+        return False
+    collection = get_outbox_collection()
+    if collection is None:
+        return False
+
+    result = collection.update_one(
+        {'_id': ObjectId(message_id), 'status': STATUS_DEAD},
+        {'$set': {
+            'status': STATUS_PENDING,
+            'attempts': 0,
+            'next_attempt_at': datetime.now(timezone.utc)
+        }}
+    )
+    if result.modified_count > 0 and _outbox is not None:
+        _outbox.notify()
+    return result.modified_count > 0
+
+def init_email_outbox(app):
+    """E-posta kuyruğu işçilerini başlat"""
+    global _outbox
+
+    if not app.config.get('EMAIL_OUTBOX_ENABLED', True):
+        app.logger.info("E-posta kuyruğu işçileri devre dışı")
+        return None
+
+    _outbox = EmailOutbox(
+        app,
+        workers=app.config.get('EMAIL_OUTBOX_WORKERS', 2),
+        poll_interval=app.config.get('EMAIL_OUTBOX_POLL_INTERVAL', 5),
+        max_attempts=app.config.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5),
+        backoff_base=app.config.get('EMAIL_OUTBOX_BACKOFF_BASE', 30),
+        backoff_max=app.config.get('EMAIL_OUTBOX_BACKOFF_MAX', 3600)
+    )
+    _outbox.start()
+    app.logger.info(f"E-posta kuyruğu {_outbox.workers} işçi ile başlatıldı")
+    return _outbox
@@ -1,4 +1,5 @@
 from flask import jsonify, request, render_template
+from config.mysql_db import PoolTimeoutError
 
 def register_error_handlers(app):
     """Uygulamaya hata işleyicileri kaydet"""
@@ -29,6 +30,14 @@ def register_error_handlers(app):
             # If that fails, return JSON
             return jsonify({'error': 'Bulunamadı', 'message': 'İstenilen kaynak bulunamadı'}), 404
     
+    @app.errorhandler(PoolTimeoutError)
+    def database_busy(error):
+        # Havuz dolu: istemci kısa süre sonra yeniden denemeli
+        app.logger.warning(f"MySQL havuzu bağlantı veremedi: {str(error)}")
+        response = jsonify({'error': 'Sunucu meşgul', 'message': 'Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
     @app.errorhandler(500)
     def server_error(error):
         return jsonify({'error': 'Sunucu hatası', 'message': 'Beklenmedik bir hata oluştu'}), 500 
\ No newline at end of file
@@ -9,6 +9,10 @@ from flask import render_template
 import logging
 import io
 import smtplib
+import base64
+import json
+import unicodedata
+from bson import ObjectId
 try:
     from config.settings import Config
 except ImportError:
@@ -25,10 +29,21 @@ except ImportError:
 # Flask-Mail'i içe aktar
 from flask_mail import Message
 
+from utils.log_pipeline import queued_file_handler, handler_options
+
 # SMTP loglarını yakalamak için özel sınıf
 class SMTPHandlerCapture:
-    def __init__(self, log_file_path):
+    def __init__(self, log_file_path, config=Config):
         self.log_file = log_file_path
+        
+        # Her çağrıda dosya açmak yerine tek bir kuyruklu, dönen yazıcı kullan
+        self.logger = logging.getLogger('smtp_logger')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            formatter = logging.Formatter('%(asctime)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+            self.logger.addHandler(queued_file_handler(log_file_path, formatter, **handler_options(config)))
+        
         self.original_smtp_connect = smtplib.SMTP.connect
         self.original_smtp_send = smtplib.SMTP.send
         
@@ -39,8 +54,7 @@ class SMTPHandlerCapture:
     def _patched_connect(self, host='localhost', port=0, source_address=None):
         """SMTP bağlantı metodu için yama - tüm iletişimi logla"""
         result = self.original_smtp_connect(self, host, port, source_address)
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - SMTP Connect - Host: {host}, Port: {port}\n")
+        self.logger.info(f"SMTP Connect - Host: {host}, Port: {port}")
         return result
     
     def _patched_send(self, s):
@@ -54,12 +68,20 @@ class SMTPHandlerCapture:
             except UnicodeDecodeError:
                 log_content = f"<Binary data {len(s)} bytes>"
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - SMTP Send: {log_content}\n")
+        self.logger.info(f"SMTP Send: {log_content}")
         return result
 
+# E-posta logger'ı; işleyicileri configure_email_logging ekler (create_app içinden).
+# İçe aktarma sırasında işleyici veya arka plan iş parçacığı oluşturulmaz.
+email_logger = logging.getLogger('email_logger')
+email_logger.setLevel(logging.INFO)
+
+_smtp_capture = None
+
 # Loglama için özellikleri yapılandır
-def configure_email_logging():
+def configure_email_logging(config=Config):
+    """E-posta ve SMTP log dosyalarını bağla (tekrar çağrılırsa işleyici eklenmez)"""
+    global _smtp_capture
     # E-posta logları için dizinleri oluştur
     base_dir = os.path.join(os.getcwd(), 'sent_emails')
     log_dir = os.path.join(base_dir, 'logs')
@@ -77,33 +99,49 @@ def configure_email_logging():
     # SMTP logları için dosya yolu
     smtp_log_file = os.path.join(smtp_dir, 'smtp.log')
     
-    # Loglamayı yapılandır
-    email_logger = logging.getLogger('email_logger')
-    email_logger.setLevel(logging.INFO)
-    
-    # Dosya işleyicisini ekle
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    
-    # Biçimlendiriciyi oluştur
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    
-    # İşleyiciyi log nesnesi için ata
+    # İşleyiciyi log nesnesi için ata: dosyaya arka planda dönen işleyici yazar
     if not email_logger.handlers:
-        email_logger.addHandler(file_handler)
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        email_logger.addHandler(queued_file_handler(log_file, formatter, logging.INFO, **handler_options(config)))
     
-    # SMTP loglarını yakalamak için SMTPHandlerCapture'ı başlat
-    smtp_handler = SMTPHandlerCapture(smtp_log_file)
+    # SMTP loglarını yakalamak için SMTPHandlerCapture'ı başlat (smtplib yalnızca bir kez yamalanır)
+    if _smtp_capture is None:
+        _smtp_capture = SMTPHandlerCapture(smtp_log_file, config)
     
     return email_logger
 
-# E-posta loglaması için logger oluştur
-email_logger = configure_email_logging()
+# bcrypt maliyeti (log2 tur sayısı); BCRYPT_ROUNDS ayarıyla değiştirilir
+BCRYPT_DEFAULT_ROUNDS = 12
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 31
+_bcrypt_rounds = BCRYPT_DEFAULT_ROUNDS
 
-def hash_password(password):
+def set_bcrypt_rounds(rounds):
+    """Yeni hashlerde kullanılacak bcrypt maliyetini ayarla"""
+    global _bcrypt_rounds
+    rounds = int(rounds)
+    if not BCRYPT_MIN_ROUNDS <= rounds <= BCRYPT_MAX_ROUNDS:
+        raise ValueError(f"bcrypt maliyeti {BCRYPT_MIN_ROUNDS}-{BCRYPT_MAX_ROUNDS} arasında olmalı: {rounds}")
+    _bcrypt_rounds = rounds
+
+def get_bcrypt_rounds():
+    """Yeni hashlerde kullanılan bcrypt maliyeti"""
+    return _bcrypt_rounds
+
+def bcrypt_cost(hashed_password):
+    """Hashlenmiş şifredeki bcrypt maliyetini döndür, bcrypt hash'i değilse None"""
+    match = re.match(r'^\$2[abxy]?\$(\d{2})\$', hashed_password or '')
+    return int(match.group(1)) if match else None
+
+def password_needs_rehash(hashed_password):
+    """Saklanan hash'in maliyeti hedef maliyetten farklıysa True"""
+    cost = bcrypt_cost(hashed_password)
+    return cost is not None and cost != _bcrypt_rounds
+
+def hash_password(password, rounds=None):
     """Şifreyi bcrypt kullanarak hashle"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    salt = bcrypt.gensalt(rounds=rounds or _bcrypt_rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 def check_password(password, hashed_password):
     """Şifrenin hashlenmiş şifreyle eşleşip eşleşmediğini kontrol et"""
@@ -132,8 +170,164 @@ def generate_reset_token():
     """Güvenli bir şifre sıfırlama token oluştur"""
     return secrets.token_urlsafe(32)
 
+# Türkçe büyük/küçük harf dönüşümü: I -> ı, İ -> i
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+def normalize_search_text(text):
+    """Arama için metni Türkçe kurallarına göre küçült ve aksanlarını kaldır
+
+    "İSTANBUL", "istanbul" ve "Istanbul" aynı biçime ("istanbul"), "Çiğköfte"
+    ise "cigkofte" biçimine dönüşür. Böylece kullanıcı Türkçe karakterleri
+    yazsa da yazmasa da eşleşme bulunur.
+    """
+    if not text:
+        return ''
+    lowered = str(text).translate(_TURKISH_LOWER).lower()
+    decomposed = unicodedata.normalize('NFKD', lowered)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    # Noktasız ı ayrıştırılamaz, elle dönüştür
+    return stripped.replace('ı', 'i')
+
+def encode_cursor(created_at, item_id):
+    """Keyset sayfalama için (created_at, id) çiftinden opak bir cursor oluştur"""
+    if isinstance(item_id, ObjectId):
+        kind = 'oid'
+    elif isinstance(item_id, int):
+        kind = 'int'
+    else:
+        kind = 'str'
+    payload = {
+        'c': created_at.isoformat() if created_at else None,
+        'i': str(item_id),
+        'k': kind
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """encode_cursor ile oluşturulan cursor'ı çöz
+
+    Returns:
+        tuple: (created_at, item_id)
+
+    Raises:
+        ValueError: Cursor bozuksa
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        created_at = datetime.fromisoformat(payload['c']) if payload.get('c') else None
+        if payload['k'] == 'oid':
+            item_id = ObjectId(payload['i'])
+        elif payload['k'] == 'int':
+            item_id = int(payload['i'])
+        else:
+            item_id = payload['i']
+        return created_at, item_id
+    except Exception:
+        raise ValueError('Geçersiz cursor')
+
+def parse_fields(value, allowed, default):
+    """fields= sorgu parametresini beyaz listeye göre ayrıştır
+
+    Args:
+        value: Virgülle ayrılmış alan adları; boşsa default döner
+        allowed: İzin verilen alanlar
+        default: Parametre verilmediğinde kullanılacak alanlar
+
+    Raises:
+        ValueError: İzin verilmeyen alan istenirse (mesaj bilinmeyen alanları içerir)
+    """
+    if not value:
+        return list(default)
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(', '.join(unknown))
+    return fields or list(default)
+
+def mongo_projection(fields):
+    """Alan listesinden MongoDB projeksiyonu oluştur
+
+    MongoDB _id'yi varsayılan olarak eklediğinden, listede yoksa açıkça dışlanır.
+    """
+    projection = {field: 1 for field in fields}
+    if '_id' not in projection:
+        projection['_id'] = 0
+    return projection
+
+def render_email_body(body, is_html=False, template=None, template_data=None):
+    """E-posta gövdesini oluştur; şablon verilmişse onu işle
+
+    Returns:
+        tuple: (body, is_html)
+    """
+    # Eğer bir şablon sağlanmışsa, sağlanan verilerle onu oluştur
+    if template and template_data:
+        try:
+            html_content = render_template(template, **template_data)
+            return html_content, True
+        except Exception as e:
+            email_logger.error(f"Error rendering email template {template}: {str(e)}")
+            # Sağlanan gövdeye geri dön
+    return body, is_html
+
+def deliver_email(subject, recipient, body, is_html=False, sender=None):
+    """Hazır bir e-postayı SMTP üzerinden gönder
+
+    Gönderim başarısız olursa istisna fırlatır; tekrar deneme kararı çağırana aittir.
+    """
+    # Göndericiyi belirle: ya belirtilen gönderici ya da varsayılan gönderici
+    email_sender = sender or Config.MAIL_DEFAULT_SENDER
+    
+    msg = Message(
+        subject=subject,
+        recipients=[recipient],
+        body=None if is_html else body,
+        html=body if is_html else None,
+        sender=email_sender
+    )
+    current_app.extensions['mail'].send(msg)
+    email_logger.info(f"Gerçek e-posta gönderildi: {recipient} (Gönderen: {email_sender})")
+    return True
+
+def save_email_to_file(subject, recipient, body, is_html=False, sender=None):
+    """Gönderilemeyen e-postayı sent_emails/messages altına kaydet"""
+    email_sender = sender or Config.MAIL_DEFAULT_SENDER
+    
+    # Detaylı e-posta bilgilerini logla
+    email_logger.info(f"E-posta gönderildi {recipient}: {subject}")
+    email_logger.info(f"Gönderici: {email_sender}")
+    email_logger.info(f"HTML: {is_html}")
+    if len(body) > 200:
+        email_logger.info(f"İçerik: {body[:200]}...")
+    else:
+        email_logger.info(f"İçerik: {body}")
+    email_logger.info(f"Current APP_URL: {Config.APP_URL}")
+    
+    # Geliştirme için, e-postayı bir dosyaya kaydet
+    email_dir = os.path.join(os.getcwd(), 'sent_emails', 'messages')
+    if not os.path.exists(email_dir):
+        os.makedirs(email_dir)
+    
+    timestamp = __import__('datetime').datetime.now().strftime('%Y%m%d%H%M%S')
+    filename = f"{email_dir}/{timestamp}_{recipient.replace('@', '_at_')}.html" if is_html else f"{email_dir}/{timestamp}_{recipient.replace('@', '_at_')}.txt"
+    
+    # E-posta içeriğini dosyaya kaydet
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(f"Subject: {subject}\n")
+        f.write(f"To: {recipient}\n")
+        f.write(f"From: {email_sender}\n")
+        f.write(f"Content-Type: {'text/html' if is_html else 'text/plain'}\n\n")
+        f.write(body)
+    
+    email_logger.info(f"E-posta dosyasına kaydedildi: {filename}")
+    return filename
+
 def send_email(subject, recipient, body, is_html=False, template=None, template_data=None, sender=None):
-    """Bir e-posta gönder
+    """Bir e-postayı istek içinde senkron olarak gönder
+    
+    HTTP işleyicileri bunun yerine utils.email_outbox.queue_email kullanmalıdır.
     
     Args:
         subject: Email konusu
@@ -145,63 +339,17 @@ def send_email(subject, recipient, body, is_html=False, template=None, template_
         sender: Gönderici email adresi (None ise varsayılan gönderici kullanılır)
     """
     try:
-        # Eğer bir şablon sağlanmışsa, sağlanan verilerle onu oluştur
-        if template and template_data:
-            try:
-                html_content = render_template(template, **template_data)
-                is_html = True
-                body = html_content
-            except Exception as e:
-                email_logger.error(f"Error rendering email template {template}: {str(e)}")
-                # Sağlanan gövdeye geri dön
-        
-        # Göndericiyi belirle: ya belirtilen gönderici ya da varsayılan gönderici
-        email_sender = sender or Config.MAIL_DEFAULT_SENDER
+        body, is_html = render_email_body(body, is_html, template, template_data)
         
         # Her zaman gerçek e-posta göndermeyi dene
         try:
-            msg = Message(
-                subject=subject,
-                recipients=[recipient],
-                body=None if is_html else body,
-                html=body if is_html else None,
-                sender=email_sender
-            )
-            current_app.extensions['mail'].send(msg)
-            email_logger.info(f"Gerçek e-posta gönderildi: {recipient} (Gönderen: {email_sender})")
-            return True
+            return deliver_email(subject, recipient, body, is_html, sender)
         except Exception as e:
             email_logger.error(f"Gerçek e-posta gönderimi hatası: {str(e)}")
             # Hata durumunda geliştirme modundaki gibi dosyaya kaydet
             email_logger.info("Dosyaya kaydetme yöntemine geri dönülüyor...")
         
-        # Detaylı e-posta bilgilerini logla
-        email_logger.info(f"E-posta gönderildi {recipient}: {subject}")
-        email_logger.info(f"Gönderici: {email_sender}")
-        email_logger.info(f"HTML: {is_html}")
-        if len(body) > 200:
-            email_logger.info(f"İçerik: {body[:200]}...")
-        else:
-            email_logger.info(f"İçerik: {body}")
-        email_logger.info(f"Current APP_URL: {Config.APP_URL}")
-        
-        # Geliştirme için, e-postayı bir dosyaya kaydet
-        email_dir = os.path.join(os.getcwd(), 'sent_emails', 'messages')
-        if not os.path.exists(email_dir):
-            os.makedirs(email_dir)
-        
-        timestamp = __import__('datetime').datetime.now().strftime('%Y%m%d%H%M%S')
-        filename = f"{email_dir}/{timestamp}_{recipient.replace('@', '_at_')}.html" if is_html else f"{email_dir}/{timestamp}_{recipient.replace('@', '_at_')}.txt"
-        
-        # E-posta içeriğini dosyaya kaydet
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"Subject: {subject}\n")
-            f.write(f"To: {recipient}\n")
-            f.write(f"From: {email_sender}\n")
-            f.write(f"Content-Type: {'text/html' if is_html else 'text/plain'}\n\n")
-            f.write(body)
-        
-        email_logger.info(f"E-posta dosyasına kaydedildi: {filename}")
+        save_email_to_file(subject, recipient, body, is_html, sender)
         return False  # Gerçek e-posta gönderilemedi, dosyaya kaydedildi
     except Exception as e:
         email_logger.error(f"E-posta gönderimi hatası: {str(e)}")
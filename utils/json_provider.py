@@ -0,0 +1,76 @@
+"""MongoDB ve MySQL türlerini doğrudan serileştiren Flask JSON sağlayıcısı
+
+ObjectId dizeye, datetime/date ISO 8601'e, Decimal ve Decimal128 sayıya
+çevrilir; böylece route'ların ve modellerin belgeleri yanıt öncesi tek tek
+dönüştürmesine gerek kalmaz. orjson kuruluysa kodlama onunla yapılır, yoksa
+standart json modülüne dönülür. Yanıtlar debug modu dışında sıkıştırılmış
+(boşluksuz) yazılır.
+"""
+from datetime import date, time
+from decimal import Decimal
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from bson.timestamp import Timestamp
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson yolunun karşılayabildiği dumps argümanları; diğerleri standart json'a düşer
+_ORJSON_ARGUMENTS = {'indent', 'separators', 'sort_keys', 'ensure_ascii'}
+
+
+def _default(o):
+    """JSON'un yerel olarak bilmediği türleri dönüştür"""
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, (date, time)):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, Decimal128):
+        return float(o.to_decimal())
+    if isinstance(o, Timestamp):
+        return o.as_datetime().isoformat()
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class JSONProvider(DefaultJSONProvider):
+    """ObjectId/datetime/Decimal bilen, varsa orjson kullanan JSON sağlayıcısı"""
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+
+    def _orjson_options(self, sort_keys, indent):
+        options = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs.keys() - _ORJSON_ARGUMENTS:
+            return super().dumps(obj, **kwargs)
+        options = self._orjson_options(kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent'))
+        return orjson.dumps(obj, default=self.default, option=options).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """jsonify yanıtı; orjson varsa baytlar str'ye çevrilmeden gövdeye yazılır"""
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_options(self.sort_keys, pretty))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,163 @@
+import atexit
+import threading
+from datetime import datetime
+
+from config.mysql_db import get_mysql_connection
+
+# Tek UPDATE içinde güncellenecek en fazla kullanıcı
+FLUSH_CHUNK_SIZE = 500
+
+class LastLoginBuffer:
+    """last_login yazımlarını bellekte toplayıp toplu UPDATE ile yazan tampon
+
+    Giriş isteği yalnızca kullanıcı ID'sini ve zamanı tampona ekler. Arka plan
+    iş parçacığı flush_interval saniyede bir (veya tampon max_pending'e
+    ulaşınca) bekleyen kayıtları tek bir `UPDATE ... CASE` sorgusuyla yazar.
+    İş parçacığı çalışmıyorsa kayıt hemen yazılır.
+    """
+
+    def __init__(self, flush_interval=5, max_pending=1000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failures = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='last-login-flusher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """İş parçacığını durdur ve bekleyen kayıtları yaz"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def record(self, user_id, when=None):
+        """Kullanıcının son giriş zamanını tampona ekle"""
+        when = when or datetime.now()
+        with self._lock:
+            previous = self._pending.get(user_id)
+            if previous is None or when > previous:
+                self._pending[user_id] = when
+            pending = len(self._pending)
+
+        if not self.running:
+            self.flush()
+        elif pending >= self.max_pending:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Bekleyen kayıtları yaz; yazılan satır sayısını döndür"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            items = list(batch.items())
+            try:
+                conn = get_mysql_connection()
+                cursor = conn.cursor()
+                try:
+                    for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                        query, params = build_last_login_update(items[start:start + FLUSH_CHUNK_SIZE])
+                        cursor.execute(query, params)
+                    conn.commit()
+                finally:
+                    cursor.close()
+                    conn.close()
+            except Exception as e:
+                # Yazılamayan kayıtları, bu arada gelen daha yeni zamanları ezmeden geri koy
+                with self._lock:
+                    for user_id, when in items:
+                        current = self._pending.get(user_id)
+                        if current is None or when > current:
+                            self._pending[user_id] = when
+                    self.failures += 1
+                print(f"Son giriş zamanları yazılamadı: {str(e)}")
+                return 0
+
+            with self._lock:
+                self.flushes += 1
+                self.flushed_rows += len(items)
+            return len(items)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'running': self.running,
+                'pending': len(self._pending),
+                'flushes': self.flushes,
+                'flushed_rows': self.flushed_rows,
+                'failures': self.failures
+            }
+
+
+def build_last_login_update(items):
+    """(user_id, zaman) çiftleri için tek bir çok satırlı UPDATE sorgusu oluştur"""
+    cases = ' '.join(['WHEN %s THEN %s'] * len(items))
+    placeholders = ', '.join(['%s'] * len(items))
+    query = f"UPDATE users SET last_login = CASE id {cases} END WHERE id IN ({placeholders})"
+
+    params = []
+    for user_id, when in items:
+        params.extend((user_id, when))
+    params.extend(user_id for user_id, _ in items)
+    return query, tuple(params)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+def get_last_login_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = LastLoginBuffer()
+        return _buffer
+
+def init_last_login_buffer(app):
+    """last_login tamponunu yapılandır ve yazma iş parçacığını başlat"""
+    global _buffer
+
+    with _buffer_lock:
+        if _buffer is not None:
+            _buffer.stop()
+        _buffer = LastLoginBuffer(
+            flush_interval=app.config.get('LAST_LOGIN_FLUSH_INTERVAL', 5),
+            max_pending=app.config.get('LAST_LOGIN_MAX_PENDING', 1000)
+        )
+
+    if not app.config.get('LAST_LOGIN_WRITE_BEHIND', True):
+        app.logger.info("last_login toplu yazımı devre dışı; girişler hemen yazılacak")
+        return _buffer
+
+    _buffer.start()
+    # Kapanışta bekleyen giriş zamanlarını kaybetme
+    atexit.register(_buffer.stop)
+    app.logger.info(f"last_login tamponu {_buffer.flush_interval} sn aralıkla başlatıldı")
+    return _buffer
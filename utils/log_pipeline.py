@@ -0,0 +1,158 @@
+import atexit
+import gzip
+import itertools
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+class RotatingGzipFileHandler(RotatingFileHandler):
+    """Boyut veya süre dolunca dönen, eski dosyaları isteğe bağlı gzip'leyen dosya işleyicisi
+
+    max_bytes aşıldığında ya da interval saniye geçtiğinde (hangisi önce olursa)
+    dosya app.log.1, app.log.2 ... olarak kaydırılır; compress açıksa kaydırılan
+    dosyalar app.log.1.gz biçiminde sıkıştırılır.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 interval=None, compress=True, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else None
+
+        if compress:
+            self.namer = lambda name: name + '.gz'
+            self.rotator = self._gzip_rotator
+
+    @staticmethod
+    def _gzip_rotator(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+
+class SamplingFilter(logging.Filter):
+    """Gürültülü logger'ların DEBUG kayıtlarından yalnızca her N'incisini geçirir
+
+    rates: {'pymongo': 100} gibi logger adı öneki -> N eşlemesi. level ve üstü
+    kayıtlar her zaman geçer; altındakiler yalnızca örneklenen logger'lardan,
+    örnekleme oranında geçer. İşleyicinin seviyesi DEBUG'a çekilir ve seviye
+    kesmesini bu filtre yapar, böylece DEBUG kayıtları örneklemeye ulaşır.
+    """
+
+    def __init__(self, rates, level=logging.INFO):
+        super().__init__()
+        self.rates = dict(rates)
+        self.level = level
+        self._counters = {name: itertools.count() for name in self.rates}
+
+    def _rate_for(self, logger_name):
+        for name in self.rates:
+            if logger_name == name or logger_name.startswith(name + '.'):
+                return name
+        return None
+
+    def filter(self, record):
+        if record.levelno >= self.level:
+            return True
+        name = self._rate_for(record.name)
+        if name is None:
+            return False
+        # itertools.count GIL altında atomik ilerler
+        return next(self._counters[name]) % self.rates[name] == 0
+
+
+def parse_sample_rates(value):
+    """'pymongo=100,urllib3=10' biçimindeki ayarı sözlüğe çevir"""
+    rates = {}
+    for part in (value or '').split(','):
+        if '=' not in part:
+            continue
+        name, rate = part.split('=', 1)
+        try:
+            rates[name.strip()] = max(1, int(rate))
+        except ValueError:
+            continue
+    return rates
+
+
+_listeners = []
+_listeners_lock = threading.Lock()
+
+def queued_file_handler(path, formatter, level=logging.INFO, max_bytes=10 * 1024 * 1024,
+                        backup_count=5, interval=None, compress=True, sample_rates=None):
+    """Dosyaya arka plan iş parçacığında yazan bir QueueHandler döndür
+
+    İstek iş parçacığı kaydı yalnızca kuyruğa koyar; dönen dosya işleyicisi
+    QueueListener iş parçacığında çalışır, böylece disk G/Ç'si ve sıkıştırma
+    isteği bekletmez.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    file_handler = RotatingGzipFileHandler(
+        path, max_bytes=max_bytes, backup_count=backup_count, interval=interval, compress=compress
+    )
+    # Örnekleme açıksa seviye kesmesi SamplingFilter'da yapılır
+    handler_level = logging.DEBUG if sample_rates else level
+    file_handler.setLevel(handler_level)
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    with _listeners_lock:
+        _listeners.append(listener)
+
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(handler_level)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates, level))
+    return queue_handler
+
+def attach_sampled_loggers(handler, sample_rates):
+    """Örneklenen logger'ları (pymongo, urllib3 ...) DEBUG seviyesine alıp işleyiciye bağla
+
+    Bu logger'ların kayıtları uygulama logger'ından geçmez; işleyici doğrudan
+    eklenmezse örnekleme oranları hiçbir kayda uygulanmaz.
+    """
+    for name in sample_rates:
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.DEBUG)
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+
+def handler_options(config):
+    """Config nesnesinden queued_file_handler seçeneklerini oku"""
+    get = config.get if isinstance(config, dict) else lambda key, default=None: getattr(config, key, default)
+    return {
+        'max_bytes': get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+        'backup_count': get('LOG_BACKUP_COUNT', 5),
+        'interval': get('LOG_ROTATE_INTERVAL', None) or None,
+        'compress': get('LOG_COMPRESS', True),
+        'sample_rates': parse_sample_rates(get('LOG_DEBUG_SAMPLE_RATES', ''))
+    }
+
+def stop_log_listeners():
+    """Kuyruktaki kayıtları yazıp dinleyicileri durdur"""
+    with _listeners_lock:
+        listeners = list(_listeners)
+        _listeners.clear()
+    for listener in listeners:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+atexit.register(stop_log_listeners)
@@ -0,0 +1,297 @@
+import bisect
+import threading
+import time
+
+from flask import Response, g, request
+from pymongo import monitoring
+
+from utils.query_detector import record_mongo_command
+
+# Saniye cinsinden varsayılan gecikme kovaları
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# İstek başına veritabanı gidiş-dönüş sayısı kovaları
+ROUND_TRIP_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+class Histogram:
+    """Sabit kovalı, iş parçacığı güvenli gecikme histogramı
+
+    Kovalar Prometheus'taki gibi üst sınırlarla (le) tanımlanır; yüzdelikler
+    kova üst sınırlarından tahmin edilir.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, description='', buckets=DEFAULT_LATENCY_BUCKETS, labels=None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def _percentile(self, counts, total, quantile):
+        if total == 0:
+            return None
+        rank = quantile * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def snapshot(self):
+        """Histogramın o anki durumunu sözlük olarak döndür"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets['+Inf'] = total
+
+        return {
+            'count': total,
+            'sum': total_sum,
+            'buckets': buckets,
+            'p50': self._percentile(counts, total, 0.50),
+            'p95': self._percentile(counts, total, 0.95),
+            'p99': self._percentile(counts, total, 0.99)
+        }
+
+
+class Counter:
+    """Yalnızca artan, iş parçacığı güvenli sayaç"""
+
+    kind = 'counter'
+
+    def __init__(self, name, description='', labels=None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        with self._lock:
+            return self._value
+
+    def snapshot(self):
+        return {'value': self.value}
+
+
+class Gauge(Counter):
+    """Artıp azalabilen anlık değer (ör. işlenmekte olan istek sayısı)"""
+
+    kind = 'gauge'
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+def _get_or_create(cls, name, description, labels, **kwargs):
+    key = (name, _label_key(labels))
+    with _registry_lock:
+        metric = _registry.get(key)
+        if metric is None:
+            metric = cls(name, description, labels=labels, **kwargs)
+            _registry[key] = metric
+        return metric
+
+def histogram(name, description='', buckets=DEFAULT_LATENCY_BUCKETS, labels=None):
+    """Adı ve etiketleri verilen histogramı getir, yoksa oluştur"""
+    return _get_or_create(Histogram, name, description, labels, buckets=buckets)
+
+def counter(name, description='', labels=None):
+    """Adı ve etiketleri verilen sayacı getir, yoksa oluştur"""
+    return _get_or_create(Counter, name, description, labels)
+
+def gauge(name, description='', labels=None):
+    """Adı ve etiketleri verilen göstergeyi getir, yoksa oluştur"""
+    return _get_or_create(Gauge, name, description, labels)
+
+def get_metrics():
+    """Kayıtlı tüm metrikler (ada ve etiketlere göre sıralı)"""
+    with _registry_lock:
+        return [_registry[key] for key in sorted(_registry)]
+
+def metrics_snapshot():
+    """Tüm metrikleri yönetim paneli için JSON'a uygun sözlük olarak döndür"""
+    snapshot = {}
+    for metric in get_metrics():
+        entry = snapshot.setdefault(metric.name, {
+            'type': metric.kind, 'description': metric.description, 'series': []
+        })
+        entry['series'].append({'labels': metric.labels, **metric.snapshot()})
+    return snapshot
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    escaped = [
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in items
+    ]
+    return '{' + ','.join(escaped) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_prometheus():
+    """Tüm metrikleri Prometheus metin biçiminde (0.0.4) döndür"""
+    lines = []
+    seen = set()
+    for metric in get_metrics():
+        if metric.name not in seen:
+            seen.add(metric.name)
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+
+        if metric.kind == 'histogram':
+            snapshot = metric.snapshot()
+            for bound, count in snapshot['buckets'].items():
+                lines.append(f"{metric.name}_bucket{_format_labels(metric.labels, {'le': bound})} {count}")
+            lines.append(f"{metric.name}_sum{_format_labels(metric.labels)} {_format_value(snapshot['sum'])}")
+            lines.append(f"{metric.name}_count{_format_labels(metric.labels)} {snapshot['count']}")
+        else:
+            lines.append(f"{metric.name}{_format_labels(metric.labels)} {_format_value(metric.value)}")
+    return '\n'.join(lines) + '\n'
+
+
+# İstek başına veritabanı gidiş-dönüş sayacı; her iş parçacığı kendi isteğini sayar
+_request_db = threading.local()
+
+def start_request_db_stats():
+    _request_db.stats = {'mongo': [0, 0.0], 'mysql': [0, 0.0]}
+
+def finish_request_db_stats():
+    """Geçerli isteğin {store: (çağrı sayısı, toplam süre)} değerlerini döndür ve sıfırla"""
+    stats = getattr(_request_db, 'stats', None)
+    _request_db.stats = None
+    return {store: tuple(values) for store, values in (stats or {}).items()}
+
+def record_db_call(store, seconds):
+    """Bir veritabanı gidiş-dönüşünü genel metriklere ve geçerli isteğe yaz"""
+    counter('db_calls_total', 'Veritabanı gidiş-dönüş sayısı', {'store': store}).inc()
+    histogram('db_call_seconds', 'Veritabanı gidiş-dönüş süresi', labels={'store': store}).observe(seconds)
+
+    stats = getattr(_request_db, 'stats', None)
+    if stats is not None and store in stats:
+        stats[store][0] += 1
+        stats[store][1] += seconds
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo komutlarını db_calls_total ve istek sayaçlarına yazan dinleyici
+
+    Senkron pymongo olayları komutu çalıştıran iş parçacığında tetiklendiği için
+    gidiş-dönüş doğru isteğe yazılır.
+    """
+
+    def started(self, event):
+        # Sorgu şekli yalnızca N+1 dedektörü veya sorgu bütçesi etkinken kaydedilir
+        record_mongo_command(event.command_name, event.command)
+
+    def succeeded(self, event):
+        record_db_call('mongo', event.duration_micros / 1e6)
+
+    def failed(self, event):
+        record_db_call('mongo', event.duration_micros / 1e6)
+
+
+def _route_label():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+def init_metrics(app):
+    """İstek gecikmesi ve veritabanı gidiş-dönüş metriklerini kaydeden ara katmanı kur"""
+    if not app.config.get('METRICS_ENABLED', True):
+        app.logger.info("İstek metrikleri devre dışı")
+        return
+
+    in_flight = gauge('http_requests_in_flight', 'İşlenmekte olan istek sayısı')
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started_at = time.perf_counter()
+        g.metrics_in_flight = True
+        in_flight.inc()
+        start_request_db_stats()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started_at = g.pop('metrics_started_at', None)
+        if started_at is None:
+            return response
+
+        route = _route_label()
+        method = request.method
+        histogram(
+            'http_request_duration_seconds', 'Uç nokta başına istek süresi',
+            labels={'method': method, 'route': route}
+        ).observe(time.perf_counter() - started_at)
+        counter(
+            'http_requests_total', 'Uç nokta ve durum koduna göre istek sayısı',
+            labels={'method': method, 'route': route, 'status': str(response.status_code)}
+        ).inc()
+
+        round_trips = []
+        for store, (calls, seconds) in finish_request_db_stats().items():
+            labels = {'route': route, 'store': store}
+            histogram(
+                'http_request_db_round_trips', 'İstek başına veritabanı gidiş-dönüş sayısı',
+                ROUND_TRIP_BUCKETS, labels
+            ).observe(calls)
+            histogram(
+                'http_request_db_seconds', 'İstek başına toplam veritabanı süresi', labels=labels
+            ).observe(seconds)
+            round_trips.append(f"{store}={calls}")
+        response.headers['X-DB-Round-Trips'] = ', '.join(round_trips)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(error=None):
+        if g.pop('metrics_in_flight', False):
+            in_flight.dec()
+
+    def metrics_endpoint():
+        # Yalnızca Prometheus metni; JSON özet yönetici girişi isteyen /admin/api/metrics adresindedir
+        return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint, methods=['GET'])
+    app.logger.info("İstek metrikleri /metrics adresinde yayınlanıyor")
@@ -0,0 +1,212 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import jsonify
+
+from utils import helpers
+from utils.helpers import password_needs_rehash
+from utils.metrics import histogram
+
+# bcrypt süreleri istek gecikmelerinden uzundur, kovalar buna göre seçilir
+PASSWORD_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0)
+
+class PasswordHasherBusy(Exception):
+    """Parola havuzu dolu veya zaman aşımı; istek bekletilmeden reddedilmeli"""
+    pass
+
+
+class PasswordHasher:
+    """bcrypt işlemlerini istek iş parçacığından ayrı, sınırlı bir havuzda çalıştırır
+
+    bcrypt hesaplama sırasında GIL'i bırakır; bu yüzden iş parçacığı havuzu gerçek
+    paralellik sağlar ve işçi sayısı, bcrypt'in kullanabileceği CPU çekirdeği sayısını
+    sınırlar. Çalışan ve kuyrukta bekleyen toplam iş workers + max_queue'yu aşarsa
+    yeni istekler PasswordHasherBusy ile hemen reddedilir; böylece giriş akını
+    katalog gibi ucuz uç noktaları bekletmez.
+    """
+
+    def __init__(self, workers=2, max_queue=16, timeout=10):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+        self.queue_wait = histogram(
+            'password_queue_wait_seconds', 'bcrypt işinin havuzda bekleme süresi', PASSWORD_BUCKETS
+        )
+        self.hash_time = histogram(
+            'password_hash_seconds', 'bcrypt hash/doğrulama süresi', PASSWORD_BUCKETS
+        )
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def run(self, func, *args):
+        """func(*args) çağrısını havuzda çalıştır ve sonucunu döndür
+
+        Raises:
+            PasswordHasherBusy: Kuyruk doluysa veya sonuç timeout içinde gelmezse
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy('Parola işleme kuyruğu dolu')
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            self.queue_wait.observe(started_at - submitted_at)
+            try:
+                return func(*args)
+            finally:
+                self.hash_time.observe(time.perf_counter() - started_at)
+                self._release()
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(task)
+        except Exception:
+            self._release()
+            raise
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordHasherBusy('Parola işleme zaman aşımına uğradı')
+
+    def stats(self):
+        with self._lock:
+            in_flight = self._in_flight
+            rejected = self.rejected
+            timeouts = self.timeouts
+        return {
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'in_flight': in_flight,
+            'rejected': rejected,
+            'timeouts': timeouts,
+            'queue_wait_seconds': self.queue_wait.snapshot(),
+            'hash_seconds': self.hash_time.snapshot()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+def get_password_hasher():
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher()
+        return _hasher
+
+def hash_password(password):
+    """Şifreyi parola havuzunda bcrypt ile hashle"""
+    return get_password_hasher().run(helpers.hash_password, password)
+
+def check_password(password, hashed_password):
+    """Şifreyi parola havuzunda hashlenmiş şifreyle karşılaştır"""
+    return get_password_hasher().run(helpers.check_password, password, hashed_password)
+
+def benchmark_bcrypt(costs, samples=3, password='benchmark-password'):
+    """Her maliyet için bir bcrypt hash'inin ortalama süresini (ms) ölç
+
+    Returns:
+        list: (maliyet, ms) çiftleri
+    """
+    results = []
+    for cost in costs:
+        started_at = time.perf_counter()
+        for _ in range(samples):
+            helpers.hash_password(password, rounds=cost)
+        results.append((cost, (time.perf_counter() - started_at) * 1000 / samples))
+    return results
+
+def calibrate_bcrypt_cost(budget_ms, min_cost=10, max_cost=16, samples=3):
+    """Bu donanımda budget_ms içinde kalan en yüksek bcrypt maliyetini bul
+
+    Her maliyet artışı süreyi yaklaşık iki katına çıkardığından ölçüm, bütçe
+    aşıldığı anda durur. Hiçbir maliyet bütçeye sığmazsa min_cost döner.
+    """
+    chosen = min_cost
+    for cost in range(min_cost, max_cost + 1):
+        (_, elapsed_ms), = benchmark_bcrypt([cost], samples)
+        if elapsed_ms > budget_ms:
+            break
+        chosen = cost
+    return chosen
+
+def init_password_hasher(app):
+    """Parola havuzunu uygulama ayarlarıyla oluştur ve 503 hata işleyicisini kaydet"""
+    global _hasher
+
+    target_ms = app.config.get('BCRYPT_TARGET_MS')
+    if target_ms:
+        rounds = calibrate_bcrypt_cost(target_ms)
+        app.logger.info(f"bcrypt maliyeti {target_ms} ms bütçeye göre {rounds} olarak ayarlandı")
+    else:
+        rounds = app.config.get('BCRYPT_ROUNDS', helpers.BCRYPT_DEFAULT_ROUNDS)
+    helpers.set_bcrypt_rounds(rounds)
+
+    with _hasher_lock:
+        if _hasher is not None:
+            _hasher.shutdown()
+        _hasher = PasswordHasher(
+            workers=app.config.get('PASSWORD_POOL_WORKERS', 2),
+            max_queue=app.config.get('PASSWORD_POOL_MAX_QUEUE', 16),
+            timeout=app.config.get('PASSWORD_POOL_TIMEOUT', 10)
+        )
+
+    @app.errorhandler(PasswordHasherBusy)
+    def handle_password_hasher_busy(error):
+        app.logger.warning(f"Parola havuzu isteği reddetti: {str(error)}")
+        response = jsonify({'message': 'Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    return _hasher
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='bcrypt maliyet ölçümü ve kalibrasyonu')
+    parser.add_argument('--min-cost', type=int, default=helpers.BCRYPT_MIN_ROUNDS, help='Ölçülecek en düşük maliyet')
+    parser.add_argument('--max-cost', type=int, default=14, help='Ölçülecek en yüksek maliyet')
+    parser.add_argument('--samples', type=int, default=3, help='Maliyet başına hash sayısı')
+    parser.add_argument('--budget-ms', type=float, help='Hash başına gecikme bütçesi; önerilen maliyeti yazdırır')
+    args = parser.parse_args(argv)
+
+    print(f"{'maliyet':>8} {'ms/hash':>10}")
+    results = benchmark_bcrypt(range(args.min_cost, args.max_cost + 1), args.samples)
+    for cost, elapsed_ms in results:
+        print(f"{cost:>8} {elapsed_ms:>10.1f}")
+
+    if args.budget_ms:
+        fitting = [cost for cost, elapsed_ms in results if elapsed_ms <= args.budget_ms]
+        if not fitting:
+            print(f"❌ {args.budget_ms} ms bütçeye sığan maliyet yok")
+            return 1
+        print(f"✅ Önerilen BCRYPT_ROUNDS={max(fitting)} (bütçe: {args.budget_ms} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from datetime import datetime
+
+from flask import g, request, session
+
+PROFILE_HEADER = 'X-Profile'
+_PROFILE_ID = re.compile(r'^[0-9A-Za-z_.-]+$')
+
+class ProfileStore:
+    """Profilleri diskte en fazla max_profiles adet tutan halka
+
+    Her profil <id>.prof (pstats) ve <id>.json (istek bilgileri) olarak yazılır;
+    sınır aşılınca en eski profiller silinir.
+    """
+
+    def __init__(self, directory, max_profiles=50):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, profile_id, extension='prof'):
+        if not _PROFILE_ID.match(profile_id or ''):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.{extension}")
+        return path if os.path.exists(path) else None
+
+    def save(self, profiler, info):
+        profile_id = '{}-{}-{}'.format(
+            datetime.now().strftime('%Y%m%d%H%M%S%f'), os.getpid(), next(self._sequence)
+        )
+        profiler.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+        with open(os.path.join(self.directory, f"{profile_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump(dict(info, id=profile_id), f)
+        self._trim()
+        return profile_id
+
+    def _trim(self):
+        with self._lock:
+            profiles = sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith('.prof'))
+            excess = len(profiles) - self.max_profiles
+            for profile_id in profiles[:max(excess, 0)]:
+                for extension in ('prof', 'json'):
+                    try:
+                        os.remove(os.path.join(self.directory, f"{profile_id}.{extension}"))
+                    except FileNotFoundError:
+                        pass
+
+    def list(self):
+        """Kayıtlı profillerin bilgileri, en yenisi önce"""
+        profiles = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+
+def _frame_name(func):
+    filename, lineno, name = func
+    label = f"{name} ({os.path.basename(filename)}:{lineno})" if lineno else name
+    return label.replace(';', ':')
+
+def collapsed_stacks(profile_path, max_depth=64):
+    """pstats dosyasını flamegraph için 'a;b;c <mikrosaniye>' satırlarına çevir
+
+    cProfile tam yığınları değil yalnızca çağıran-çağrılan kenarlarını tutar; yığınlar
+    kökten başlayarak kenar sürelerinin oranıyla dağıtılır, bu yüzden sonuç yaklaşıktır.
+    """
+    stats = pstats.Stats(profile_path).stats
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+
+    def walk(func, path, on_path, ratio):
+        own_time = stats[func][2]
+        stack = path + [_frame_name(func)]
+        weight = int(own_time * ratio * 1e6)
+        if weight > 0:
+            key = ';'.join(stack)
+            lines[key] = lines.get(key, 0) + weight
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_time in callees.get(func, []):
+            callee_total = stats[callee][3]
+            # Özyinelemeli çağrılar yığını sonsuz uzatmasın
+            if callee in on_path or callee_total <= 0:
+                continue
+            walk(callee, stack, on_path | {callee}, ratio * min(1.0, edge_time / callee_total))
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, [], {func}, 1.0)
+
+    return '\n'.join(f"{stack} {weight}" for stack, weight in sorted(lines.items())) + '\n'
+
+def stats_text(profile_path, limit=50):
+    """Toplam süreye göre sıralı okunabilir pstats özeti"""
+    stream = io.StringIO()
+    pstats.Stats(profile_path, stream=stream).sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
+
+
+_store = None
+
+def get_profile_store():
+    return _store
+
+def _should_profile(app):
+    value = request.headers.get(PROFILE_HEADER)
+    if value:
+        token = app.config.get('PROFILING_TOKEN')
+        if session.get('admin_logged_in') or (token and value == token):
+            return True
+    rate = app.config.get('PROFILING_SAMPLE_RATE', 0)
+    return rate > 0 and random.random() < rate
+
+def init_profiler(app):
+    """İsteğe bağlı (yönetici başlığı veya örnekleme) istek profillemesini kur
+
+    Kapalıyken hiçbir istek kancası eklenmez; açıkken profillenmeyen istekler
+    yalnızca bir başlık kontrolü ve bir rastgele sayı maliyeti öder.
+    """
+    global _store
+
+    if not app.config.get('PROFILING_ENABLED', False):
+        _store = None
+        return None
+
+    _store = ProfileStore(
+        app.config.get('PROFILING_DIR', os.path.join(os.getcwd(), 'profiles')),
+        app.config.get('PROFILING_MAX_PROFILES', 50)
+    )
+
+    @app.before_request
+    def start_profiling():
+        if not _should_profile(app):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Bu iş parçacığında başka bir profiler etkin
+            return
+        g.profiler = profiler
+        g.profile_started_at = time.perf_counter()
+
+    @app.after_request
+    def finish_profiling(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+
+        try:
+            profile_id = _store.save(profiler, {
+                'method': request.method,
+                'path': request.path,
+                'route': request.url_rule.rule if request.url_rule is not None else None,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - g.pop('profile_started_at')) * 1000, 2),
+                'created_at': datetime.now().isoformat()
+            })
+            response.headers['X-Profile-Id'] = profile_id
+        except Exception as e:
+            app.logger.error(f"Profil kaydedilemedi: {str(e)}")
+        return response
+
+    @app.teardown_request
+    def stop_profiling(error=None):
+        # after_request çalışmadan biten isteklerde profiler açık kalmasın
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+
+    app.logger.info(f"İstek profilleme etkin (örnekleme: {app.config.get('PROFILING_SAMPLE_RATE', 0)})")
+    return _store
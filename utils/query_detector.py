@@ -0,0 +1,190 @@
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, request
+
+# Uygulama sorgusu sayılmayan sürücü/oturum komutları
+IGNORED_MONGO_COMMANDS = {
+    'ping', 'hello', 'ismaster', 'isMaster', 'buildinfo', 'buildInfo', 'endSessions',
+    'saslStart', 'saslContinue', 'getnonce', 'authenticate', 'killCursors'
+}
+
+# Komut adı -> sorgu şeklinin alınacağı alan
+_MONGO_FILTER_PATHS = {
+    'find': ('filter',),
+    'count': ('query',),
+    'distinct': ('query',),
+    'findAndModify': ('query',),
+    'update': ('updates', 0, 'q'),
+    'delete': ('deletes', 0, 'q')
+}
+
+_SQL_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_SQL_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SQL_LIST = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)')
+_SQL_ROWS = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+class QueryBudgetExceeded(AssertionError):
+    """Bir istek/test bildirilen sorgu bütçesini aştı"""
+    pass
+
+
+def _shape(value):
+    """Sorgu belgesindeki değerleri '?' ile değiştirip yalnızca anahtar yapısını bırak"""
+    if isinstance(value, dict):
+        return '{' + ', '.join(f"{key}: {_shape(value[key])}" for key in sorted(value)) + '}'
+    if isinstance(value, (list, tuple)):
+        # $in listeleri gibi dizilerin uzunluğu şekli değiştirmemeli
+        return '[' + (_shape(value[0]) if value else '') + ']'
+    return '?'
+
+def fingerprint_mongo(command_name, command):
+    """MongoDB komutu için 'koleksiyon komut {şekil}' parmak izi üret"""
+    collection = command.get('collection') if command_name == 'getMore' else command.get(command_name)
+    if command_name == 'aggregate':
+        stages = [next(iter(stage), '') for stage in command.get('pipeline', [])]
+        return f"{collection} aggregate [{', '.join(stages)}]"
+
+    path = _MONGO_FILTER_PATHS.get(command_name)
+    if path is None:
+        return f"{collection} {command_name}"
+
+    target = command
+    for key in path:
+        try:
+            target = target[key]
+        except (KeyError, IndexError, TypeError):
+            target = {}
+            break
+    return f"{collection} {command_name} {_shape(target)}"
+
+def fingerprint_sql(statement):
+    """SQL ifadesindeki sabitleri ve IN/VALUES listelerini normalize et"""
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', 'replace')
+    statement = _SQL_STRING.sub('?', str(statement))
+    statement = _SQL_NUMBER.sub('?', statement)
+    statement = _SQL_LIST.sub('(...)', statement)
+    statement = _SQL_ROWS.sub(r'\1', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+class QueryLog:
+    """Bir istek veya test boyunca yapılan sorguların (store, parmak izi) sırası"""
+
+    def __init__(self):
+        self.entries = []
+
+    def record(self, store, fingerprint):
+        self.entries.append((store, fingerprint))
+
+    def count(self, store=None):
+        return sum(1 for entry_store, _ in self.entries if store is None or entry_store == store)
+
+    def repeated(self, threshold):
+        """threshold'dan fazla tekrarlanan sorgu şekilleri: [((store, parmak izi), adet)]"""
+        counts = Counter(self.entries)
+        return [(entry, count) for entry, count in counts.most_common() if count > threshold]
+
+
+_active = threading.local()
+
+def _active_logs():
+    return getattr(_active, 'logs', None)
+
+def record_mongo_command(command_name, command):
+    """Etkin sorgu kayıtları varsa MongoDB komutunu kaydet"""
+    logs = _active_logs()
+    if not logs or command_name in IGNORED_MONGO_COMMANDS:
+        return
+    fingerprint = fingerprint_mongo(command_name, command)
+    for log in logs:
+        log.record('mongo', fingerprint)
+
+def record_sql(statement):
+    """Etkin sorgu kayıtları varsa SQL ifadesini kaydet"""
+    logs = _active_logs()
+    if not logs:
+        return
+    fingerprint = fingerprint_sql(statement)
+    for log in logs:
+        log.record('mysql', fingerprint)
+
+def start_query_log():
+    log = QueryLog()
+    if _active_logs() is None:
+        _active.logs = []
+    _active.logs.append(log)
+    return log
+
+def stop_query_log(log):
+    logs = _active_logs()
+    if logs and log in logs:
+        logs.remove(log)
+
+@contextmanager
+def track_queries():
+    """Blok içinde bu iş parçacığında yapılan sorguları kaydeden QueryLog döndür"""
+    log = start_query_log()
+    try:
+        yield log
+    finally:
+        stop_query_log(log)
+
+def _describe(log, repeats):
+    lines = [f"{store}: {fingerprint} x{count}" for (store, fingerprint), count in repeats]
+    return f"{log.count()} sorgu" + (''.join(f"\n  {line}" for line in lines))
+
+@contextmanager
+def query_budget(max_queries=None, max_repeats=None):
+    """Blok bütçeyi aşarsa QueryBudgetExceeded fırlat
+
+    max_queries: toplam sorgu üst sınırı
+    max_repeats: aynı sorgu şeklinin en fazla tekrar sayısı (N+1 yakalamak için)
+    """
+    with track_queries() as log:
+        yield log
+
+    repeats = log.repeated(max_repeats) if max_repeats is not None else []
+    if max_queries is not None and log.count() > max_queries:
+        raise QueryBudgetExceeded(
+            f"Sorgu bütçesi aşıldı (en fazla {max_queries}): {_describe(log, log.repeated(1))}"
+        )
+    if repeats:
+        raise QueryBudgetExceeded(
+            f"Tekrarlanan sorgu şekli (en fazla {max_repeats}): {_describe(log, repeats)}"
+        )
+
+
+def init_query_detector(app):
+    """Her istekte tekrar eden sorgu şekillerini izleyip N+1 şüphesini logla"""
+    if not app.config.get('QUERY_DETECTOR_ENABLED', False):
+        return
+
+    threshold = app.config.get('QUERY_REPEAT_THRESHOLD', 5)
+
+    @app.before_request
+    def start_request_query_log():
+        g.query_log = start_query_log()
+
+    @app.after_request
+    def report_repeated_queries(response):
+        log = g.get('query_log')
+        if log is not None:
+            route = request.url_rule.rule if request.url_rule is not None else request.path
+            for (store, fingerprint), count in log.repeated(threshold):
+                app.logger.warning(
+                    f"N+1 şüphesi: {request.method} {route} aynı {store} sorgusunu {count} kez çalıştırdı: {fingerprint}"
+                )
+        return response
+
+    @app.teardown_request
+    def stop_request_query_log(error=None):
+        log = g.pop('query_log', None)
+        if log is not None:
+            stop_query_log(log)
+
+    app.logger.info(f"N+1 sorgu dedektörü etkin (eşik: {threshold})")
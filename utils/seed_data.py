@@ -0,0 +1,387 @@
+"""Benchmark ve yük testleri için sentetik katalog/trafik verisi üretici
+
+Ürünleri, sepet satırlarını MongoDB'ye; kullanıcıları, siparişleri ve sipariş
+öğelerini MySQL'e büyük partiler halinde (insert_many / çok satırlı INSERT) yükler:
+
+    python -m utils.seed_data --products 1000000 --users 500000 --carts 5000000 --orders 2000000
+
+Aynı --seed ve --as-of ile aynı veri üretilir (MySQL ID'leri tablodaki mevcut en
+büyük ID'den devam eder; --as-of verilmezse bugünün tarihi kullanılır). Üretilen ID'lerin bir örneği manifest dosyasına yazılır; yük testleri
+(tests/performance/test_dos.py) ürün ve kullanıcıları buradan okur.
+"""
+import sys
+import os
+import json
+import math
+import random
+from array import array
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from config.mongodb_db import get_db
+from config.mysql_db import get_mysql_connection
+
+DEFAULT_MANIFEST = 'seed_manifest.json'
+DEFAULT_PASSWORD = 'SeedPassword123!'
+
+# Ürün seçimindeki popülerlik çarpıklığı: küçük indeksli ürünler çok daha sık seçilir
+POPULARITY_SKEW = 3.0
+
+# Medyanı ~150 TL olan log-normal fiyat dağılımı
+PRICE_MU = math.log(150)
+PRICE_SIGMA = 1.1
+
+# Sepet başına satır sayısı için geometrik dağılım ortalaması
+MEAN_CART_LINES = 3.0
+
+SUPPLIER_RATIO = 0.02
+DELETED_PRODUCT_RATIO = 0.02
+OPEN_CART_RATIO = 0.3
+
+ORDER_STATUSES = (
+    ('delivered', 55), ('shipped', 15), ('processing', 10), ('pending', 15), ('cancelled', 5)
+)
+
+_ADJECTIVES = ('Akıllı', 'Kablosuz', 'Profesyonel', 'Mini', 'Ultra', 'Klasik', 'Ergonomik', 'Taşınabilir')
+_NOUNS = ('Laptop', 'Telefon', 'Kulaklık', 'Saat', 'Tablet', 'Klavye', 'Mouse', 'Monitör', 'Hoparlör', 'Kamera')
+_FIRST_NAMES = ('Ahmet', 'Ayşe', 'Mehmet', 'Zeynep', 'Can', 'Elif', 'Emre', 'Selin', 'Burak', 'Deniz')
+_LAST_NAMES = ('Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Aydın', 'Öztürk', 'Arslan', 'Doğan')
+_CITIES = ('İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Konya', 'Adana', 'Trabzon')
+
+
+def _rng(seed, stream):
+    """Varlık türü başına ayrı rastgele akış; bir hacmi değiştirmek diğerlerini bozmaz"""
+    return random.Random(f"{seed}:{stream}")
+
+def _object_id(rng, created_at):
+    """Zaman damgası created_at olan, seed'e göre tekrarlanabilir ObjectId"""
+    return ObjectId(int(created_at.timestamp()).to_bytes(4, 'big') + rng.getrandbits(64).to_bytes(8, 'big'))
+
+def _created_at(rng, now, days):
+    # Yeni kayıtlar daha yoğun: yaş, aralığın karesel dağılımıyla seçilir
+    return now - timedelta(seconds=int(days * 86400 * rng.random() ** 2))
+
+def _price(rng):
+    return round(max(1.0, rng.lognormvariate(PRICE_MU, PRICE_SIGMA)), 2)
+
+def _popular_index(rng, count):
+    return min(int(count * rng.random() ** POPULARITY_SKEW), count - 1)
+
+def _cart_lines(rng):
+    # Geometrik dağılım: çoğu sepet 1-3 satır, az sayıda uzun sepet
+    p = 1.0 / MEAN_CART_LINES
+    return 1 + int(math.log(1.0 - rng.random()) / math.log(1.0 - p))
+
+def _quantity(rng):
+    return rng.choices((1, 2, 3, 5), weights=(70, 20, 7, 3))[0]
+
+def product_name(index):
+    """Ürün indeksinden belirlenen ad (ürün listesi bellekte tutulmadan yeniden üretilebilir)"""
+    return f"{_ADJECTIVES[index % len(_ADJECTIVES)]} {_NOUNS[(index // len(_ADJECTIVES)) % len(_NOUNS)]} {index}"
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_users(count, start_id, password_hash, seed=42, now=None, days=365):
+    """MySQL users satırlarını (id, ..., created_at) demetleri olarak üret"""
+    rng = _rng(seed, 'users')
+    now = now or datetime.now(timezone.utc)
+    for user_id in range(start_id, start_id + count):
+        first_name = rng.choice(_FIRST_NAMES)
+        last_name = rng.choice(_LAST_NAMES)
+        created_at = _created_at(rng, now, days)
+        role = 'supplier' if rng.random() < SUPPLIER_RATIO else 'customer'
+        last_login = created_at + (now - created_at) * rng.random() if rng.random() < 0.6 else None
+        yield (
+            user_id, f"seed{user_id}", first_name, last_name, f"seed{user_id}@example.com",
+            password_hash, role, created_at.replace(tzinfo=None),
+            last_login.replace(tzinfo=None) if last_login else None
+        )
+
+def generate_products(count, supplier_ids, seed=42, now=None, days=365):
+    """MongoDB ürün belgelerini üret"""
+    from models.product import Product
+
+    rng = _rng(seed, 'products')
+    now = now or datetime.now(timezone.utc)
+    for index in range(count):
+        created_at = _created_at(rng, now, days)
+        name = product_name(index)
+        description = f"{name} - {rng.choice(_CITIES)} deposundan hızlı teslimat"
+        product = {
+            '_id': _object_id(rng, created_at),
+            'supplier_id': rng.choice(supplier_ids) if supplier_ids else 1,
+            'name': name,
+            'description': description,
+            'price': _price(rng),
+            'stock': int(rng.expovariate(1 / 50)),
+            'created_at': created_at,
+            'is_deleted': rng.random() < DELETED_PRODUCT_RATIO
+        }
+        product.update(Product.search_fields(name, description))
+        yield product
+
+def generate_cart_lines(count, user_ids, product_ids, prices, seed=42, now=None, days=365):
+    """MongoDB sepet satırlarını üret
+
+    Satırlar sepet sepet üretilir; bir kullanıcının en fazla bir açık sepeti olur ve
+    bir sepette aynı ürün iki kez yer almaz (açık satırlardaki tekil indeksle uyumlu).
+    """
+    rng = _rng(seed, 'carts')
+    now = now or datetime.now(timezone.utc)
+    open_carts = set()
+    produced = 0
+    while produced < count:
+        user_id = rng.choice(user_ids)
+        is_open = user_id not in open_carts and rng.random() < OPEN_CART_RATIO
+        if is_open:
+            open_carts.add(user_id)
+        added_at = _created_at(rng, now, days)
+        checked_out_at = None if is_open else added_at + timedelta(minutes=rng.randint(1, 60 * 24 * 3))
+
+        indexes = set()
+        for _ in range(min(_cart_lines(rng), count - produced, len(product_ids))):
+            index = _popular_index(rng, len(product_ids))
+            if index in indexes:
+                continue
+            indexes.add(index)
+            yield {
+                '_id': _object_id(rng, added_at),
+                'user_id': user_id,
+                'product_id': product_ids[index],
+                'product_name': product_name(index),
+                'quantity': _quantity(rng),
+                'price': prices[index],
+                'image_url': '',
+                'is_checked_out': not is_open,
+                'added_at': added_at,
+                'checked_out_at': checked_out_at
+            }
+            produced += 1
+
+def generate_orders(count, start_id, user_ids, product_ids, prices, seed=42, now=None, days=365):
+    """(orders satırı, [order_items satırları]) çiftlerini üret"""
+    rng = _rng(seed, 'orders')
+    now = now or datetime.now(timezone.utc)
+    statuses = [status for status, _ in ORDER_STATUSES]
+    weights = [weight for _, weight in ORDER_STATUSES]
+    for order_id in range(start_id, start_id + count):
+        created_at = _created_at(rng, now, days).replace(tzinfo=None)
+        items = []
+        indexes = set()
+        for _ in range(min(_cart_lines(rng), len(product_ids))):
+            index = _popular_index(rng, len(product_ids))
+            if index in indexes:
+                continue
+            indexes.add(index)
+            items.append((order_id, product_ids[index], _quantity(rng), prices[index], created_at))
+        total = round(sum(quantity * price for _, _, quantity, price, _ in items), 2)
+        order = (
+            order_id, rng.choice(user_ids), total,
+            f"{rng.randint(1, 200)}. Sokak No:{rng.randint(1, 99)}, {rng.choice(_CITIES)}",
+            rng.choices(statuses, weights)[0], created_at
+        )
+        yield order, items
+
+
+def insert_rows(cursor, table, columns, rows):
+    """Satırları tek bir çok satırlı INSERT ifadesiyle ekle"""
+    if not rows:
+        return 0
+    placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ', '.join([placeholders] * len(rows))
+    cursor.execute(query, [value for row in rows for value in row])
+    return len(rows)
+
+def _next_id(cursor, table):
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+    return cursor.fetchone()[0] + 1
+
+def _sample(items, size, rng):
+    items = list(items)
+    return items if len(items) <= size else rng.sample(items, size)
+
+
+def seed_database(db, conn, products=0, users=0, carts=0, orders=0, seed=42, batch_size=5000,
+                  days=365, password=DEFAULT_PASSWORD, sample_size=1000, as_of=None, log=print):
+    """Verilen hacimlerde veri üret ve yükle; manifest sözlüğünü döndür
+
+    db None ise MongoDB, conn None ise MySQL adımları atlanır. Sepet satırları ve
+    siparişler bu çalıştırmada üretilen kullanıcı ve ürünlere bağlanır. Tarihler ve
+    ObjectId zaman damgaları as_of'a (varsayılan: bugün 00:00 UTC) göre üretilir.
+    """
+    from utils.helpers import hash_password
+
+    now = as_of or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    sample_rng = _rng(seed, 'manifest')
+    manifest = {
+        'seed': seed,
+        'generated_at': now.isoformat(),
+        'password': password,
+        'counts': {'products': 0, 'users': 0, 'carts': 0, 'orders': 0, 'order_items': 0}
+    }
+
+    user_ids = []
+    supplier_ids = []
+    cursor = conn.cursor() if conn is not None else None
+    try:
+        if cursor is not None and users:
+            # Toplu yükleme sırasında ikincil indeks ve yabancı anahtar kontrollerini ertele
+            cursor.execute("SET unique_checks = 0, foreign_key_checks = 0")
+            start_id = _next_id(cursor, 'users')
+            password_hash = hash_password(password)
+            columns = ('id', 'username', 'first_name', 'last_name', 'email', 'password',
+                       'role', 'created_at', 'last_login')
+            for batch in _batched(generate_users(users, start_id, password_hash, seed, now, days), batch_size):
+                insert_rows(cursor, 'users', columns, batch)
+                conn.commit()
+                for row in batch:
+                    user_ids.append(row[0])
+                    if row[6] == 'supplier':
+                        supplier_ids.append(row[0])
+                log(f"users: {len(user_ids)}/{users}")
+            manifest['counts']['users'] = len(user_ids)
+            manifest['users'] = [
+                {'id': user_id, 'email': f"seed{user_id}@example.com"}
+                for user_id in sorted(_sample(user_ids, sample_size, sample_rng))
+            ]
+            manifest['supplier_ids'] = supplier_ids[:sample_size]
+
+        product_ids = []
+        prices = array('d')
+        if db is not None and products:
+            for batch in _batched(generate_products(products, supplier_ids, seed, now, days), batch_size):
+                db['products'].insert_many(batch, ordered=False)
+                for product in batch:
+                    product_ids.append(str(product['_id']))
+                    prices.append(product['price'])
+                log(f"products: {len(product_ids)}/{products}")
+            manifest['counts']['products'] = len(product_ids)
+            # Popülerlik çarpıklığı nedeniyle ilk ürünler en sık sepete/siparişe girenlerdir
+            manifest['hot_product_ids'] = product_ids[:min(50, len(product_ids))]
+            manifest['product_ids'] = _sample(product_ids, sample_size, sample_rng)
+
+        if db is not None and carts and user_ids and product_ids:
+            inserted = 0
+            for batch in _batched(generate_cart_lines(carts, user_ids, product_ids, prices, seed, now, days),
+                                  batch_size):
+                db['carts'].insert_many(batch, ordered=False)
+                inserted += len(batch)
+                log(f"carts: {inserted}/{carts}")
+            manifest['counts']['carts'] = inserted
+
+        if cursor is not None and orders and user_ids and product_ids:
+            start_id = _next_id(cursor, 'orders')
+            order_ids = []
+            item_count = 0
+            for batch in _batched(
+                generate_orders(orders, start_id, user_ids, product_ids, prices, seed, now, days), batch_size
+            ):
+                insert_rows(cursor, 'orders',
+                            ('id', 'user_id', 'total_amount', 'shipping_address', 'status', 'created_at'),
+                            [order for order, _ in batch])
+                items = [item for _, order_items in batch for item in order_items]
+                for chunk in _batched(items, batch_size):
+                    item_count += insert_rows(cursor, 'order_items',
+                                              ('order_id', 'product_id', 'quantity', 'price', 'created_at'), chunk)
+                conn.commit()
+                order_ids.extend(order[0] for order, _ in batch)
+                log(f"orders: {len(order_ids)}/{orders}")
+            manifest['counts']['orders'] = len(order_ids)
+            manifest['counts']['order_items'] = item_count
+            manifest['order_ids'] = sorted(_sample(order_ids, sample_size, sample_rng))
+    finally:
+        if cursor is not None:
+            cursor.execute("SET unique_checks = 1, foreign_key_checks = 1")
+            cursor.close()
+
+    return manifest
+
+def write_manifest(manifest, path=DEFAULT_MANIFEST):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def seed_in_memory(db, products=None, seed=None, manifest_path=None):
+    """Bellek içi MongoDB'ye ürün yükle ve ürün ID'lerini manifeste ekle
+
+    Benchmark'lar uygulamayı MONGO_IN_MEMORY=True ile başlattığında çağrılır. Hacim
+    MONGO_IN_MEMORY_PRODUCTS, manifest yolu SEED_MANIFEST ortam değişkeninden okunur;
+    manifestteki MySQL kullanıcıları korunur.
+    """
+    products = int(os.getenv('MONGO_IN_MEMORY_PRODUCTS', '0')) if products is None else products
+    seed = int(os.getenv('MONGO_IN_MEMORY_SEED', '42')) if seed is None else seed
+    manifest_path = manifest_path or os.getenv('SEED_MANIFEST')
+    if not products:
+        return None
+
+    manifest = seed_database(db, None, products=products, seed=seed, log=lambda message: None)
+    if manifest_path:
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                existing = json.load(f)
+        except (OSError, ValueError):
+            existing = {}
+        existing.update({key: manifest[key] for key in ('seed', 'product_ids', 'hot_product_ids')})
+        existing.setdefault('counts', {})['products'] = manifest['counts']['products']
+        write_manifest(existing, manifest_path)
+    print(f"Bellek içi MongoDB'ye {products} ürün yüklendi")
+    return manifest
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark için sentetik veri üretici')
+    parser.add_argument('--products', type=int, default=10000, help='MongoDB ürün sayısı')
+    parser.add_argument('--users', type=int, default=5000, help='MySQL kullanıcı sayısı')
+    parser.add_argument('--carts', type=int, default=50000, help='MongoDB sepet satırı sayısı')
+    parser.add_argument('--orders', type=int, default=20000, help='MySQL sipariş sayısı')
+    parser.add_argument('--seed', type=int, default=42, help='Tekrarlanabilirlik için rastgele tohum')
+    parser.add_argument('--batch-size', type=int, default=5000, help='insert_many / INSERT başına satır')
+    parser.add_argument('--days', type=int, default=365, help='created_at değerlerinin yayıldığı gün sayısı')
+    parser.add_argument('--as-of', type=datetime.fromisoformat,
+                        help='Tarihlerin referans günü (YYYY-MM-DD); verilmezse bugün')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Üretilen kullanıcıların parolası')
+    parser.add_argument('--sample-size', type=int, default=1000, help='Manifeste yazılacak ID sayısı')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help='Manifest dosyasının yolu')
+    args = parser.parse_args(argv)
+
+    if (args.carts or args.orders) and not (args.users and args.products):
+        parser.error('--carts ve --orders için --users ve --products sıfırdan büyük olmalı')
+
+    db = get_db()
+    conn = get_mysql_connection()
+    if db is None or conn is None:
+        print("❌ Veritabanı bağlantısı kurulamadı")
+        return 1
+
+    try:
+        manifest = seed_database(
+            db, conn, args.products, args.users, args.carts, args.orders, seed=args.seed,
+            batch_size=args.batch_size, days=args.days, password=args.password,
+            sample_size=args.sample_size,
+            as_of=args.as_of.replace(tzinfo=timezone.utc) if args.as_of else None
+        )
+    finally:
+        conn.close()
+
+    write_manifest(manifest, args.manifest)
+    print(f"✅ {manifest['counts']} -> {args.manifest}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())